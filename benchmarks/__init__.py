@@ -0,0 +1 @@
+"""Benchmarks for the budget engine; run with ``python -m benchmarks.run``."""
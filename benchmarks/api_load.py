@@ -0,0 +1,141 @@
+"""Load-test the budget API service on a local socket.
+
+    python -m benchmarks.api_load                      # 50 households, 64 clients
+    python -m benchmarks.api_load --households 200 --clients 128 --requests 20000
+
+Seeds ``--households`` catalog months into a temporary ledger, starts the
+service in a background thread on a free port, then opens ``--clients``
+keep-alive connections that issue ``/budget`` requests with random
+households, incomes, risks and cuts until ``--requests`` have completed
+(``--projection-share`` of them are ``/projection`` requests). Prints
+throughput and latency percentiles; ``--output`` writes them as JSON.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from finance_engine.ledger import LedgerStore
+from finance_engine.service import DEFAULT_WORKERS, BudgetService, Server
+
+MONTH = "2026-01"
+
+
+def _start_server(store, workers):
+    """Run a ``Server`` on its own event loop thread; return its port."""
+    server = Server(BudgetService(store), workers)
+    ready = threading.Event()
+    port = []
+
+    def on_ready(value):
+        port.append(value)
+        ready.set()
+
+    thread = threading.Thread(target=lambda: asyncio.run(server.serve("127.0.0.1", 0, ready=on_ready)), daemon=True)
+    thread.start()
+    ready.wait()
+    return port[0]
+
+
+def _target(rng, households, projection_share):
+    income = rng.choice((600_000, 900_000, 1_400_000, 2_000_000, 3_000_000))
+    query = (f"income={income}&goal={rng.choice((0, 50_000, 200_000))}&risk={rng.choice(('Low', 'Medium', 'High'))}"
+             f"&essential_cut={rng.choice((0, 5, 10))}&discretionary_cut={rng.choice((0, 20, 50))}")
+    household = f"family-{rng.randrange(households)}"
+    if rng.random() < projection_share:
+        return f"/households/{household}/{MONTH}/projection?{query}&months=60&paths=200"
+    return f"/households/{household}/{MONTH}/budget?{query}"
+
+
+async def _client(port, queue, latencies, rng, households, projection_share):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            target = _target(rng, households, projection_share)
+            start = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("latin-1"))
+            await writer.drain()
+            status = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            if b" 200 " not in status:
+                raise RuntimeError(f"{target}: {status.decode().strip()}")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def _load(port, requests, clients, households, projection_share, seed):
+    queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(port, queue, latencies, random.Random(seed + i), households, projection_share)
+        for i in range(clients)))
+    return time.perf_counter() - start, np.array(latencies)
+
+
+def run(households, clients, requests, workers, projection_share, seed=0):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LedgerStore(os.path.join(tmp, "ledger.db"), pool_size=workers)
+        for i in range(households):
+            store.seed_month(f"family-{i}", MONTH)
+        port = _start_server(store, workers)
+
+        # Warm-up pass fills the stage cache the way a long-running service would
+        asyncio.run(_load(port, min(requests, clients * 4), clients, households, projection_share, seed + 10_000))
+        elapsed, latencies = asyncio.run(_load(port, requests, clients, households, projection_share, seed))
+
+    return {
+        "households": households,
+        "clients": clients,
+        "workers": workers,
+        "requests": requests,
+        "projection_share": projection_share,
+        "seconds": elapsed,
+        "requests_per_sec": requests / elapsed,
+        "latency_ms": {f"p{q}": float(np.percentile(latencies, q) * 1000) for q in (50, 90, 99)},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--households", type=int, default=50)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--projection-share", type=float, default=0.1)
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args.households, args.clients, args.requests, args.workers, args.projection_share)
+    print(f"{report['requests']:,} requests from {report['clients']} clients over {report['households']} households "
+          f"({report['workers']} workers): {report['requests_per_sec']:,.0f} req/s, "
+          + ", ".join(f"{name} {value:.1f} ms" for name, value in report["latency_ms"].items()))
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
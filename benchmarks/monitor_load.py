@@ -0,0 +1,77 @@
+"""Measure how many transactions per second the spending monitor keeps up with.
+
+    python -m benchmarks.monitor_load                     # 500,000 events over 3 months
+    python -m benchmarks.monitor_load --events 2000000 --output monitor.json
+
+Budgets come from the catalog's adjusted line items at ``--income``. Events
+are spread over the budget categories plus ``Uncategorised`` in date order,
+with gamma-distributed amounts so the share, pace and anomaly alerts all
+fire. Only ``SpendingMonitor.observe_many`` is timed.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from finance_engine.monitor import SpendingMonitor, category_budgets
+from finance_engine.pipeline import run_pipeline
+
+
+def synthetic_events(budgets, events, months=3, seed=0):
+    """Return ``(dates, categories, amounts)`` lists of ``events`` transactions in date order."""
+    rng = np.random.default_rng(seed)
+    categories = list(budgets) + ["Uncategorised"]
+    days = np.sort(rng.integers(0, months * 28, events))
+    dates = [f"2026-{d // 28 + 1:02d}-{d % 28 + 1:02d}" for d in days.tolist()]
+    chosen = rng.integers(0, len(categories), events)
+    # Spend each category's budget over roughly its share of the events
+    scale = np.array([budgets.get(c, 50_000) for c in categories]) * len(categories) * months / events
+    amounts = rng.gamma(2.0, scale[chosen] / 2.0)
+    return dates, [categories[i] for i in chosen.tolist()], amounts.tolist()
+
+
+def run(events, income, months=3):
+    results = run_pipeline(income, 0, "Medium", 0, 0, views=False)
+    budgets = category_budgets(results["groceries"], results["bills"])
+    dates, categories, amounts = synthetic_events(budgets, events, months)
+
+    monitor = SpendingMonitor(budgets)
+    started = time.perf_counter()
+    alerts = monitor.observe_many(dates, categories, amounts)
+    elapsed = time.perf_counter() - started
+
+    kinds = {}
+    for alert in alerts:
+        kinds[alert["kind"]] = kinds.get(alert["kind"], 0) + 1
+    return {
+        "events": events,
+        "categories": len(monitor.states),
+        "seconds": elapsed,
+        "events_per_sec": events / elapsed,
+        "us_per_event": elapsed / events * 1e6,
+        "alerts": kinds,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=500_000)
+    parser.add_argument("--income", type=float, default=2_500_000)
+    parser.add_argument("--months", type=int, default=3)
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args.events, args.income, args.months)
+    print(f"{report['events']:,} events over {report['categories']} categories: "
+          f"{report['events_per_sec']:,.0f} events/s ({report['us_per_event']:.2f} us/event), alerts "
+          + ", ".join(f"{kind} {count}" for kind, count in sorted(report["alerts"].items())))
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
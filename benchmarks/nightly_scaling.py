@@ -0,0 +1,76 @@
+"""Measure nightly batch throughput as the number of worker processes grows.
+
+    python -m benchmarks.nightly_scaling                        # 200,000 households, 1..cores workers
+    python -m benchmarks.nightly_scaling --households 1000000 --workers 1 2 4 8 --output scaling.json
+
+Households are synthetic (catalog line items, random income, goal, risk and
+cuts) and written to a temporary JSONL file once. Each worker count then
+runs ``finance_engine.nightly.run`` from scratch into its own directory, and
+reports households/second overall and the speed-up over the first count.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from finance_engine import nightly
+
+
+def write_households(path, households, seed=0):
+    rng = np.random.default_rng(seed)
+    risks = np.array(["Low", "Medium", "High"])
+    with open(path, "w") as handle:
+        for i in range(households):
+            handle.write(json.dumps({
+                "household": f"family-{i}",
+                "monthly_income": int(rng.integers(800_000, 4_000_000)),
+                "savings_goal": int(rng.choice([0, 50_000, 200_000, 500_000])),
+                "risk_appetite": str(risks[rng.integers(0, 3)]),
+                "essential_cut": int(rng.integers(0, 21)),
+                "discretionary_cut": int(rng.integers(0, 51)),
+                "current_savings": int(rng.integers(0, 2_000_000)),
+            }) + "\n")
+
+
+def run(households, worker_counts, shard_size):
+    runs = []
+    with tempfile.TemporaryDirectory() as workdir:
+        input_path = os.path.join(workdir, "households.jsonl")
+        write_households(input_path, households)
+        for workers in worker_counts:
+            report = nightly.run(input_path, os.path.join(workdir, f"out-{workers}"), workers=workers,
+                                 shard_size=shard_size)
+            runs.append({"workers": report["workers"], "seconds": report["seconds"],
+                         "households_per_second": report["households_per_second"], "failed": report["failed"]})
+    for entry in runs:
+        entry["speedup"] = entry["households_per_second"] / runs[0]["households_per_second"]
+    return {"households": households, "shard_size": shard_size, "cpu_count": os.cpu_count(), "runs": runs}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--households", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="worker counts to try (default: 1, 2, 4, ... up to the core count)")
+    parser.add_argument("--shard-size", type=int, default=nightly.DEFAULT_SHARD_SIZE)
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    cores = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({min(2 ** i, cores) for i in range(cores.bit_length() + 1)})
+    report = run(args.households, worker_counts, args.shard_size)
+    print(f"{report['households']:,} households, {report['cpu_count']} cores")
+    for entry in report["runs"]:
+        print(f"  {entry['workers']:>3} workers: {entry['households_per_second']:>10,.0f} households/s "
+              f"({entry['seconds']:.2f} s, x{entry['speedup']:.2f})")
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Time every pipeline stage on synthetic ledgers of growing size.
+
+    python -m benchmarks.run                       # 10^2 .. 10^6 rows, against benchmarks/baseline.json
+    python -m benchmarks.run --sizes 100 10000 --output bench.json
+    python -m benchmarks.run --baseline none       # no comparison
+
+Each stage is timed as the best of ``--repeat`` runs, then run once more
+under ``tracemalloc`` for its peak allocation. ``load_data`` is the
+built-in catalog (the same size at every row count); ``load_month`` reads
+the synthetic ledger back from SQLite. Results go to a JSON file and are
+compared with the baseline: stages slower than it by more than
+``--tolerance`` are listed and the exit status is 1.
+
+``benchmarks/baseline.json`` was recorded on a single-CPU Linux machine
+(see its ``meta``); timings are only comparable on similar hardware, so
+record a baseline of your own with ``--output benchmarks/baseline.json
+--baseline none`` before relying on the comparison elsewhere.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_ledger
+from finance_engine import stages
+from finance_engine.catalog import load_data
+from finance_engine.ledger import LedgerStore
+
+DEFAULT_SIZES = (10**2, 10**3, 10**4, 10**5, 10**6)
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+# Expenses exceed income by this share, so auto-adjustment does real work
+OVERSPEND = 0.1
+
+
+def _ledger_rows(groceries_df, bills_df):
+    for r in groceries_df.itertuples(index=False):
+        yield {"household": "bench", "month": "2026-01", "kind": "grocery", "description": r.Item,
+               "quantity": r.Quantity, "amount": r.Price, "priority": r.Priority, "category": r.Category,
+               "flexibility": r.Flexibility}
+    for r in bills_df.itertuples(index=False):
+        yield {"household": "bench", "month": "2026-01", "kind": "bill", "description": r.Category,
+               "amount": r.Amount, "priority": r.Priority, "category": r.Type, "flexibility": r.Flexibility}
+
+
+def stage_calls(rows, workdir):
+    """Return ``[(stage, callable)]`` for a ledger of ``rows`` line items.
+
+    Stages run in pipeline order; each callable's inputs are computed up
+    front so only the stage itself is measured.
+    """
+    groceries_df, bills_df = synthetic_ledger(rows)
+    monthly_income = (groceries_df["Price"].sum() + bills_df["Amount"].sum()) / (1 + OVERSPEND)
+    savings_goal = monthly_income * 0.1
+
+    store = LedgerStore(os.path.join(workdir, f"ledger_{rows}.db"))
+    store.insert_line_items(_ledger_rows(groceries_df, bills_df))
+
+    cut_groceries, cut_bills = stages.apply_spending_cuts(groceries_df, bills_df, 5, 10)
+    adj_groceries, adj_bills, _ = stages.auto_adjust_spending(cut_groceries, cut_bills, monthly_income)
+    fixed = stages.compute_totals(adj_groceries, adj_bills, monthly_income)["total_fixed_expenses"]
+    options = stages.generate_budget_options(monthly_income, fixed, savings_goal, "Medium")
+
+    return [
+        ("load_data", lambda: load_data(monthly_income)),
+        ("load_month", lambda: store.load_month("bench", "2026-01", monthly_income)),
+        ("apply_spending_cuts", lambda: stages.apply_spending_cuts(groceries_df, bills_df, 5, 10)),
+        ("auto_adjust_spending", lambda: stages.auto_adjust_spending(cut_groceries, cut_bills, monthly_income)),
+        ("generate_budget_options", lambda: stages.generate_budget_options(monthly_income, fixed, savings_goal, "Medium")),
+        ("generate_recommendations", lambda: stages.generate_recommendations(
+            adj_groceries, adj_bills, options, monthly_income, savings_goal)),
+        ("create_visualizations", lambda: stages.create_visualizations(adj_groceries, adj_bills, monthly_income, options)),
+        ("create_adjustment_summary", lambda: stages.create_adjustment_summary(adj_groceries, adj_bills, monthly_income)),
+    ]
+
+
+def measure(call, repeat):
+    """Return ``(best_seconds, peak_bytes)`` for ``call``."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run(sizes, repeat):
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in sizes:
+            for stage, call in stage_calls(rows, workdir):
+                seconds, peak = measure(call, repeat)
+                results.append({"stage": stage, "rows": rows, "seconds": seconds, "peak_bytes": peak})
+                print(f"{stage:<28}{rows:>10,} rows {seconds*1000:>11.2f} ms {peak/2**20:>9.1f} MiB", flush=True)
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def regressions(report, baseline, tolerance, min_seconds=0.0):
+    """Return the results that are slower than ``baseline`` by more than ``tolerance``.
+
+    Slowdowns under ``min_seconds`` are timer noise on sub-millisecond
+    stages and are not counted.
+    """
+    previous = {(r["stage"], r["rows"]): r for r in baseline["results"]}
+    slower = []
+    for result in report["results"]:
+        before = previous.get((result["stage"], result["rows"]))
+        if (before and result["seconds"] > before["seconds"] * (1 + tolerance)
+                and result["seconds"] - before["seconds"] >= min_seconds):
+            slower.append(dict(result, baseline_seconds=before["seconds"]))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE),
+                        help="JSON results to compare against ('none' to skip)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, e.g. 0.25 for 25%%")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="ignore slowdowns smaller than this")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.repeat)
+    with open(args.output, "w") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline != "none":
+        with open(args.baseline) as handle:
+            slower = regressions(report, json.load(handle), args.tolerance, args.min_ms / 1000)
+        for r in slower:
+            print(f"REGRESSION {r['stage']} at {r['rows']:,} rows: "
+                  f"{r['baseline_seconds']*1000:.2f} ms -> {r['seconds']*1000:.2f} ms")
+        if slower:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Synthetic grocery and bill ledgers for benchmarking.
+
+Priority, category and flexibility are drawn with the joint frequencies of
+the built-in catalog, and amounts from a log-normal fitted to its prices, so
+stage costs (mask sizes, group counts, adjustment tiers) scale the way a real
+ledger would.
+"""
+import numpy as np
+import pandas as pd
+
+from finance_engine.catalog import _static_frames
+from finance_engine.schema import categorize_bills, categorize_groceries
+
+# Groceries outnumber bills in the catalog (23 to 13)
+GROCERY_SHARE = 23 / 36
+
+
+def _sample_profiles(frame, columns, n, rng):
+    profiles = frame[columns].value_counts(normalize=True)
+    picks = rng.choice(len(profiles), size=n, p=profiles.to_numpy())
+    values = np.array(profiles.index.tolist(), dtype=object)[picks]
+    return {column: values[:, i] for i, column in enumerate(columns)}
+
+
+def _amounts(values, n, rng):
+    logs = np.log(values[values > 0])
+    return np.round(rng.lognormal(logs.mean(), logs.std(), n), -2)
+
+
+def synthetic_ledger(rows, seed=0):
+    """Return ``(groceries_df, bills_df)`` with ``rows`` line items in total."""
+    rng = np.random.default_rng(seed)
+    groceries, bills = _static_frames()
+    n_groceries = max(1, int(rows * GROCERY_SHARE))
+    n_bills = max(1, rows - n_groceries)
+
+    grocery_profile = _sample_profiles(groceries, ["Priority", "Category", "Flexibility"], n_groceries, rng)
+    groceries_df = categorize_groceries(pd.DataFrame({
+        "Item": [f"Item {i}" for i in range(n_groceries)],
+        "Quantity": "",
+        "Price": _amounts(groceries["Price"].to_numpy(), n_groceries, rng),
+        **grocery_profile,
+    }))
+
+    bill_profile = _sample_profiles(bills, ["Priority", "Flexibility", "Type"], n_bills, rng)
+    bills_df = categorize_bills(pd.DataFrame({
+        "Category": [f"Bill {i}" for i in range(n_bills)],
+        "Amount": _amounts(bills["Amount"].to_numpy(), n_bills, rng),
+        **bill_profile,
+    })[["Category", "Amount", "Priority", "Flexibility", "Type"]])
+    return groceries_df, bills_df
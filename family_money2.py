@@ -1,8 +1,24 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 from datetime import datetime
-import plotly.express as px
+import os
+import numpy as np
+
+from finance_engine.archive import SnapshotArchive
+from finance_engine.ledger import LedgerStore
+from finance_engine.monitor import SpendingMonitor, category_budgets
+from finance_engine import figures
+from finance_engine.catalog import AS_NEEDED_ITEMS
+from finance_engine.cashflow import cash_flow, schedule_items
+from finance_engine.figures import CHART_KEYS
+from finance_engine.paging import DEFAULT_PAGE_SIZE, PAGE_SIZES
+from finance_engine.schema import FLEXIBILITIES, PRIORITIES
+from finance_engine.goalseek import required_cuts
+from finance_engine.pipeline import run_goal_seek, run_pipeline, run_sweep
+from finance_engine.planner import describe_cut_plan
+from finance_engine.projection import DEFAULT_PATHS, projection_bands, simulate_savings
+from finance_engine.rules import RecommendationEngine
+from finance_engine.trace import NULL_TRACER, Tracer
 
 # Configure page
 st.set_page_config(layout="wide")
@@ -19,354 +35,73 @@ with st.sidebar:
     st.caption("Adjust spending priorities:")
     essential_cut = st.slider("Essential spending adjustment", 0, 20, 0, help="Reduce essential expenses by this percentage if needed")
     discretionary_cut = st.slider("Discretionary spending adjustment", 0, 50, 0, help="Reduce discretionary expenses by this percentage if needed")
+    spending_plan = st.radio("Spending plan", ["Fixed tiers", "Minimum-pain optimizer"],
+                             help="The optimizer cuts the least painful items, within their flexibility, "
+                                  "until the savings goal fits")
+    st.markdown("---")
+    debug_mode = st.checkbox("Debug: show performance panel", value=False)
 
-# Constants
-MONTHS_IN_TERM = 3
-
-# Data setup with enhanced categories
-def load_data():
-    # Groceries with enhanced categories
-    groceries = [
-        {"Item": "Rice", "Quantity": "3 kgs", "Price": 13500, "Priority": "Essential", "Category": "Food Staples", "Flexibility": "Low"},
-        {"Item": "Tooth paste", "Quantity": "1 piece", "Price": 6000, "Priority": "Essential", "Category": "Personal Care", "Flexibility": "Medium"},
-        {"Item": "Shoe polish", "Quantity": "1", "Price": 3500, "Priority": "Discretionary", "Category": "Personal Care", "Flexibility": "High"},
-        {"Item": "Gizzards", "Quantity": "1 pack", "Price": 15000, "Priority": "Nice-to-have", "Category": "Protein", "Flexibility": "High"},
-        {"Item": "Viennas", "Quantity": "1 pack", "Price": 12000, "Priority": "Nice-to-have", "Category": "Protein", "Flexibility": "High"},
-        {"Item": "Milk", "Quantity": "1 box", "Price": 24000, "Priority": "Essential", "Category": "Dairy", "Flexibility": "Medium"},
-        {"Item": "Irish potatoes", "Quantity": "1 month supply", "Price": 30000, "Priority": "Essential", "Category": "Food Staples", "Flexibility": "Low"},
-        {"Item": "Baby oil", "Quantity": "1", "Price": 15000, "Priority": "Essential", "Category": "Personal Care", "Flexibility": "Medium"},
-        {"Item": "Sugar", "Quantity": "2 kgs", "Price": 8000, "Priority": "Essential", "Category": "Food Staples", "Flexibility": "Medium"},
-        {"Item": "Beef", "Quantity": "1 kg", "Price": 15000, "Priority": "Nice-to-have", "Category": "Protein", "Flexibility": "High"},
-        {"Item": "Chicken", "Quantity": "1 kg", "Price": 15000, "Priority": "Nice-to-have", "Category": "Protein", "Flexibility": "High"},
-        {"Item": "Squishy drink", "Quantity": "10", "Price": 20000, "Priority": "Discretionary", "Category": "Beverages", "Flexibility": "High"},
-        {"Item": "Soap", "Quantity": "1 bar", "Price": 6000, "Priority": "Essential", "Category": "Personal Care", "Flexibility": "Low"},
-        {"Item": "Eggs", "Quantity": "1 tray", "Price": 12500, "Priority": "Essential", "Category": "Protein", "Flexibility": "Medium"},
-        {"Item": "Bread", "Quantity": "1 big", "Price": 6000, "Priority": "Essential", "Category": "Food Staples", "Flexibility": "Medium"},
-        {"Item": "Spaghetti", "Quantity": "10 packs", "Price": 20000, "Priority": "Essential", "Category": "Food Staples", "Flexibility": "Medium"},
-        {"Item": "Onions", "Quantity": "1 kg", "Price": 6000, "Priority": "Essential", "Category": "Vegetables", "Flexibility": "Medium"},
-        {"Item": "Green pepper", "Quantity": "", "Price": 2000, "Priority": "Nice-to-have", "Category": "Vegetables", "Flexibility": "High"},
-        {"Item": "Drinks", "Quantity": "", "Price": 20000, "Priority": "Discretionary", "Category": "Beverages", "Flexibility": "High"},
-        {"Item": "Carrots", "Quantity": "", "Price": 3000, "Priority": "Nice-to-have", "Category": "Vegetables", "Flexibility": "High"},
-        {"Item": "Ginger", "Quantity": "0.5 kg", "Price": 3000, "Priority": "Nice-to-have", "Category": "Vegetables", "Flexibility": "High"},
-        {"Item": "Tomatoes", "Quantity": "", "Price": 6000, "Priority": "Essential", "Category": "Vegetables", "Flexibility": "Medium"},
-        {"Item": "Medicine (Azithromycin)", "Quantity": "", "Price": 7000, "Priority": "Essential", "Category": "Healthcare", "Flexibility": "Low"},
-    ]
-    
-    # Bills and fixed expenses with enhanced categories
-    bills = [
-        {"Category": "Rent", "Amount": 500000, "Priority": "Critical", "Flexibility": "None", "Type": "Housing"},
-        {"Category": "Water", "Amount": 24000, "Priority": "Critical", "Flexibility": "Low", "Type": "Utilities"},
-        {"Category": "Electricity", "Amount": 40000, "Priority": "Critical", "Flexibility": "Medium", "Type": "Utilities"},
-        {"Category": "Garbage", "Amount": 10000, "Priority": "Critical", "Flexibility": "Low", "Type": "Utilities"},
-        {"Category": "Laundry", "Amount": 12000*4, "Priority": "Essential", "Flexibility": "High", "Type": "Personal Care"},
-        {"Category": "Fuel", "Amount": 50000*4, "Priority": "Essential", "Flexibility": "Medium", "Type": "Transport"},
-        {"Category": "Tithe", "Amount": monthly_income*0.1, "Priority": "Essential", "Flexibility": "Medium", "Type": "Donations"},
-        {"Category": "Family dates", "Amount": 150000, "Priority": "Discretionary", "Flexibility": "High", "Type": "Entertainment"},
-        {"Category": "Skin care", "Amount": 200000/3, "Priority": "Discretionary", "Flexibility": "High", "Type": "Personal Care"},
-        {"Category": "Pig farming", "Amount": 250000, "Priority": "Investment", "Flexibility": "High", "Type": "Investments"},
-        {"Category": "Health fund", "Amount": 100000, "Priority": "Essential", "Flexibility": "Medium", "Type": "Healthcare"},
-        {"Category": "School fees (Eliana)", "Amount": 700000/MONTHS_IN_TERM, "Priority": "Critical", "Flexibility": "None", "Type": "Education"},
-        {"Category": "Gifts", "Amount": 50000, "Priority": "Discretionary", "Flexibility": "High", "Type": "Gifts"},
-    ]
-    
-    # Convert to DataFrames
-    groceries_df = pd.DataFrame(groceries)
-    bills_df = pd.DataFrame(bills)
-    
-    # Adjust weekly items to monthly
-    weekly_items = groceries_df[groceries_df["Item"] == "Bread"]
-    weekly_items["Price"] = weekly_items["Price"] * 4
-    groceries_df.update(weekly_items)
-    
-    return groceries_df, bills_df
+# Timing spans for this rerun; a session's tracer only exists while the debug panel is on
+if debug_mode:
+    if "tracer" not in st.session_state:
+        st.session_state.tracer = Tracer(enabled=True, path=os.environ.get("FINANCE_TRACE_FILE", "finance_traces.jsonl"))
+    tracer = st.session_state.tracer
+else:
+    if "tracer" in st.session_state:
+        st.session_state.pop("tracer").close()
+    tracer = NULL_TRACER
+tracer.start_rerun()
 
-groceries_df, bills_df = load_data()
+# Line items come from the ledger database when FINANCE_LEDGER_DB points at one
+@st.cache_resource
+def open_ledger(path):
+    return LedgerStore(path)
 
-# Apply user-requested spending cuts
-def apply_spending_cuts(groceries_df, bills_df, essential_cut, discretionary_cut):
-    # Apply cuts to groceries
-    groceries_df["Original Price"] = groceries_df["Price"]
-    groceries_df.loc[groceries_df["Priority"].isin(["Essential", "Critical"]), "Price"] *= (1 - essential_cut/100)
-    groceries_df.loc[groceries_df["Priority"].isin(["Nice-to-have", "Discretionary"]), "Price"] *= (1 - discretionary_cut/100)
-    
-    # Apply cuts to bills
-    bills_df["Original Amount"] = bills_df["Amount"]
-    bills_df.loc[bills_df["Priority"].isin(["Essential", "Critical"]), "Amount"] *= (1 - essential_cut/100)
-    bills_df.loc[bills_df["Priority"].isin(["Discretionary", "Investment"]), "Amount"] *= (1 - discretionary_cut/100)
-    
-    return groceries_df, bills_df
+ledger_path = os.environ.get("FINANCE_LEDGER_DB")
+ledger = household = current_month = None
+if ledger_path:
+    ledger = open_ledger(ledger_path)
+    household = os.environ.get("FINANCE_HOUSEHOLD", "default")
+    current_month = datetime.now().strftime("%Y-%m")
+    ledger.seed_month(household, current_month)
 
-groceries_df, bills_df = apply_spending_cuts(groceries_df, bills_df, essential_cut, discretionary_cut)
+# Monthly snapshot archive for trend charts, when FINANCE_ARCHIVE_DIR points at one
+@st.cache_resource
+def open_archive(path):
+    return SnapshotArchive(path)
 
-# Calculate totals
-total_groceries = groceries_df["Price"].sum()
-total_bills = bills_df["Amount"].sum()
-total_fixed_expenses = total_bills + total_groceries
-disposable_income = monthly_income - total_fixed_expenses
+archive_path = os.environ.get("FINANCE_ARCHIVE_DIR")
+archive = open_archive(archive_path) if archive_path else None
 
-# Automatic spending adjustment when expenses exceed income
-def auto_adjust_spending(groceries_df, bills_df, monthly_income):
-    total_expenses = groceries_df["Price"].sum() + bills_df["Amount"].sum()
-    
-    if total_expenses <= monthly_income:
-        return groceries_df, bills_df, False
-    
-    # Calculate needed reduction
-    overspend_amount = total_expenses - monthly_income
-    st.warning(f"⚠️ You're overspending by {overspend_amount:,.0f} UGX. Automatic adjustments being applied.")
-    
-    # Create adjustment plan
-    adjustment_plan = []
-    
-    # First target discretionary expenses
-    discretionary_groceries = groceries_df[groceries_df["Priority"].isin(["Discretionary", "Nice-to-have"])].copy()
-    discretionary_bills = bills_df[bills_df["Priority"].isin(["Discretionary"])].copy()
-    
-    total_discretionary = discretionary_groceries["Price"].sum() + discretionary_bills["Amount"].sum()
-    
-    if total_discretionary > 0:
-        reduction_factor = min(1, overspend_amount / total_discretionary)
-        if reduction_factor < 1:
-            # Apply reduction to discretionary items
-            discretionary_groceries["Price"] *= (1 - reduction_factor)
-            discretionary_bills["Amount"] *= (1 - reduction_factor)
-            
-            # Update main dataframes
-            groceries_df.update(discretionary_groceries)
-            bills_df.update(discretionary_bills)
-            
-            adjustment_plan.append(f"Reduced discretionary spending by {reduction_factor*100:.0f}%")
-            
-            # Recalculate overspend
-            total_expenses = groceries_df["Price"].sum() + bills_df["Amount"].sum()
-            overspend_amount = total_expenses - monthly_income
-    
-    # If still overspending, target flexible essential expenses
-    if overspend_amount > 0:
-        flexible_essentials_groceries = groceries_df[
-            (groceries_df["Priority"].isin(["Essential"])) & 
-            (groceries_df["Flexibility"].isin(["Medium", "High"]))
-        ].copy()
-        
-        flexible_essentials_bills = bills_df[
-            (bills_df["Priority"].isin(["Essential"])) & 
-            (bills_df["Flexibility"].isin(["Medium", "High"]))
-        ].copy()
-        
-        total_flexible_essentials = flexible_essentials_groceries["Price"].sum() + flexible_essentials_bills["Amount"].sum()
-        
-        if total_flexible_essentials > 0:
-            reduction_factor = min(0.5, overspend_amount / total_flexible_essentials)  # Max 50% reduction for essentials
-            
-            if reduction_factor > 0:
-                flexible_essentials_groceries["Price"] *= (1 - reduction_factor)
-                flexible_essentials_bills["Amount"] *= (1 - reduction_factor)
-                
-                groceries_df.update(flexible_essentials_groceries)
-                bills_df.update(flexible_essentials_bills)
-                
-                adjustment_plan.append(f"Reduced flexible essential spending by {reduction_factor*100:.0f}%")
-                
-                # Recalculate overspend
-                total_expenses = groceries_df["Price"].sum() + bills_df["Amount"].sum()
-                overspend_amount = total_expenses - monthly_income
-    
-    # If still overspending after all adjustments
-    if overspend_amount > 0:
-        adjustment_plan.append(f"Unable to fully balance budget. Still overspending by {overspend_amount:,.0f} UGX. Consider increasing income.")
-    
-    return groceries_df, bills_df, adjustment_plan
+# In-place line-item edits made in the Expense Analysis tab (st.data_editor change sets)
+line_item_edits = {kind: st.session_state.get(f"edit_{kind}") for kind in ("grocery", "bill")}
 
-# Apply automatic adjustments if needed
-adjusted_groceries, adjusted_bills, adjustment_plan = auto_adjust_spending(groceries_df.copy(), bills_df.copy(), monthly_income)
-if adjustment_plan:
-    groceries_df, bills_df = adjusted_groceries, adjusted_bills
-    total_groceries = groceries_df["Price"].sum()
-    total_bills = bills_df["Amount"].sum()
-    total_fixed_expenses = total_bills + total_groceries
-    disposable_income = monthly_income - total_fixed_expenses
-
-# Budget options with enhanced logic
-def generate_budget_options(income, fixed_expenses, savings_goal, risk):
-    remaining = income - fixed_expenses
-    
-    if remaining <= 0:
-        return {
-            "Option 1": {
-                "Savings": 0,
-                "Investments": 0,
-                "Discretionary": 0,
-                "Description": "No surplus after fixed expenses. Need to reduce costs.",
-                "Feasible": False
-            },
-            "Option 2": {
-                "Savings": 0,
-                "Investments": 0,
-                "Discretionary": 0,
-                "Description": "No surplus after fixed expenses. Need to reduce costs.",
-                "Feasible": False
-            }
-        }
-    
-    if risk == "Low":
-        options = {
-            "Option 1": {
-                "Savings": min(savings_goal, remaining * 0.7),
-                "Investments": remaining * 0.2,
-                "Discretionary": remaining * 0.1,
-                "Description": "Conservative: 70% savings, 20% investments, 10% discretionary",
-                "Feasible": True
-            },
-            "Option 2": {
-                "Savings": min(savings_goal, remaining * 0.6),
-                "Investments": remaining * 0.3,
-                "Discretionary": remaining * 0.1,
-                "Description": "Moderate Conservative: 60% savings, 30% investments, 10% discretionary",
-                "Feasible": True
-            }
-        }
-    elif risk == "Medium":
-        options = {
-            "Option 1": {
-                "Savings": min(savings_goal, remaining * 0.5),
-                "Investments": remaining * 0.4,
-                "Discretionary": remaining * 0.1,
-                "Description": "Balanced: 50% savings, 40% investments, 10% discretionary",
-                "Feasible": True
-            },
-            "Option 2": {
-                "Savings": min(savings_goal, remaining * 0.4),
-                "Investments": remaining * 0.5,
-                "Discretionary": remaining * 0.1,
-                "Description": "Growth Focus: 40% savings, 50% investments, 10% discretionary",
-                "Feasible": True
-            }
-        }
-    else:  # High
-        options = {
-            "Option 1": {
-                "Savings": min(savings_goal, remaining * 0.3),
-                "Investments": remaining * 0.6,
-                "Discretionary": remaining * 0.1,
-                "Description": "Aggressive: 30% savings, 60% investments, 10% discretionary",
-                "Feasible": True
-            },
-            "Option 2": {
-                "Savings": min(savings_goal, remaining * 0.2),
-                "Investments": remaining * 0.7,
-                "Discretionary": remaining * 0.1,
-                "Description": "Very Aggressive: 20% savings, 70% investments, 10% discretionary",
-                "Feasible": True
-            }
-        }
-    
-    # Ensure numbers add up correctly
-    for option in options.values():
-        total = option["Savings"] + option["Investments"] + option["Discretionary"]
-        if total > remaining:
-            adjustment_factor = remaining / total
-            option["Savings"] *= adjustment_factor
-            option["Investments"] *= adjustment_factor
-            option["Discretionary"] *= adjustment_factor
-    
-    return options
-
-budget_options = generate_budget_options(monthly_income, total_fixed_expenses, savings_goal, risk_appetite)
+# Run the budget pipeline; unchanged stages come from the engine's cache
+results = run_pipeline(monthly_income, savings_goal, risk_appetite, essential_cut, discretionary_cut,
+                       ledger=ledger, household=household, month=current_month, tracer=tracer,
+                       edits=line_item_edits,
+                       recommender=st.session_state.setdefault("recommender", RecommendationEngine()),
+                       planner="optimize" if spending_plan == "Minimum-pain optimizer" else "tiers")
 
-# Enhanced recommendations
-def generate_recommendations(groceries, bills, budget_options, monthly_income):
-    recommendations = []
-    total_expenses = groceries["Price"].sum() + bills["Amount"].sum()
-    
-    # Check if fixed expenses exceed income
-    if total_expenses > monthly_income:
-        overspend_amount = total_expenses - monthly_income
-        recommendations.append(
-            ("Critical", 
-             f"Your expenses exceed income by {overspend_amount:,.0f} UGX! "
-             "The system has automatically adjusted your spending. "
-             "Consider permanent reductions in discretionary items."))
-    
-    # Savings goal feasibility
-    feasible_savings = min(budget_options["Option 1"]["Savings"], budget_options["Option 2"]["Savings"])
-    if feasible_savings < savings_goal * 0.8:
-        recommendations.append(
-            ("High", 
-             f"Your savings goal may be too ambitious. Current feasible savings: {feasible_savings:,.0f} UGX vs goal: {savings_goal:,.0f} UGX. "
-             "Consider adjusting your savings target or reducing expenses."))
-    
-    # High-cost items analysis
-    top_groceries = groceries.nlargest(3, "Price")
-    if not top_groceries.empty:
-        recommendations.append(
-            ("Medium", 
-             f"Highest grocery costs: {', '.join([f'{x.Item} ({x.Price:,.0f} UGX)' for x in top_groceries.itertuples()])}. "
-             "Consider cheaper alternatives or reducing quantities."))
-    
-    top_bills = bills.nlargest(3, "Amount")
-    if not top_bills.empty:
-        recommendations.append(
-            ("Medium", 
-             f"Highest bills: {', '.join([f'{x.Category} ({x.Amount:,.0f} UGX)' for x in top_bills.itertuples()])}. "
-             "Review for potential savings."))
-    
-    # Discretionary spending analysis
-    discretionary_spending = groceries[groceries["Priority"] == "Discretionary"]["Price"].sum() + \
-                           bills[bills["Priority"] == "Discretionary"]["Amount"].sum()
-    if discretionary_spending > monthly_income * 0.15:
-        recommendations.append(
-            ("High", 
-             f"High discretionary spending: {discretionary_spending:,.0f} UGX ({discretionary_spending/monthly_income*100:.0f}% of income). "
-             "Consider reducing non-essential expenses."))
-    
-    # One-time expenses
-    one_time_expenses = bills[bills["Type"] == "Investments"]
-    if not one_time_expenses.empty:
-        recommendations.append(
-            ("Medium", 
-             f"Investment expenses coming up: {', '.join(one_time_expenses['Category'].tolist())}. "
-             "Plan accordingly to avoid cash flow issues."))
-    
-    return recommendations
+groceries_df, bills_df = results["groceries"], results["bills"]
+adjustment_plan = results["adjustment_plan"]
+if adjustment_plan:
+    st.warning(f"⚠️ You're overspending by {results['overspend']:,.0f} UGX. Automatic adjustments being applied.")
+for message in describe_cut_plan(results["cut_plan"]):
+    st.info(f"✂️ {message}")
 
-recommendations = generate_recommendations(groceries_df, bills_df, budget_options, monthly_income)
+# Headline numbers and charts come from the running aggregates, which count
+# line-item edits as row deltas on top of the loaded ledger
+live = results["live"]
+total_groceries = live["totals"]["total_groceries"]
+total_bills = live["totals"]["total_bills"]
+total_fixed_expenses = live["totals"]["total_fixed_expenses"]
+disposable_income = live["totals"]["disposable_income"]
 
-# Create visualizations
-def create_visualizations(groceries_df, bills_df, monthly_income, budget_options):
-    # Expense breakdown
-    expense_data = pd.concat([
-        groceries_df[["Item", "Price", "Category"]].rename(columns={"Item": "Description"}).assign(Type="Groceries"),
-        bills_df[["Category", "Amount", "Type"]].rename(columns={"Category": "Description", "Amount": "Price"})
-    ])
-    
-    # Category breakdown
-    category_spending = expense_data.groupby("Type")["Price"].sum().reset_index()
-    category_spending["Percentage"] = category_spending["Price"] / monthly_income * 100
-    
-    # Priority breakdown
-    priority_spending = pd.concat([
-        groceries_df[["Priority", "Price"]],
-        bills_df[["Priority", "Amount"]].rename(columns={"Amount": "Price"})
-    ]).groupby("Priority")["Price"].sum().reset_index()
-    
-    # Budget options visualization
-    budget_data = pd.DataFrame([
-        {"Option": "Option 1", "Type": "Savings", "Amount": budget_options["Option 1"]["Savings"]},
-        {"Option": "Option 1", "Type": "Investments", "Amount": budget_options["Option 1"]["Investments"]},
-        {"Option": "Option 1", "Type": "Discretionary", "Amount": budget_options["Option 1"]["Discretionary"]},
-        {"Option": "Option 2", "Type": "Savings", "Amount": budget_options["Option 2"]["Savings"]},
-        {"Option": "Option 2", "Type": "Investments", "Amount": budget_options["Option 2"]["Investments"]},
-        {"Option": "Option 2", "Type": "Discretionary", "Amount": budget_options["Option 2"]["Discretionary"]}
-    ])
-    
-    return {
-        "expense_breakdown": expense_data,
-        "category_spending": category_spending,
-        "priority_spending": priority_spending,
-        "budget_data": budget_data
-    }
-
-visualizations = create_visualizations(groceries_df, bills_df, monthly_income, budget_options)
+budget_options = live["budget_options"]
+recommendations = results["recommendations"]
+visualizations = dict(results["visualizations"], category_spending=live["category_spending"],
+                      priority_spending=live["priority_spending"])
 
 # Display dashboard
 tab1, tab2, tab3 = st.tabs(["Overview", "Expense Analysis", "Budget Planning"])
@@ -393,19 +128,43 @@ with tab1:
     
     st.markdown("---")
     
+    # Alerts on this month's ledger transactions; the monitor lives in the
+    # session and is only fed transactions it has not seen yet
+    if ledger is not None:
+        monitor_key = (ledger_path, household, current_month)
+        if st.session_state.get("monitor_key") != monitor_key:
+            st.session_state.monitor_key = monitor_key
+            st.session_state.monitor = SpendingMonitor()
+            st.session_state.monitor_last_id = 0
+            st.session_state.monitor_alerts = []
+        monitor = st.session_state.monitor
+        monitor.set_budgets(category_budgets(groceries_df, bills_df))
+        with tracer.span("spending_monitor") as span:
+            new_transactions = ledger.transactions_since(household, st.session_state.monitor_last_id,
+                                                         start_date=f"{current_month}-01")
+            span.rows = len(new_transactions)
+            if len(new_transactions):
+                st.session_state.monitor_alerts += monitor.observe_many(
+                    new_transactions["date"], new_transactions["category"], new_transactions["amount"])
+                st.session_state.monitor_last_id = int(new_transactions["id"].iloc[-1])
+        if st.session_state.monitor_alerts:
+            st.subheader("Spending Alerts")
+            for alert in reversed(st.session_state.monitor_alerts[-10:]):
+                show = {"Critical": st.error, "High": st.warning}.get(alert["level"], st.info)
+                show(f"{alert['date']}: {alert['message']}")
+            st.markdown("---")
+    
     # Expense breakdown chart
     st.subheader("Expense Breakdown")
-    fig = px.pie(visualizations["category_spending"], values="Price", names="Type", 
-                 title="Spending by Category")
-    st.plotly_chart(fig, use_container_width=True, key=f"pie_chart_{np.random.randint(1000)}")
+    with tracer.span("chart:category_pie"):
+        st.plotly_chart(figures.category_pie(visualizations["category_spending"]),
+                        use_container_width=True, key=CHART_KEYS["category_pie"])
     
     # Priority spending chart
     st.subheader("Spending by Priority")
-    fig = px.bar(visualizations["priority_spending"], x="Priority", y="Price", 
-                 color="Priority", text="Price",
-                 title="Total Spending by Priority Level")
-    fig.update_traces(texttemplate='%{text:,.0f}', textposition='outside')
-    st.plotly_chart(fig, use_container_width=True, key=f"bar_chart_{np.random.randint(1000)}")
+    with tracer.span("chart:priority_bar"):
+        st.plotly_chart(figures.priority_bar(visualizations["priority_spending"]),
+                        use_container_width=True, key=CHART_KEYS["priority_bar"])
 
 with tab2:
     st.header("Detailed Expense Analysis")
@@ -414,54 +173,51 @@ with tab2:
     col1, col2, col3 = st.columns(3)
     with col1:
         priority_filter = st.multiselect("Filter by Priority", 
-                                       options=groceries_df["Priority"].unique().tolist() + bills_df["Priority"].unique().tolist(),
+                                       options=list(PRIORITIES),
                                        default=["Critical", "Essential"])
     
     with col2:
         category_filter = st.multiselect("Filter by Category", 
-                                       options=groceries_df["Category"].unique().tolist() + bills_df["Type"].unique().tolist(),
+                                       options=results["expense_index"].values("Category"),
                                        default=[])
     
     with col3:
         flexibility_filter = st.multiselect("Flexibility", 
-                                          options=["None", "Low", "Medium", "High"],
+                                          options=list(FLEXIBILITIES),
                                           default=["High", "Medium"])
     
-    # Apply filters
-    filtered_groceries = groceries_df[
-        (groceries_df["Priority"].isin(priority_filter)) & 
-        (groceries_df["Category"].isin(category_filter) if category_filter else True) &
-        (groceries_df["Flexibility"].isin(flexibility_filter))
-    ]
-    
-    filtered_bills = bills_df[
-        (bills_df["Priority"].isin(priority_filter)) & 
-        (bills_df["Type"].isin(category_filter) if category_filter else True) &
-        (bills_df["Flexibility"].isin(flexibility_filter))
-    ]
-    
-    # Combine and display
-    filtered_groceries = filtered_groceries.rename(columns={"Item": "Description", "Category": "Category", "Price": "Price"})
-    filtered_bills = filtered_bills.rename(columns={"Category": "Description", "Type": "Category", "Amount": "Price"})
-    
-    expense_details = pd.concat([
-        filtered_groceries[["Description", "Category", "Price", "Priority", "Flexibility"]],
-        filtered_bills[["Description", "Category", "Price", "Priority", "Flexibility"]]
-    ], ignore_index=True)
+    with tracer.span("expense_filters") as span:
+        # Resolve the filters on the precomputed bitmap index
+        expense_details = results["expense_index"].select({
+            "Priority": priority_filter,
+            "Category": category_filter or None,
+            "Flexibility": flexibility_filter,
+        })
+        span.rows = len(expense_details)
     
-    st.dataframe(
-        expense_details.sort_values(["Priority", "Price"], ascending=[True, False]),
-        hide_index=True,
-        use_container_width=True
-    )
+    with tracer.span("dataframe:expense_details", rows=len(expense_details)):
+        st.dataframe(
+            expense_details.sort_values(["Priority", "Price"], ascending=[True, False]),
+            hide_index=True,
+            use_container_width=True
+        )
     
     # Top expenses visualization
     st.subheader("Top Expenses")
     top_expenses = expense_details.nlargest(10, "Price")
     if not top_expenses.empty:
-        fig = px.bar(top_expenses, x="Description", y="Price", color="Priority",
-                    title="Top 10 Expenses by Amount")
-        st.plotly_chart(fig, use_container_width=True, key=f"top_expenses_{np.random.randint(1000)}")
+        with tracer.span("chart:top_expenses"):
+            st.plotly_chart(figures.top_expenses_bar(top_expenses),
+                            use_container_width=True, key=CHART_KEYS["top_expenses"])
+
+    # Editable line items; changes are picked up by the next rerun's pipeline
+    with st.expander("✏️ Edit line items"):
+        loaded_groceries, loaded_bills = results["loaded"]
+        st.caption("Edit amounts and priorities in place, or add and delete rows. Totals update on the next rerun.")
+        st.data_editor(loaded_groceries, key="edit_grocery", num_rows="dynamic",
+                       hide_index=True, use_container_width=True)
+        st.data_editor(loaded_bills, key="edit_bill", num_rows="dynamic",
+                       hide_index=True, use_container_width=True)
 
 with tab3:
     st.header("Budget Planning & Recommendations")
@@ -474,19 +230,9 @@ with tab3:
         st.markdown(f"**{list(budget_options.keys())[0]}**")
         st.write(budget_options["Option 1"]["Description"])
         
-        fig = px.pie(
-            pd.DataFrame({
-                "Type": ["Savings", "Investments", "Discretionary"],
-                "Amount": [
-                    budget_options["Option 1"]["Savings"],
-                    budget_options["Option 1"]["Investments"],
-                    budget_options["Option 1"]["Discretionary"]
-                ]
-            }),
-            values="Amount", names="Type",
-            title="Budget Allocation"
-        )
-        st.plotly_chart(fig, use_container_width=True, key=f"budget_pie1_{np.random.randint(1000)}")
+        with tracer.span("chart:budget_pie1"):
+            st.plotly_chart(figures.budget_pie(budget_options["Option 1"]),
+                            use_container_width=True, key=CHART_KEYS["budget_pie1"])
         
         st.metric("Total Allocated", 
                  f"{budget_options['Option 1']['Savings'] + budget_options['Option 1']['Investments'] + budget_options['Option 1']['Discretionary']:,.0f} UGX",
@@ -496,24 +242,73 @@ with tab3:
         st.markdown(f"**{list(budget_options.keys())[1]}**")
         st.write(budget_options["Option 2"]["Description"])
         
-        fig = px.pie(
-            pd.DataFrame({
-                "Type": ["Savings", "Investments", "Discretionary"],
-                "Amount": [
-                    budget_options["Option 2"]["Savings"],
-                    budget_options["Option 2"]["Investments"],
-                    budget_options["Option 2"]["Discretionary"]
-                ]
-            }),
-            values="Amount", names="Type",
-            title="Budget Allocation"
-        )
-        st.plotly_chart(fig, use_container_width=True, key=f"budget_pie2_{np.random.randint(1000)}")
+        with tracer.span("chart:budget_pie2"):
+            st.plotly_chart(figures.budget_pie(budget_options["Option 2"]),
+                            use_container_width=True, key=CHART_KEYS["budget_pie2"])
         
         st.metric("Total Allocated", 
                  f"{budget_options['Option 2']['Savings'] + budget_options['Option 2']['Investments'] + budget_options['Option 2']['Discretionary']:,.0f} UGX",
                  delta=f"{disposable_income - (budget_options['Option 2']['Savings'] + budget_options['Option 2']['Investments'] + budget_options['Option 2']['Discretionary']):+,.0f} UGX remaining")
     
+    # Goal seek: the smallest cuts (discretionary first) that reach the savings goal
+    if spending_plan == "Fixed tiers" and savings_goal > 0:
+        st.subheader("Goal Seek")
+        path = run_goal_seek(results, monthly_income, risk_appetite, tracer=tracer)
+        needed = required_cuts(path, savings_goal)
+        if not needed["feasible"][0]:
+            st.warning(f"Even the largest cuts ({path['essential_cut'][-1]:.0f}% essential, "
+                       f"{path['discretionary_cut'][-1]:.0f}% discretionary) only make "
+                       f"{needed['feasible_savings'][0]:,.0f} UGX of savings feasible.")
+        elif needed["discretionary_cut"][0] == 0 and needed["essential_cut"][0] == 0:
+            st.success(f"The {savings_goal:,.0f} UGX savings goal is feasible without any cuts.")
+        else:
+            essential_note = (f" and a {needed['essential_cut'][0]:.0f}% essential cut"
+                              if needed["essential_cut"][0] > 0 else "")
+            st.info(f"🎯 A {needed['discretionary_cut'][0]:.0f}% discretionary cut{essential_note} "
+                    f"makes the {savings_goal:,.0f} UGX savings goal feasible.")
+
+        if st.checkbox("Show goal vs required cuts"):
+            import plotly.express as px
+
+            targets = np.linspace(0, path["feasible_savings"][-1] * 1.1, 200)
+            curve = required_cuts(path, targets)
+            curve_df = pd.DataFrame({"Savings goal": curve["target"],
+                                     "Discretionary cut (%)": curve["discretionary_cut"],
+                                     "Essential cut (%)": curve["essential_cut"]})
+            with tracer.span("chart:goal_seek"):
+                fig = px.line(curve_df, x="Savings goal", y=["Discretionary cut (%)", "Essential cut (%)"],
+                              line_shape="hv", title="Smallest Cuts Needed per Savings Goal",
+                              labels={"value": "Cut (%)", "variable": ""})
+                fig.add_vline(x=savings_goal, line_dash="dash")
+                st.plotly_chart(fig, use_container_width=True, key="goal_seek")
+
+    # What-if grid over every cut combination and risk level
+    if st.checkbox("Show what-if grid for all cut combinations"):
+        import plotly.express as px
+
+        grid = run_sweep(results, monthly_income, savings_goal, tracer=tracer)
+        with tracer.span("chart:sweep_savings"):
+            fig = px.imshow(
+                grid["feasible_savings"],
+                x=grid["discretionary_cuts"], y=grid["essential_cuts"],
+                facet_col=0, origin="lower", aspect="auto", color_continuous_scale="Greens",
+                labels={"x": "Discretionary cut (%)", "y": "Essential cut (%)", "color": "Feasible savings"},
+                title="Feasible Savings by Cut Combination"
+            )
+            for annotation, risk in zip(fig.layout.annotations, grid["risks"]):
+                annotation.text = f"{risk} risk"
+            st.plotly_chart(fig, use_container_width=True, key="sweep_savings")
+        
+        with tracer.span("chart:sweep_disposable"):
+            fig = px.imshow(
+                grid["disposable_income"][0],
+                x=grid["discretionary_cuts"], y=grid["essential_cuts"],
+                origin="lower", aspect="auto", color_continuous_scale="RdYlGn",
+                labels={"x": "Discretionary cut (%)", "y": "Essential cut (%)", "color": "Disposable income"},
+                title="Disposable Income by Cut Combination (same for every risk level)"
+            )
+            st.plotly_chart(fig, use_container_width=True, key="sweep_disposable")
+    
     st.markdown("---")
     
     # Recommendations
@@ -532,113 +327,78 @@ with tab3:
     # Spending Adjustments by Priority Table
     st.subheader("Spending Adjustments by Priority")
     
-    # Create a summary of original vs adjusted spending by priority
-    def create_adjustment_summary(groceries_df, bills_df):
-        # Combine groceries and bills
-        all_expenses = pd.concat([
-            groceries_df[["Item", "Original Price", "Price", "Priority"]].rename(columns={"Item": "Description"}),
-            bills_df[["Category", "Original Amount", "Amount", "Priority"]].rename(columns={
-                "Category": "Description",
-                "Original Amount": "Original Price",
-                "Amount": "Price"
-            })
-        ])
-        
-        # Calculate adjustments
-        all_expenses["Adjustment"] = all_expenses["Price"] - all_expenses["Original Price"]
-        all_expenses["% Change"] = (all_expenses["Adjustment"] / all_expenses["Original Price"]) * 100
-        
-        # Group by priority
-        priority_summary = all_expenses.groupby("Priority").agg({
-            "Original Price": "sum",
-            "Price": "sum",
-            "Adjustment": "sum",
-            "% Change": "mean"
-        }).reset_index()
-        
-        priority_summary = priority_summary.rename(columns={
-            "Original Price": "Original Amount",
-            "Price": "Adjusted Amount",
-            "Adjustment": "Total Adjustment",
-            "% Change": "Avg % Change"
-        })
-        
-        # Calculate percentage of income
-        priority_summary["% of Income"] = (priority_summary["Adjusted Amount"] / monthly_income) * 100
-        
-        return priority_summary.sort_values("Adjusted Amount", ascending=False), all_expenses
-    
-    priority_summary, detailed_adjustments = create_adjustment_summary(groceries_df, bills_df)
+    priority_summary = live["priority_summary"]
     
     # Show summary table
     st.write("**Summary of Spending Adjustments by Priority Level**")
-    st.dataframe(
-        priority_summary.style.format({
-            "Original Amount": "{:,.0f} UGX",
-            "Adjusted Amount": "{:,.0f} UGX",
-            "Total Adjustment": "{:,.0f} UGX",
-            "Avg % Change": "{:.1f}%",
-            "% of Income": "{:.1f}%"
-        }),
-        hide_index=True,
-        use_container_width=True
-    )
+    with tracer.span("dataframe:priority_summary", rows=len(priority_summary)):
+        st.dataframe(
+            priority_summary.style.format({
+                "Original Amount": "{:,.0f} UGX",
+                "Adjusted Amount": "{:,.0f} UGX",
+                "Total Adjustment": "{:,.0f} UGX",
+                "Avg % Change": "{:.1f}%",
+                "% of Income": "{:.1f}%"
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
     
     # Detailed adjustments table with filters
     st.write("**Detailed Item-by-Item Adjustments**")
     
-    adj_col1, adj_col2 = st.columns(2)
+    adj_col1, adj_col2, adj_col3, adj_col4 = st.columns(4)
     with adj_col1:
         adj_priority_filter = st.multiselect(
             "Filter by Priority (Detailed)",
-            options=detailed_adjustments["Priority"].unique(),
+            options=list(PRIORITIES),
             default=["Critical", "Essential"]
         )
     with adj_col2:
         show_only_adjusted = st.checkbox("Show only adjusted items", value=True)
-    
-    # Apply filters
-    filtered_adjustments = detailed_adjustments[
-        detailed_adjustments["Priority"].isin(adj_priority_filter)
-    ]
-    if show_only_adjusted:
-        filtered_adjustments = filtered_adjustments[filtered_adjustments["Adjustment"] != 0]
-    
-    # Ensure unique column names and reset index to avoid conflicts
-    filtered_adjustments = filtered_adjustments.rename(columns={
-        "Original Price": "Original_Price",
-        "Price": "Adjusted_Price",
-        "Adjustment": "Amount_Adjusted",
-        "% Change": "Percentage_Change"
-    }).reset_index(drop=True)
+    with adj_col3:
+        adj_sort = st.selectbox("Sort by", list(results["adjustment_pages"].sort_keys))
+        adj_descending = st.checkbox("Descending", value=False)
+    with adj_col4:
+        adj_page_size = st.selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE))
+    
+    # Resolve the filters on the precomputed bitmap index, then sort and slice
+    # the pre-formatted table; only the visible page is styled and sent
+    adjustment_table = results["adjustment_pages"]
+    with tracer.span("adjustment_filters") as span:
+        adj_mask = results["adjustment_index"].mask(
+            {"Priority": adj_priority_filter},
+            flags=("adjusted",) if show_only_adjusted else ()
+        )
+        span.rows = adjustment_table.size
+    adj_pages = max(1, -(-int(adj_mask.sum()) // adj_page_size))
+    adj_page = st.number_input("Page", min_value=1, max_value=adj_pages, value=1, step=1)
+    with tracer.span("adjustment_page") as span:
+        page = adjustment_table.page(adj_mask, adj_sort, adj_descending, adj_page, adj_page_size)
+        span.rows = len(page["rows"])
     
     # Display detailed adjustments
-    st.dataframe(
-        filtered_adjustments.sort_values(["Priority", "Amount_Adjusted"]).style.format({
-            "Original_Price": "{:,.0f} UGX",
-            "Adjusted_Price": "{:,.0f} UGX",
-            "Amount_Adjusted": "{:,.0f} UGX",
-            "Percentage_Change": "{:.1f}%"
-        }).apply(lambda x: ["background: #ffcccc" if v < 0 else "" for v in x], 
-               subset=["Amount_Adjusted"]),
-        column_config={
-            "Description": "Item/Expense",
-            "Original_Price": "Original Amount",
-            "Adjusted_Price": "Adjusted Amount",
-            "Amount_Adjusted": st.column_config.NumberColumn(
-                "Amount Saved",
-                format="%,d UGX",
-                help="Negative values indicate spending reductions"
-            ),
-            "Percentage_Change": st.column_config.NumberColumn(
-                "% Change",
-                format="%.1f%%",
-                help="Percentage reduction from original amount"
-            )
-        },
-        hide_index=True,
-        use_container_width=True
-    )
+    with tracer.span("dataframe:detailed_adjustments", rows=len(page["rows"])):
+        highlight = np.where(page["highlight"], "background: #ffcccc", "")
+        st.dataframe(
+            page["rows"].style.apply(lambda _: highlight, subset=["Amount Saved"]),
+            column_config={
+                "Description": "Item/Expense",
+                "Amount Saved": st.column_config.TextColumn(
+                    "Amount Saved",
+                    help="Negative values indicate spending reductions"
+                ),
+                "% Change": st.column_config.TextColumn(
+                    "% Change",
+                    help="Percentage reduction from original amount"
+                )
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+        first_row = (page["page"] - 1) * adj_page_size + 1
+        st.caption(f"Rows {min(first_row, page['total']):,}-{first_row + len(page['rows']) - 1:,} "
+                   f"of {page['total']:,} (page {page['page']} of {page['pages']})")
     
     # Add some analysis of the adjustments
     total_reduction = priority_summary["Total Adjustment"].sum()
@@ -654,27 +414,108 @@ with tab3:
     
     # Savings projection
     st.subheader("Savings Projection")
-    if st.checkbox("Show 12-month projection"):
+    if st.checkbox("Show savings projection"):
         selected_option = st.radio("Use budget option:", ["Option 1", "Option 2"])
+        horizon = st.slider("Projection horizon (months)", 12, 120, 12, step=12)
         monthly_savings = budget_options[selected_option]["Savings"]
         
-        savings_data = []
-        current = current_savings
-        for month in range(1, 13):
-            current += monthly_savings
-            savings_data.append({
-                "Month": datetime(2023, month, 1).strftime("%b %Y"),
-                "Amount": current,
-                "Monthly Addition": monthly_savings,
-                "Cumulative Savings": current
-            })
-        
-        savings_df = pd.DataFrame(savings_data)
+        with tracer.span("savings_projection") as span:
+            balances = simulate_savings(
+                current_savings, monthly_savings, monthly_income, total_fixed_expenses, months=horizon,
+                as_needed_amounts=groceries_df.loc[groceries_df["Item"].isin(AS_NEEDED_ITEMS), "Price"].tolist()
+            )
+            span.rows = balances.size
+            savings_df = pd.DataFrame(projection_bands(balances))
+            savings_df = savings_df.rename(columns={"P10": "Pessimistic (P10)", "P50": "Median", "P90": "Optimistic (P90)"})
         
-        fig = px.line(savings_df, x="Month", y="Cumulative Savings", 
-                     title="12-Month Savings Projection",
-                     markers=True)
-        fig.update_traces(line_color="green")
-        st.plotly_chart(fig, use_container_width=True)
+        with tracer.span("chart:savings_projection"):
+            import plotly.express as px
+
+            fig = px.line(savings_df, x="Month", y=["Pessimistic (P10)", "Optimistic (P90)", "Median"],
+                         title=f"{horizon}-Month Savings Projection ({DEFAULT_PATHS:,} simulated paths)",
+                         labels={"value": "Savings (UGX)", "variable": ""})
+            # Shade the P10-P90 band
+            fig.update_traces(line_color="rgba(0,128,0,0.3)")
+            fig.update_traces(selector={"name": "Optimistic (P90)"}, fill="tonexty", fillcolor="rgba(0,128,0,0.1)")
+            fig.update_traces(selector={"name": "Median"}, line_color="green")
+            st.plotly_chart(fig, use_container_width=True, key="savings_projection")
         
-        st.dataframe(savings_df, hide_index=True)
\ No newline at end of file
+        with tracer.span("dataframe:savings_projection", rows=len(savings_df)):
+            st.dataframe(savings_df, hide_index=True)
+
+    # Calendar cash flow: real payment dates instead of one average month
+    st.subheader("Cash-Flow Calendar")
+    if st.checkbox("Show cash-flow calendar"):
+        calendar_horizon = st.slider("Calendar horizon (months)", 12, 60, 12, step=12)
+        with tracer.span("cash_flow") as span:
+            cash = cash_flow(schedule_items(groceries_df, bills_df), calendar_horizon,
+                             monthly_income, current_savings)
+            span.rows = cash["item_month"].size
+            cash_df = pd.DataFrame({column: cash[column] for column in
+                                    ("Month", "Inflow", "Outflow", "Net", "Closing Balance", "Minimum Balance")})
+
+        with tracer.span("chart:cash_flow"):
+            import plotly.express as px
+
+            fig = px.bar(cash_df, x="Month", y=["Inflow", "Outflow"], barmode="group",
+                         title="Monthly Inflow and Outflow on Actual Payment Dates",
+                         labels={"value": "Amount (UGX)", "variable": ""})
+            fig.add_scatter(x=cash_df["Month"], y=cash_df["Minimum Balance"], name="Lowest balance in month",
+                            mode="lines+markers")
+            st.plotly_chart(fig, use_container_width=True, key="cash_flow")
+
+        short_months = cash_df[cash_df["Minimum Balance"] < 0]
+        if not short_months.empty:
+            st.warning(f"⚠️ Balance drops below zero in {len(short_months)} of {calendar_horizon} months, "
+                       f"first in {short_months['Month'].iloc[0]:%B %Y}")
+        st.dataframe(cash_df.style.format({column: "{:,.0f} UGX" for column in cash_df.columns if column != "Month"}),
+                     hide_index=True)
+
+    # Monthly snapshots kept in the archive at FINANCE_ARCHIVE_DIR
+    if archive is not None:
+        st.subheader("Spending History")
+        archive_household = household or "default"
+        archive_month = current_month or datetime.now().strftime("%Y-%m")
+        if st.button(f"Archive {archive_month} snapshot"):
+            try:
+                archive.append_month(archive_household, archive_month, groceries_df, bills_df, budget_options,
+                                     monthly_income)
+                st.success(f"Archived {archive_month}")
+            except ValueError as error:
+                st.info(str(error))
+
+        with tracer.span("category_trends") as span:
+            trends = archive.category_trends(archive_household)
+            span.rows = len(trends)
+        if trends.empty:
+            st.caption("No archived months yet.")
+        else:
+            import plotly.express as px
+
+            category_options = sorted(trends["Category"].unique())
+            trend_categories = st.multiselect("Categories", category_options,
+                                              default=[c for c in ("Food Staples", "Transport") if c in category_options])
+            trend_measure = st.radio("Show", ["Adjusted", "MoM %", "YoY %"], horizontal=True)
+            shown = trends[trends["Category"].isin(trend_categories)]
+            with tracer.span("chart:category_trends"):
+                fig = px.line(shown, x="Month", y=trend_measure, color="Category", markers=True,
+                              title=f"Spending by Category ({trend_measure})",
+                              labels={"Adjusted": "Adjusted spending (UGX)"})
+                st.plotly_chart(fig, use_container_width=True, key="category_trends")
+
+# Performance panel: waterfall of this rerun's spans
+if debug_mode:
+    spans = pd.DataFrame(tracer.spans())
+    tracer.flush()
+    with st.sidebar:
+        st.subheader("Rerun waterfall")
+        if not spans.empty:
+            st.caption(f"Rerun {tracer.rerun_id}: {spans['duration_ms'].sum():,.1f} ms in {len(spans)} spans")
+            import plotly.express as px
+
+            fig = px.bar(spans, x="duration_ms", y="name", base="start_ms", orientation="h",
+                         color="cached", hover_data=["rows", "alloc_bytes"],
+                         labels={"duration_ms": "ms", "name": ""})
+            fig.update_yaxes(autorange="reversed")
+            st.plotly_chart(fig, use_container_width=True, key="debug_waterfall")
+            st.dataframe(spans, hide_index=True, use_container_width=True)
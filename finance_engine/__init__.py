@@ -0,0 +1,28 @@
+"""Budget engine shared by the family money dashboards.
+
+The modules here hold the pure budgeting logic; nothing in this package
+imports Streamlit, so it can be used from scripts and services as well.
+
+Importing the package loads nothing else: submodules are imported on first
+attribute access (``finance_engine.stages``), and pandas and Plotly only by
+the modules that build frames or figures. ``taxonomy``, ``money``,
+``projection``, ``planner``, ``batch``, ``overspend`` and ``cashflow`` need
+numpy alone.
+"""
+import importlib
+
+_SUBMODULES = frozenset((
+    "aggregates", "archive", "batch", "cashflow", "catalog", "classic", "cli", "figures", "filter_index", "goalseek",
+    "importer", "ledger", "memo", "money", "monitor", "nightly", "overspend", "paging", "pipeline", "planner",
+    "projection", "rules", "schema", "service", "stages", "sweep", "taxonomy", "trace",
+))
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
@@ -0,0 +1,249 @@
+"""Running aggregates of the budget line items, updated by row deltas.
+
+``RunningAggregates`` keeps, for every cell (kind x priority x flexibility x
+category), how many rows carry each distinct amount in whole minor units
+(see ``finance_engine.money``). Applying a line-item edit, insert or delete
+touches one or two counts, so the update itself is O(1) however long the
+ledger is. Reading the figures is not: ``summary`` is linear in the
+distinct (cell, amount) pairs, which on a real ledger grows with its length.
+
+Every stage between the raw line items and the overview numbers treats the
+items of one cut/adjust class alike (see ``finance_engine.batch``), and rows
+of equal amount in a class end up equal. The totals, the adjustment plan,
+the budget options, the spending by category and priority, and the priority
+summary can therefore all be solved from the counts alone: each distinct
+amount is cut once, and a tier's reduction is shared out over the counts by
+largest remainder (``money.allocate_counts``). ``summary`` does this in time
+proportional to the number of distinct (cell, amount) pairs.
+
+The results match the stages to the minor unit, with one exception: when
+items of different amounts tie for a tier's last leftover units, the stages
+give them to the earlier rows, while the counts do not know the row order
+and give them in cell order. The household totals, the plan and the options
+are unaffected; a per-category or per-priority figure can move by those
+units.
+
+``apply_editor_state`` and ``edit_frame`` accept the change set that
+``st.data_editor`` keeps in session state::
+
+    {"edited_rows": {row: {column: value}}, "added_rows": [{column: value}],
+     "deleted_rows": [row]}
+
+Row numbers are positions in the frame that was handed to the editor. A
+row is only counted once it is complete (``is_complete``): added rows wait
+for their amount and taxonomy values, and an edit that clears one of them
+is ignored, so the row keeps its last complete values. ``edit_frame`` does
+the same, so both paths see the same rows.
+
+``run_pipeline`` still applies the edits to the frames too, because the
+recommendations, tables and filter indexes are per row. Those frames get a
+new data key, so an edit re-runs every stage downstream of it; the
+aggregates cost one copy and one ``summary`` on top, each linear in the
+distinct pairs rather than in the rows.
+"""
+import numpy as np
+import pandas as pd
+
+from finance_engine import money
+from finance_engine.batch import (CLASS_IS_BILL, CLASS_TIER, N_CLASSES, TIER_DISCRETIONARY,
+                                  TIER_FLEXIBLE_ESSENTIAL, adjustment_plan, cut_amounts, item_classes, risk_code,
+                                  solve_class_totals)
+from finance_engine.schema import PRIORITIES, categorize_bills, categorize_groceries
+from finance_engine.stages import generate_budget_options
+
+# Frame columns per kind of line item
+AMOUNT_COLUMN = {"grocery": "Price", "bill": "Amount"}
+CATEGORY_COLUMN = {"grocery": "Category", "bill": "Type"}
+_CATEGORIZE = {"grocery": categorize_groceries, "bill": categorize_bills}
+
+
+def _cell(kind, row):
+    return (kind, row["Priority"], row["Flexibility"], row[CATEGORY_COLUMN[kind]])
+
+
+def is_complete(kind, row):
+    """True when a row has the amount and taxonomy values it needs to be counted."""
+    return all(pd.notna(row.get(column)) and row.get(column) != ""
+               for column in (AMOUNT_COLUMN[kind], "Priority", "Flexibility", CATEGORY_COLUMN[kind]))
+
+
+class RunningAggregates:
+    """Per-cell ``{amount in minor units: rows}`` over grocery and bill line items."""
+
+    def __init__(self, cells=None):
+        self.cells = {} if cells is None else cells
+
+    @classmethod
+    def from_frames(cls, groceries_df, bills_df):
+        cells = {}
+        for kind, frame in (("grocery", groceries_df), ("bill", bills_df)):
+            minor = money.to_minor(frame[AMOUNT_COLUMN[kind]].to_numpy(dtype=np.float64))
+            grouped = frame.groupby([frame["Priority"], frame["Flexibility"], frame[CATEGORY_COLUMN[kind]], minor],
+                                    observed=True).size()
+            for (priority, flexibility, category, amount), rows in grouped.items():
+                cells.setdefault((kind, priority, flexibility, category), {})[int(amount)] = int(rows)
+        return cls(cells)
+
+    def copy(self):
+        return RunningAggregates({cell: dict(counts) for cell, counts in self.cells.items()})
+
+    # Row deltas
+
+    def _apply(self, kind, row, sign):
+        cell = _cell(kind, row)
+        amount = money.to_minor(float(row[AMOUNT_COLUMN[kind]]))
+        counts = self.cells.setdefault(cell, {})
+        counts[amount] = counts.get(amount, 0) + sign
+        if counts[amount] == 0:
+            del counts[amount]
+            if not counts:
+                del self.cells[cell]
+
+    def add(self, kind, row):
+        self._apply(kind, row, 1)
+
+    def remove(self, kind, row):
+        self._apply(kind, row, -1)
+
+    def update(self, kind, old_row, new_row):
+        self.remove(kind, old_row)
+        self.add(kind, new_row)
+
+    def apply_editor_state(self, kind, frame, state):
+        """Apply an ``st.data_editor`` change set made on ``frame``.
+
+        Added rows that are still missing an amount or a taxonomy value are
+        left out until they are complete, and edits that clear one are
+        ignored, matching ``edit_frame``.
+        """
+        if not state:
+            return self
+        deleted = {int(position) for position in state.get("deleted_rows", ())}
+        for position, changes in state.get("edited_rows", {}).items():
+            position = int(position)
+            if position in deleted:
+                continue
+            old_row = frame.iloc[position].to_dict()
+            new_row = dict(old_row, **changes)
+            if is_complete(kind, new_row):
+                self.update(kind, old_row, new_row)
+        for row in state.get("added_rows", ()):
+            if is_complete(kind, row):
+                self.add(kind, row)
+        for position in deleted:
+            self.remove(kind, frame.iloc[position].to_dict())
+        return self
+
+    # Derived figures
+
+    def summary(self, monthly_income, savings_goal, risk_appetite, essential_cut, discretionary_cut):
+        """Totals, adjustment plan, budget options and spending breakdowns.
+
+        Matches ``compute_totals``, ``auto_adjust_spending``'s plan,
+        ``generate_budget_options``, ``create_expense_breakdown`` and
+        ``create_adjustment_summary``'s priority table on the same items (see
+        the module docstring for tied leftover units).
+        """
+        cells = list(self.cells)
+        cell_of, amounts, rows = np.array(
+            [(i, amount, rows) for i, cell in enumerate(cells) for amount, rows in self.cells[cell].items()],
+            dtype=np.int64).reshape(-1, 3).T
+        cell_classes = item_classes({
+            "kind": [cell[0] for cell in cells],
+            "priority": [cell[1] for cell in cells],
+            "flexibility": [cell[2] for cell in cells],
+        }) if cells else np.zeros(0, dtype=np.intp)
+        classes = cell_classes[cell_of]
+
+        # Each distinct amount is cut once; the rows sharing it end up equal
+        cut = cut_amounts(amounts, np.zeros(len(amounts), dtype=np.intp), classes,
+                          np.array([essential_cut]), np.array([discretionary_cut]))
+        class_totals = np.bincount(classes, weights=cut * rows, minlength=N_CLASSES).astype(np.int64)
+        household_columns, discretionary_cut_units, flexible_cut_units = solve_class_totals(
+            class_totals[None, :], np.array([money.to_minor(float(monthly_income))]),
+            np.array([money.to_minor(float(savings_goal))]), np.array([risk_code(risk_appetite)]))
+
+        reduction = np.zeros(len(amounts), dtype=np.int64)
+        tier = CLASS_TIER[classes]
+        for tier_code, removed in ((TIER_DISCRETIONARY, discretionary_cut_units),
+                                   (TIER_FLEXIBLE_ESSENTIAL, flexible_cut_units)):
+            members = np.flatnonzero(tier == tier_code)
+            if removed[0] > 0:
+                reduction[members] = money.allocate_counts(removed[0], cut[members], rows[members])
+
+        original = money.to_units(np.bincount(cell_of, weights=amounts * rows, minlength=len(cells)).astype(np.int64))
+        adjusted = money.to_units(np.bincount(cell_of, weights=cut * rows - reduction,
+                                              minlength=len(cells)).astype(np.int64))
+        # Per-row % changes summed per pair; rows of 0 have none
+        nonzero = np.where(amounts != 0, rows, 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change = np.where(amounts != 0, ((cut - amounts) * rows - reduction) / amounts * 100, 0.0)
+
+        total_bills = adjusted[CLASS_IS_BILL[cell_classes]].sum()
+        totals = {
+            "total_groceries": household_columns["total_fixed_expenses"][0] - total_bills,
+            "total_bills": total_bills,
+            "total_fixed_expenses": household_columns["total_fixed_expenses"][0],
+            "disposable_income": household_columns["disposable_income"][0],
+        }
+
+        cell_frame = pd.DataFrame({
+            "Type": [cell[3] if cell[0] == "bill" else "Groceries" for cell in cells],
+            "Priority": pd.Categorical([cell[1] for cell in cells], categories=PRIORITIES),
+            "Original Amount": original,
+            "Adjusted Amount": adjusted,
+            "Total Adjustment": adjusted - original,
+            "weighted_change": np.bincount(cell_of, weights=change, minlength=len(cells)),
+            "nonzero": np.bincount(cell_of, weights=nonzero, minlength=len(cells)),
+        })
+
+        category_spending = cell_frame.groupby("Type")["Adjusted Amount"].sum().reset_index(name="Price")
+        category_spending["Percentage"] = category_spending["Price"] / monthly_income * 100
+
+        by_priority = cell_frame.groupby("Priority", observed=True)
+        priority_spending = by_priority["Adjusted Amount"].sum().reset_index(name="Price")
+
+        priority_summary = by_priority[["Original Amount", "Adjusted Amount", "Total Adjustment",
+                                        "weighted_change", "nonzero"]].sum().reset_index()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            priority_summary["Avg % Change"] = priority_summary["weighted_change"] / priority_summary["nonzero"]
+        priority_summary = priority_summary.drop(columns=["weighted_change", "nonzero"])
+        priority_summary["% of Income"] = (priority_summary["Adjusted Amount"] / monthly_income) * 100
+
+        return {
+            "totals": totals,
+            "adjustment_plan": adjustment_plan(household_columns, 0),
+            "budget_options": generate_budget_options(
+                monthly_income, totals["total_fixed_expenses"], savings_goal, risk_appetite),
+            "category_spending": category_spending,
+            "priority_spending": priority_spending,
+            "priority_summary": priority_summary.sort_values("Adjusted Amount", ascending=False),
+        }
+
+
+def edit_frame(kind, frame, state):
+    """Return ``frame`` with an ``st.data_editor`` change set applied."""
+    if not state:
+        return frame
+    frame = frame.reset_index(drop=True)
+    taxonomy = ["Priority", "Flexibility", CATEGORY_COLUMN[kind]]
+    # Plain objects while editing, so new category values can be assigned
+    frame = frame.astype({column: object for column in taxonomy if column in frame})
+    for position, changes in state.get("edited_rows", {}).items():
+        if not is_complete(kind, dict(frame.iloc[int(position)].to_dict(), **changes)):
+            continue
+        for column, value in changes.items():
+            frame.iat[int(position), frame.columns.get_loc(column)] = value
+    deleted = [int(position) for position in state.get("deleted_rows", ())]
+    added = [row for row in state.get("added_rows", ()) if is_complete(kind, row)]
+    frame = frame.drop(index=deleted)
+    if added:
+        frame = pd.concat([frame, pd.DataFrame(added)], ignore_index=True)
+    frame[AMOUNT_COLUMN[kind]] = frame[AMOUNT_COLUMN[kind]].astype("float64")
+    return _CATEGORIZE[kind](frame.reset_index(drop=True))
+
+
+def edit_frames(groceries_df, bills_df, edits):
+    """Apply ``{"grocery": state, "bill": state}`` editor change sets to both frames."""
+    return (edit_frame("grocery", groceries_df, edits.get("grocery")),
+            edit_frame("bill", bills_df, edits.get("bill")))
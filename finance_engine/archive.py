@@ -0,0 +1,246 @@
+"""Append-only columnar archive of monthly budget snapshots.
+
+Each run of the pipeline only knows the current month. The archive keeps one
+snapshot per household and month, for trend queries over years of history:
+
+* ``items``: every line item's original and adjusted amount, with its kind,
+  description, category (grocery Category or bill Type) and priority;
+* ``budgets``: each budget option's savings, investments and discretionary
+  split, with the month's income and total expenses.
+
+Every column is a flat little-endian binary file under
+``<root>/<household>/<table>/``, and string columns are dictionary-encoded
+to ``int32`` codes. ``meta.json`` holds the committed row counts and the
+dictionaries. Readers open the column files with ``np.memmap`` and slice them
+without copying. Rows are appended in month order, so a month range is a
+binary search on the month column. A query over one category or one year
+pages in only the bytes it touches, never the whole history.
+
+Appends write the columns first and then replace ``meta.json`` atomically.
+Bytes past the committed row count (from an interrupted append) are ignored
+by readers and truncated by the next append. One process should write a
+household at a time; any number may read.
+"""
+import json
+import os
+import threading
+from datetime import date
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+TABLES = {
+    "items": {
+        "month": "<i4",
+        "kind": "<i4",
+        "description": "<i4",
+        "category": "<i4",
+        "priority": "<i4",
+        "original": "<f8",
+        "adjusted": "<f8",
+    },
+    "budgets": {
+        "month": "<i4",
+        "option": "<i4",
+        "income": "<f8",
+        "expenses": "<f8",
+        "savings": "<f8",
+        "investments": "<f8",
+        "discretionary": "<f8",
+    },
+}
+# Dictionary-encoded columns, with one shared dictionary per column name
+DICTIONARY_COLUMNS = ("kind", "description", "category", "priority", "option")
+
+
+def month_code(month):
+    """Months since 1970-01 of a ``YYYY-MM`` string or date."""
+    return int(np.datetime64(month, "M").astype(np.int64))
+
+
+def month_start(code):
+    """The first day of the month ``code`` (see ``month_code``)."""
+    return date(int(code) // 12 + 1970, int(code) % 12 + 1, 1)
+
+
+def _percent_change(matrix, lag):
+    change = np.full(matrix.shape, np.nan)
+    if len(matrix) > lag:
+        previous = matrix[:-lag]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change[lag:] = np.where(previous > 0, (matrix[lag:] / previous - 1) * 100, np.nan)
+    return change
+
+
+class SnapshotArchive:
+    """Monthly snapshots for many households under one ``root`` directory."""
+
+    def __init__(self, root):
+        self.root = str(root)
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, household, *parts):
+        return os.path.join(self.root, quote(household, safe=""), *parts)
+
+    def _meta(self, household):
+        try:
+            with open(self._path(household, "meta.json")) as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return {"tables": {table: {"rows": 0} for table in TABLES},
+                    "dictionaries": {column: [] for column in DICTIONARY_COLUMNS}}
+
+    def _write_meta(self, household, meta):
+        path = self._path(household, "meta.json")
+        with open(path + ".tmp", "w") as handle:
+            json.dump(meta, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(path + ".tmp", path)
+
+    def _column(self, household, table, column, rows):
+        dtype = np.dtype(TABLES[table][column])
+        if rows == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self._path(household, table, f"{column}.bin"), dtype=dtype, mode="r", shape=(rows,))
+
+    def months(self, household):
+        """Archived months of ``household`` as ``YYYY-MM`` strings."""
+        month = self.columns(household, "budgets")["month"]
+        return [f"{start:%Y-%m}" for start in map(month_start, np.unique(month))]
+
+    def columns(self, household, table="items", start=None, end=None):
+        """Memory-mapped columns of ``table`` for months in ``[start, end)``.
+
+        Dictionary columns hold codes; ``dictionaries`` decodes them.
+        """
+        meta = self._meta(household)
+        rows = meta["tables"][table]["rows"]
+        month = self._column(household, table, "month", rows)
+        low = 0 if start is None else int(np.searchsorted(month, month_code(start)))
+        high = rows if end is None else int(np.searchsorted(month, month_code(end)))
+        return {column: self._column(household, table, column, rows)[low:high] for column in TABLES[table]}
+
+    def dictionaries(self, household):
+        return self._meta(household)["dictionaries"]
+
+    def append_month(self, household, month, groceries_df, bills_df, budget_options, monthly_income):
+        """Append one month's snapshot of the adjusted frames and options.
+
+        Frames carry their pre-adjustment amounts in ``Original Price`` /
+        ``Original Amount`` (as the pipeline's frames do). Months must be
+        appended in order, each once; an earlier or repeated month raises
+        ``ValueError``.
+        """
+        code = month_code(month)
+        with self._lock:
+            meta = self._meta(household)
+            last = self.columns(household, "items")["month"]
+            if len(last) and code <= last[-1]:
+                raise ValueError(f"{household!r} is archived through {month_start(last[-1]):%Y-%m}; "
+                                 f"cannot append {month}")
+
+            items = {
+                "kind": ["grocery"] * len(groceries_df) + ["bill"] * len(bills_df),
+                "description": list(groceries_df["Item"]) + list(bills_df["Category"]),
+                "category": list(groceries_df["Category"]) + list(bills_df["Type"]),
+                "priority": list(groceries_df["Priority"]) + list(bills_df["Priority"]),
+                "original": np.concatenate([groceries_df.get("Original Price", groceries_df["Price"]).to_numpy(),
+                                            bills_df.get("Original Amount", bills_df["Amount"]).to_numpy()]),
+                "adjusted": np.concatenate([groceries_df["Price"].to_numpy(), bills_df["Amount"].to_numpy()]),
+            }
+            items["month"] = np.full(len(items["kind"]), code)
+            expenses = float(items["adjusted"].sum())
+            budgets = {
+                "month": np.full(len(budget_options), code),
+                "option": list(budget_options),
+                "income": np.full(len(budget_options), float(monthly_income)),
+                "expenses": np.full(len(budget_options), expenses),
+            }
+            for column in ("savings", "investments", "discretionary"):
+                budgets[column] = [float(option[column.capitalize()]) for option in budget_options.values()]
+
+            for table, values in (("items", items), ("budgets", budgets)):
+                self._append(household, meta, table, values)
+            self._write_meta(household, meta)
+
+    def _append(self, household, meta, table, values):
+        rows = meta["tables"][table]["rows"]
+        os.makedirs(self._path(household, table), exist_ok=True)
+        for column, dtype in TABLES[table].items():
+            data = values[column]
+            if column in DICTIONARY_COLUMNS:
+                data = self._encode(meta["dictionaries"][column], data)
+            data = np.asarray(data, dtype=dtype)
+            path = self._path(household, table, f"{column}.bin")
+            with open(path, "ab") as handle:
+                # Drop anything an interrupted append left past the committed rows
+                handle.truncate(rows * data.itemsize)
+                handle.write(data.tobytes())
+        meta["tables"][table]["rows"] = rows + len(values["month"])
+
+    @staticmethod
+    def _encode(dictionary, values):
+        codes = {value: code for code, value in enumerate(dictionary)}
+        encoded = []
+        for value in values:
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(dictionary)
+                dictionary.append(value)
+            encoded.append(code)
+        return encoded
+
+    def category_trends(self, household, start=None, end=None):
+        """Per-category spending per archived month in ``[start, end)``.
+
+        Returns a long frame of ``Month``, ``Category``, ``Original`` and
+        ``Adjusted`` totals with the adjusted total's month-over-month and
+        year-over-year ``% change``. The twelve months before ``start`` are
+        read for the year-over-year baseline.
+        """
+        baseline = None if start is None else month_start(month_code(start) - 12)
+        columns = self.columns(household, "items", baseline, end)
+        month = columns["month"]
+        if not len(month):
+            return pd.DataFrame(columns=["Month", "Category", "Original", "Adjusted", "MoM %", "YoY %"])
+
+        categories = self.dictionaries(household)["category"]
+        first = int(month[0])
+        n_months = int(month[-1]) - first + 1
+        cell = (month - first).astype(np.int64) * len(categories) + columns["category"]
+        shape = (n_months, len(categories))
+        original = np.bincount(cell, weights=columns["original"], minlength=shape[0] * shape[1]).reshape(shape)
+        adjusted = np.bincount(cell, weights=columns["adjusted"], minlength=shape[0] * shape[1]).reshape(shape)
+        present = np.bincount(cell, minlength=shape[0] * shape[1]).reshape(shape) > 0
+
+        mom = _percent_change(adjusted, 1)
+        yoy = _percent_change(adjusted, 12)
+        keep = present.copy()
+        if start is not None:
+            keep[:max(month_code(start) - first, 0)] = False
+        month_index, category_index = np.nonzero(keep)
+        return pd.DataFrame({
+            "Month": [month_start(first + m) for m in month_index],
+            "Category": np.asarray(categories, dtype=object)[category_index],
+            "Original": original[keep],
+            "Adjusted": adjusted[keep],
+            "MoM %": mom[keep],
+            "YoY %": yoy[keep],
+        })
+
+    def budget_history(self, household, start=None, end=None):
+        """The archived budget options per month in ``[start, end)``."""
+        columns = self.columns(household, "budgets", start, end)
+        options = np.asarray(self.dictionaries(household)["option"], dtype=object)
+        return pd.DataFrame({
+            "Month": [month_start(m) for m in columns["month"]],
+            "Option": options[columns["option"]] if len(options) else [],
+            "Income": columns["income"],
+            "Expenses": columns["expenses"],
+            "Savings": columns["savings"],
+            "Investments": columns["investments"],
+            "Discretionary": columns["discretionary"],
+        })
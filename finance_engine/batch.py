@@ -0,0 +1,347 @@
+"""Vectorized budget pipeline over many households at once.
+
+Inputs are columnar. ``households`` holds one row per household::
+
+    household, monthly_income, savings_goal, risk_appetite,
+    essential_cut, discretionary_cut
+
+and ``line_items`` is a long-format table keyed by household::
+
+    household, kind ("grocery" or "bill"), amount, priority, flexibility
+
+Either may be a DataFrame or a plain mapping of column name to array. String
+columns are accepted, but integer codes (or pandas categoricals) in the order
+of the vocabularies below avoid a costly string factorisation on large inputs.
+
+``run_batch`` reproduces ``apply_spending_cuts``, ``auto_adjust_spending`` and
+``generate_budget_options`` from ``finance_engine.stages`` exactly, in the same
+``int64`` minor units and with the same rounding (see ``finance_engine.money``).
+Each item is cut and rounded on its own, as the stage does; a single
+``np.bincount`` then sums every household's cut items per class (cut bucket x
+adjustment tier x grocery/bill), and the overspend tiers and budget options
+are solved on that small (households x classes) matrix. Only the tier
+reductions go back to the items: each household's reduction is shared out
+over its tier's items by largest remainder (``money.allocate_groups``), ties
+going to the item that comes first in ``line_items``, as they go to the
+earlier row of the household's frames in the stage. There is no Python loop
+over households or items.
+"""
+import numpy as np
+
+from finance_engine import money
+from finance_engine.overspend import MAX_ESSENTIAL_REDUCTION
+from finance_engine.taxonomy import FLEXIBILITIES, PRIORITIES
+
+KINDS = ("grocery", "bill")
+RISKS = ("Low", "Medium", "High")
+
+# Every (kind, priority, flexibility) combination falls into one class that
+# records which user cut applies, which auto-adjust tier it belongs to and
+# whether it is a bill: class = (cut * 3 + tier) * 2 + is_bill
+CUT_NONE, CUT_ESSENTIAL, CUT_DISCRETIONARY = 0, 1, 2
+TIER_NONE, TIER_DISCRETIONARY, TIER_FLEXIBLE_ESSENTIAL = 0, 1, 2
+N_CLASSES = 18
+CLASS_CUT = np.arange(N_CLASSES) // 6
+CLASS_TIER = np.arange(N_CLASSES) // 2 % 3
+CLASS_IS_BILL = np.arange(N_CLASSES) % 2 == 1
+_CAP_NUMERATOR, _CAP_DENOMINATOR = money.ratio(MAX_ESSENTIAL_REDUCTION)
+
+
+def _item_class(kind, priority, flexibility):
+    if priority in ("Essential", "Critical"):
+        cut = CUT_ESSENTIAL
+    elif priority in (("Nice-to-have", "Discretionary") if kind == "grocery" else ("Discretionary", "Investment")):
+        cut = CUT_DISCRETIONARY
+    else:
+        cut = CUT_NONE
+
+    if priority in (("Discretionary", "Nice-to-have") if kind == "grocery" else ("Discretionary",)):
+        tier = TIER_DISCRETIONARY
+    elif priority == "Essential" and flexibility in ("Medium", "High"):
+        tier = TIER_FLEXIBLE_ESSENTIAL
+    else:
+        tier = TIER_NONE
+    return (cut * 3 + tier) * 2 + (kind == "bill")
+
+
+# Class lookup indexed by (kind * 5 + priority) * 4 + flexibility
+_CLASS_LOOKUP = np.array([
+    _item_class(kind, priority, flexibility)
+    for kind in KINDS for priority in PRIORITIES for flexibility in FLEXIBILITIES
+], dtype=np.intp)
+
+# Budget option splits in percent, indexed by risk code: (savings, investments,
+# discretionary), as in stages.BUDGET_SPLITS
+OPTION_SHARES = {
+    "Option 1": np.array([[70, 20, 10], [50, 40, 10], [30, 60, 10]]),
+    "Option 2": np.array([[60, 30, 10], [40, 50, 10], [20, 70, 10]]),
+}
+
+
+def risk_code(risk):
+    """Return the code of ``risk`` in ``RISKS``; unknown risks get High, as in ``generate_budget_options``."""
+    return RISKS.index(risk) if risk in RISKS else RISKS.index("High")
+
+
+def risk_codes(values):
+    """``risk_code`` for every entry of ``values``, looked up once per distinct value.
+
+    Integer codes are taken as they are (and range-checked by ``encode``).
+    """
+    cat = getattr(values, "cat", None)
+    if cat is not None:
+        # Missing values (code -1) take the last entry, the High fallback
+        lookup = np.array([risk_code(c) for c in cat.categories] + [risk_code(None)], dtype=np.int8)
+        return lookup[np.asarray(cat.codes)]
+    values = np.asarray(values)
+    if values.dtype.kind in "iu":
+        return encode(values, RISKS)
+    try:
+        uniques, inverse = np.unique(values, return_inverse=True)
+    except TypeError:
+        # None among strings does not sort
+        return np.fromiter((risk_code(value) for value in values.ravel()), dtype=np.int8, count=values.size)
+    return np.array([risk_code(u) for u in uniques], dtype=np.int8)[inverse.ravel()]
+
+
+def encode(values, vocabulary):
+    """Return ``values`` as int8 codes into ``vocabulary``.
+
+    Missing values, values outside the vocabulary and integer codes out of
+    its range raise ``ValueError``.
+    """
+    cat = getattr(values, "cat", None)
+    if cat is not None:
+        codes = np.asarray(cat.codes)
+        if len(codes) and codes.min() < 0:
+            raise ValueError(f"Missing values cannot be encoded; expected one of {vocabulary!r}")
+        lookup = np.array([vocabulary.index(c) if c in vocabulary else -1 for c in cat.categories], dtype=np.int8)
+        encoded = lookup[codes]
+        if len(encoded) and encoded.min() < 0:
+            unknown = sorted({cat.categories[code] for code in codes[encoded < 0].tolist()})
+            raise ValueError(f"Unknown values {unknown!r}; expected one of {vocabulary!r}")
+        return encoded
+
+    values = np.asarray(values)
+    if values.dtype.kind in "iu":
+        if len(values) and (values.min() < 0 or values.max() >= len(vocabulary)):
+            raise ValueError(f"Codes must be in 0..{len(vocabulary) - 1} for {vocabulary!r}; "
+                             f"got {values.min()}..{values.max()}")
+        return values.astype(np.int8, copy=False)
+
+    try:
+        uniques, inverse = np.unique(values, return_inverse=True)
+    except TypeError:
+        # None among strings does not sort
+        raise ValueError(f"Missing values cannot be encoded; expected one of {vocabulary!r}") from None
+    unknown = [u for u in uniques if u not in vocabulary]
+    if unknown:
+        raise ValueError(f"Unknown values {unknown!r}; expected one of {vocabulary!r}")
+    lookup = np.array([vocabulary.index(u) for u in uniques], dtype=np.int8)
+    return lookup[inverse.ravel()]
+
+
+def household_index(household_ids, item_households):
+    """Map each line item's household id to its row in the households table."""
+    household_ids = np.asarray(household_ids)
+    item_households = np.asarray(item_households)
+    n = len(household_ids)
+
+    # Fast path: households are numbered 0..n-1 in row order
+    if household_ids.dtype.kind in "iu" and n and household_ids[0] == 0 and household_ids[-1] == n - 1 \
+            and np.array_equal(household_ids, np.arange(n)):
+        if len(item_households) and (item_households.min() < 0 or item_households.max() >= n):
+            raise KeyError("Line items reference unknown households")
+        return item_households.astype(np.intp, copy=False)
+
+    order = np.argsort(household_ids, kind="stable")
+    sorted_ids = household_ids[order]
+    pos = np.searchsorted(sorted_ids, item_households)
+    pos = np.minimum(pos, n - 1)
+    if not np.array_equal(sorted_ids[pos], item_households):
+        raise KeyError("Line items reference unknown households")
+    return order[pos]
+
+
+def item_classes(line_items):
+    """Return each line item's class index (see ``N_CLASSES``)."""
+    kind = encode(line_items["kind"], KINDS)
+    priority = encode(line_items["priority"], PRIORITIES)
+    flexibility = encode(line_items["flexibility"], FLEXIBILITIES)
+    return _CLASS_LOOKUP[(kind.astype(np.intp) * len(PRIORITIES) + priority) * len(FLEXIBILITIES) + flexibility]
+
+
+def line_items_from_frames(groceries_df, bills_df, household=0):
+    """Convert the dashboard's grocery and bill frames into long format."""
+    n_groceries, n_bills = len(groceries_df), len(bills_df)
+    return {
+        "household": np.full(n_groceries + n_bills, household),
+        "kind": np.repeat(["grocery", "bill"], [n_groceries, n_bills]),
+        "description": np.concatenate([np.asarray(groceries_df["Item"], dtype=object), np.asarray(bills_df["Category"], dtype=object)]),
+        "amount": np.concatenate([np.asarray(groceries_df["Price"], dtype=np.float64), np.asarray(bills_df["Amount"], dtype=np.float64)]),
+        "priority": np.concatenate([np.asarray(groceries_df["Priority"], dtype=object), np.asarray(bills_df["Priority"], dtype=object)]),
+        "flexibility": np.concatenate([np.asarray(groceries_df["Flexibility"], dtype=object), np.asarray(bills_df["Flexibility"], dtype=object)]),
+        "category": np.concatenate([np.asarray(groceries_df["Category"], dtype=object), np.asarray(bills_df["Type"], dtype=object)]),
+    }
+
+
+def budget_option_arrays(income, fixed_expenses, savings_goal, risk_codes):
+    """Vectorized ``generate_budget_options`` for arrays of households.
+
+    Inputs are ``int64`` minor units; the options are in currency units.
+    """
+    remaining = income - fixed_expenses
+    feasible = remaining > 0
+    surplus = np.where(feasible, remaining, 0)
+    options = {}
+    for name, shares in OPTION_SHARES.items():
+        savings, investments, discretionary = money.allocate_rows(surplus, shares[risk_codes]).T
+        options[name] = {
+            "Savings": money.to_units(np.where(feasible, np.minimum(savings_goal, savings), 0)),
+            "Investments": money.to_units(investments),
+            "Discretionary": money.to_units(discretionary),
+            "Feasible": feasible,
+        }
+    return options
+
+
+def cut_amounts(amounts, households, classes, essential_cut, discretionary_cut):
+    """Per-item ``apply_spending_cuts`` in minor units.
+
+    ``amounts`` are minor units, ``households`` each item's row in the
+    households table and ``classes`` item classes; the cuts are percentages,
+    one per household.
+    """
+    no_cut = np.zeros(len(essential_cut))
+    numerators, denominators = money.percent_ratios(-np.column_stack([no_cut, essential_cut, discretionary_cut]))
+    cut = CLASS_CUT[classes]
+    return money.scale(amounts, numerators[households, cut], denominators[households, cut])
+
+
+def solve_class_totals(class_totals, income, savings_goal, risk):
+    """Run auto-adjustment and budget options on per-class totals.
+
+    ``class_totals`` is the (households x classes) matrix of summed amounts
+    after the user cuts, in ``int64`` minor units, as are ``income`` and
+    ``savings_goal``; ``risk`` holds codes into ``RISKS``. Returns
+    ``(household_columns, discretionary_cut, flexible_cut)``: the columns in
+    currency units, and the minor units each household's discretionary and
+    flexible essential tiers give up, to share out over their items.
+    """
+    class_totals = np.asarray(class_totals, dtype=np.int64)
+    total_cut = class_totals.sum(axis=1)
+    total_bills_cut = class_totals[:, CLASS_IS_BILL].sum(axis=1)
+    total_discretionary = class_totals[:, CLASS_TIER == TIER_DISCRETIONARY].sum(axis=1)
+    total_flexible = class_totals[:, CLASS_TIER == TIER_FLEXIBLE_ESSENTIAL].sum(axis=1)
+
+    # auto_adjust_spending (solve_overspend), per household
+    overspend = total_cut - income
+    overspending = overspend > 0
+    # The discretionary tier only applies when it can absorb the whole overspend
+    discretionary_cut = np.where(overspending & (overspend < total_discretionary), overspend, 0)
+    remaining = np.where(discretionary_cut > 0, 0, np.maximum(overspend, 0))
+    # Never more than the cap, rounded down to whole minor units
+    flexible_cut = np.minimum(remaining, total_flexible * _CAP_NUMERATOR // _CAP_DENOMINATOR)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discretionary_reduction = np.where(discretionary_cut > 0, discretionary_cut / total_discretionary, 0.0)
+        flexible_reduction = np.where((remaining > 0) & (total_flexible > 0),
+                                      np.minimum(MAX_ESSENTIAL_REDUCTION, remaining / total_flexible), 0.0)
+    total_fixed_expenses = total_cut - discretionary_cut - flexible_cut
+
+    # generate_budget_options
+    options = budget_option_arrays(income, total_fixed_expenses, savings_goal, risk)
+
+    household_columns = {
+        "total_groceries_before_adjustment": money.to_units(total_cut - total_bills_cut),
+        "total_bills_before_adjustment": money.to_units(total_bills_cut),
+        "overspend": money.to_units(overspend),
+        "adjusted": overspending,
+        "discretionary_reduction": discretionary_reduction,
+        "flexible_essential_reduction": flexible_reduction,
+        "residual_overspend": money.to_units(remaining - flexible_cut),
+        "total_fixed_expenses": money.to_units(total_fixed_expenses),
+        "disposable_income": money.to_units(income - total_fixed_expenses),
+    }
+    for name, option in options.items():
+        prefix = name.lower().replace(" ", "")
+        for field, values in option.items():
+            household_columns[f"{prefix}_{field.lower()}"] = values
+
+    return household_columns, discretionary_cut, flexible_cut
+
+
+def adjust_amounts(amounts, households, classes, discretionary_cut, flexible_cut):
+    """Take each household's tier cuts off its items, by largest remainder.
+
+    ``amounts`` are the items' minor units after the user cuts and
+    ``households`` their row in the households table; ``discretionary_cut``
+    and ``flexible_cut`` come from ``solve_class_totals``.
+    """
+    tier = CLASS_TIER[classes]
+    adjusted = amounts.copy()
+    for tier_code, removed in ((TIER_DISCRETIONARY, discretionary_cut), (TIER_FLEXIBLE_ESSENTIAL, flexible_cut)):
+        items = np.flatnonzero((tier == tier_code) & (removed[households] > 0))
+        if len(items):
+            adjusted[items] -= money.allocate_groups(removed, households[items], amounts[items])
+    return adjusted
+
+
+def run_batch(households, line_items):
+    """Run cuts, auto-adjustment and budget options for every household.
+
+    Returns ``{"households": {...}, "items": {...}}`` where each value is a
+    mapping of column name to array, aligned with the input rows. Amounts
+    are in currency units, rounded to whole minor units as in the stages.
+    """
+    household_ids = np.asarray(households["household"])
+    n = len(household_ids)
+    income = money.to_minor(np.asarray(households["monthly_income"], dtype=np.float64))
+    savings_goal = money.to_minor(np.asarray(households["savings_goal"], dtype=np.float64))
+    # Unknown risk appetites get the High split, as in generate_budget_options
+    risk = risk_codes(households["risk_appetite"])
+    essential_cut = np.asarray(households["essential_cut"], dtype=np.float64)
+    discretionary_cut = np.asarray(households["discretionary_cut"], dtype=np.float64)
+
+    idx = household_index(household_ids, line_items["household"])
+    amount = money.to_minor(np.asarray(line_items["amount"], dtype=np.float64))
+    classes = item_classes(line_items)
+    cut_amount = cut_amounts(amount, idx, classes, essential_cut, discretionary_cut)
+
+    # Sum every household's cut items per class once; everything per
+    # household below works on this (households x classes) matrix. Sums of
+    # integer-valued float64 weights are exact up to 2**53.
+    key = idx * N_CLASSES + classes
+    class_totals = np.bincount(key, weights=cut_amount, minlength=n * N_CLASSES).reshape(n, N_CLASSES)
+
+    household_columns, tier_discretionary, tier_flexible = solve_class_totals(
+        class_totals.astype(np.int64), income, savings_goal, risk)
+    adjusted_amount = adjust_amounts(cut_amount, idx, classes, tier_discretionary, tier_flexible)
+
+    is_bill = CLASS_IS_BILL[classes]
+    total_bills = np.bincount(idx[is_bill], weights=adjusted_amount[is_bill], minlength=n)
+    household_columns["total_groceries"] = money.to_units(
+        money.to_minor(household_columns["total_fixed_expenses"]) - total_bills.astype(np.int64))
+    household_columns["total_bills"] = money.to_units(total_bills.astype(np.int64))
+    household_columns = dict(household=household_ids, **household_columns)
+
+    return {
+        "households": household_columns,
+        "items": {
+            "household": np.asarray(line_items["household"]),
+            "original_amount": money.to_units(amount),
+            "cut_amount": money.to_units(cut_amount),
+            "adjusted_amount": money.to_units(adjusted_amount),
+        },
+    }
+
+
+def adjustment_plan(household_columns, i):
+    """Return household ``i``'s plan in the form ``solve_overspend`` returns."""
+    if not household_columns["adjusted"][i]:
+        return None
+    return {
+        "overspend": household_columns["overspend"][i],
+        "discretionary_reduction": household_columns["discretionary_reduction"][i],
+        "flexible_essential_reduction": household_columns["flexible_essential_reduction"][i],
+        "residual_overspend": household_columns["residual_overspend"][i],
+    }
@@ -0,0 +1,117 @@
+"""Static line-item catalog for the family budget.
+
+The grocery and bill lists only change when the source does, so the frames
+are built once per process. The single income-dependent row (Tithe) is filled
+in by ``load_data`` on a cheap copy of the bills frame.
+
+The item tables and schedules are plain data; pandas is only imported when
+the frames are first built, so ``cashflow`` and the importer can read the
+catalog without it.
+"""
+from functools import lru_cache
+
+# Constants
+MONTHS_IN_TERM = 3
+TITHE_RATE = 0.1
+
+# Groceries with enhanced categories
+GROCERIES = (
+    {"Item": "Rice", "Quantity": "3 kgs", "Price": 13500, "Priority": "Essential", "Category": "Food Staples", "Flexibility": "Low"},
+    {"Item": "Tooth paste", "Quantity": "1 piece", "Price": 6000, "Priority": "Essential", "Category": "Personal Care", "Flexibility": "Medium"},
+    {"Item": "Shoe polish", "Quantity": "1", "Price": 3500, "Priority": "Discretionary", "Category": "Personal Care", "Flexibility": "High"},
+    {"Item": "Gizzards", "Quantity": "1 pack", "Price": 15000, "Priority": "Nice-to-have", "Category": "Protein", "Flexibility": "High"},
+    {"Item": "Viennas", "Quantity": "1 pack", "Price": 12000, "Priority": "Nice-to-have", "Category": "Protein", "Flexibility": "High"},
+    {"Item": "Milk", "Quantity": "1 box", "Price": 24000, "Priority": "Essential", "Category": "Dairy", "Flexibility": "Medium"},
+    {"Item": "Irish potatoes", "Quantity": "1 month supply", "Price": 30000, "Priority": "Essential", "Category": "Food Staples", "Flexibility": "Low"},
+    {"Item": "Baby oil", "Quantity": "1", "Price": 15000, "Priority": "Essential", "Category": "Personal Care", "Flexibility": "Medium"},
+    {"Item": "Sugar", "Quantity": "2 kgs", "Price": 8000, "Priority": "Essential", "Category": "Food Staples", "Flexibility": "Medium"},
+    {"Item": "Beef", "Quantity": "1 kg", "Price": 15000, "Priority": "Nice-to-have", "Category": "Protein", "Flexibility": "High"},
+    {"Item": "Chicken", "Quantity": "1 kg", "Price": 15000, "Priority": "Nice-to-have", "Category": "Protein", "Flexibility": "High"},
+    {"Item": "Squishy drink", "Quantity": "10", "Price": 20000, "Priority": "Discretionary", "Category": "Beverages", "Flexibility": "High"},
+    {"Item": "Soap", "Quantity": "1 bar", "Price": 6000, "Priority": "Essential", "Category": "Personal Care", "Flexibility": "Low"},
+    {"Item": "Eggs", "Quantity": "1 tray", "Price": 12500, "Priority": "Essential", "Category": "Protein", "Flexibility": "Medium"},
+    {"Item": "Bread", "Quantity": "1 big", "Price": 6000, "Priority": "Essential", "Category": "Food Staples", "Flexibility": "Medium"},
+    {"Item": "Spaghetti", "Quantity": "10 packs", "Price": 20000, "Priority": "Essential", "Category": "Food Staples", "Flexibility": "Medium"},
+    {"Item": "Onions", "Quantity": "1 kg", "Price": 6000, "Priority": "Essential", "Category": "Vegetables", "Flexibility": "Medium"},
+    {"Item": "Green pepper", "Quantity": "", "Price": 2000, "Priority": "Nice-to-have", "Category": "Vegetables", "Flexibility": "High"},
+    {"Item": "Drinks", "Quantity": "", "Price": 20000, "Priority": "Discretionary", "Category": "Beverages", "Flexibility": "High"},
+    {"Item": "Carrots", "Quantity": "", "Price": 3000, "Priority": "Nice-to-have", "Category": "Vegetables", "Flexibility": "High"},
+    {"Item": "Ginger", "Quantity": "0.5 kg", "Price": 3000, "Priority": "Nice-to-have", "Category": "Vegetables", "Flexibility": "High"},
+    {"Item": "Tomatoes", "Quantity": "", "Price": 6000, "Priority": "Essential", "Category": "Vegetables", "Flexibility": "Medium"},
+    {"Item": "Medicine (Azithromycin)", "Quantity": "", "Price": 7000, "Priority": "Essential", "Category": "Healthcare", "Flexibility": "Low"},
+)
+
+# Bills and fixed expenses with enhanced categories (Tithe is set per income)
+BILLS = (
+    {"Category": "Rent", "Amount": 500000, "Priority": "Critical", "Flexibility": "None", "Type": "Housing"},
+    {"Category": "Water", "Amount": 24000, "Priority": "Critical", "Flexibility": "Low", "Type": "Utilities"},
+    {"Category": "Electricity", "Amount": 40000, "Priority": "Critical", "Flexibility": "Medium", "Type": "Utilities"},
+    {"Category": "Garbage", "Amount": 10000, "Priority": "Critical", "Flexibility": "Low", "Type": "Utilities"},
+    {"Category": "Laundry", "Amount": 12000*4, "Priority": "Essential", "Flexibility": "High", "Type": "Personal Care"},
+    {"Category": "Fuel", "Amount": 50000*4, "Priority": "Essential", "Flexibility": "Medium", "Type": "Transport"},
+    {"Category": "Tithe", "Amount": 0, "Priority": "Essential", "Flexibility": "Medium", "Type": "Donations"},
+    {"Category": "Family dates", "Amount": 150000, "Priority": "Discretionary", "Flexibility": "High", "Type": "Entertainment"},
+    {"Category": "Skin care", "Amount": 200000/3, "Priority": "Discretionary", "Flexibility": "High", "Type": "Personal Care"},
+    {"Category": "Pig farming", "Amount": 250000, "Priority": "Investment", "Flexibility": "High", "Type": "Investments"},
+    {"Category": "Health fund", "Amount": 100000, "Priority": "Essential", "Flexibility": "Medium", "Type": "Healthcare"},
+    {"Category": "School fees (Eliana)", "Amount": 700000/MONTHS_IN_TERM, "Priority": "Critical", "Flexibility": "None", "Type": "Education"},
+    {"Category": "Gifts", "Amount": 50000, "Priority": "Discretionary", "Flexibility": "High", "Type": "Gifts"},
+)
+
+# Items bought weekly, stored at their per-purchase price
+WEEKLY_ITEMS = ("Bread",)
+
+# Items bought only when needed; the budget still carries them every month
+AS_NEEDED_ITEMS = ("Medicine (Azithromycin)",)
+
+# School terms start in these months (fees are due at each term start)
+TERM_START_MONTHS = (2, 5, 9)
+
+# Calendar schedules for items not paid once a month, keyed by description,
+# with the amount paid per occurrence. Everything else is paid monthly at the
+# amount in the frames. Used by ``finance_engine.cashflow``.
+SCHEDULES = {
+    "Bread": {"Frequency": "Weekly", "Amount": 6000},
+    "Laundry": {"Frequency": "Weekly", "Amount": 12000},
+    "Fuel": {"Frequency": "Weekly", "Amount": 50000},
+    "Skin care": {"Frequency": "Quarterly", "Amount": 200000},
+    "School fees (Eliana)": {"Frequency": "Termly", "Amount": 700000, "Months": TERM_START_MONTHS},
+    "Pig farming": {"Frequency": "One-time", "Amount": 250000},
+    "Medicine (Azithromycin)": {"Frequency": "As needed", "Amount": 7000, "Every": 3},
+}
+
+
+@lru_cache(maxsize=1)
+def _static_frames():
+    import pandas as pd
+
+    from finance_engine import money
+    from finance_engine.schema import categorize_bills, categorize_groceries
+
+    groceries_df = categorize_groceries(pd.DataFrame(list(GROCERIES)))
+    bills_df = categorize_bills(pd.DataFrame(list(BILLS)))
+
+    # Float columns, but whole minor units (Skin care is 200000/3 a month)
+    groceries_df["Price"] = money.quantize(groceries_df["Price"])
+    bills_df["Amount"] = money.quantize(bills_df["Amount"])
+
+    # Adjust weekly items to monthly
+    weekly = groceries_df["Item"].isin(WEEKLY_ITEMS)
+    groceries_df.loc[weekly, "Price"] *= 4
+
+    return groceries_df, bills_df
+
+
+def frequencies(descriptions):
+    """Return each item's payment frequency (``Monthly`` unless scheduled)."""
+    return [SCHEDULES.get(description, {}).get("Frequency", "Monthly") for description in descriptions]
+
+
+def load_data(monthly_income):
+    """Return fresh ``(groceries_df, bills_df)`` frames for ``monthly_income``."""
+    from finance_engine.money import multiply
+
+    groceries_df, bills_df = _static_frames()
+    bills_df = bills_df.copy()
+    bills_df.loc[bills_df["Category"] == "Tithe", "Amount"] = multiply(monthly_income, TITHE_RATE)
+    return groceries_df.copy(), bills_df
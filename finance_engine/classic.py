@@ -0,0 +1,112 @@
+"""Budget options and recommendations as the classic dashboard computed them.
+
+``family_money.py`` runs on the engine's catalog and totals, but its
+options and recommendations mean something different from
+``stages.generate_budget_options`` and ``rules``. Its options put a multiple
+of the savings goal first, up to whatever is left after fixed expenses, and
+split only the rest between investments and discretionary spending. The
+engine splits the whole surplus by fixed percentages instead. The
+recommendations are its five original checks.
+
+Amounts are worked in minor units with ``finance_engine.money``, so the
+shares after the savings add up to the rest exactly. Priorities are the
+classic per-item ones (``taxonomy.legacy_priorities``), and frequencies are
+``classic_frequencies``.
+"""
+import pandas as pd
+
+from finance_engine import money
+from finance_engine.catalog import frequencies
+from finance_engine.taxonomy import legacy_priorities
+
+# Per risk: (description, savings as a percentage of the goal, investments
+# share of the rest in percent); discretionary takes the remainder
+CLASSIC_SPLITS = {
+    "Low": (
+        ("Conservative: Prioritizes savings goal, limits discretionary spending", 100, 30),
+        ("Moderate Conservative: Slightly higher savings, balanced spending", 120, 20),
+    ),
+    "Medium": (
+        ("Balanced: Moderate savings with equal investments and discretionary", 80, 50),
+        ("Growth Focus: Higher investments with reasonable savings", 90, 60),
+    ),
+    "High": (
+        ("Aggressive Growth: Maximizes investments, minimal discretionary", 50, 80),
+        ("Balanced Aggressive: Strong investments with some savings buffer", 70, 70),
+    ),
+}
+
+# Frequencies whose amounts the catalog already holds as a monthly equivalent
+MONTHLY_EQUIVALENT = ("Weekly", "Quarterly", "Termly")
+
+# Share of income suggested as a first savings goal when the goal is out of reach
+STARTER_GOAL_RATE = 0.1
+
+
+def classic_frequencies(descriptions):
+    """Return each item's frequency as the classic dashboard labelled it.
+
+    Weekly, quarterly and termly items are stored as a monthly equivalent
+    (Bread and Laundry x4, Skin care / 3, School fees per month of term), so
+    they are labelled Monthly like everything else paid from the monthly
+    budget; only As needed and One-time items keep their own label.
+    """
+    return ["Monthly" if frequency in MONTHLY_EQUIVALENT else frequency for frequency in frequencies(descriptions)]
+
+
+def generate_budget_options(income, fixed_expenses, savings_goal, risk):
+    """Return the classic ``{"Option 1": ..., "Option 2": ...}`` for ``risk``.
+
+    Each option saves ``min(goal * factor, remaining)`` and splits what is
+    left above the scaled goal between investments and discretionary. When
+    fixed expenses exceed income, savings is that (negative) remainder, as
+    it always was. Unknown risks get the High options.
+    """
+    remaining = money.to_minor(float(income)) - money.to_minor(float(fixed_expenses))
+    goal = money.to_minor(float(savings_goal))
+
+    options = {}
+    for number, (description, goal_percent, investments) in enumerate(
+            CLASSIC_SPLITS.get(risk, CLASSIC_SPLITS["High"]), 1):
+        target = int(money.scale(goal, goal_percent, 100))
+        invested, discretionary = money.allocate(max(0, remaining - target), [investments, 100 - investments])
+        options[f"Option {number}"] = {
+            "Savings": money.to_units(min(target, remaining)),
+            "Investments": money.to_units(int(invested)),
+            "Discretionary": money.to_units(int(discretionary)),
+            "Description": description,
+        }
+    return options
+
+
+def generate_recommendations(groceries, bills, budget_options, monthly_income, savings_goal):
+    """Return the classic ``(level, message)`` recommendations, in order."""
+    recommendations = []
+    total_expenses = groceries["Price"].sum() + bills["Amount"].sum()
+    if total_expenses > monthly_income:
+        recommendations.append(("Critical", "Your fixed expenses exceed your income! "
+                                            "You need to reduce expenses or increase income."))
+
+    grocery_priority = pd.Series(legacy_priorities(groceries["Priority"], groceries["Item"]), index=groceries.index)
+    low_priority_groceries = groceries[grocery_priority.isin(["Low", "Medium"])].sort_values("Price", ascending=False)
+    if not low_priority_groceries.empty:
+        items = ", ".join(low_priority_groceries.head(3)["Item"].tolist())
+        recommendations.append(("High", f"Consider reducing low/medium priority groceries like: {items}"))
+
+    bill_priority = pd.Series(legacy_priorities(bills["Priority"], bills["Category"]), index=bills.index)
+    medium_priority_bills = bills[bill_priority == "Medium"].sort_values("Amount", ascending=False)
+    if not medium_priority_bills.empty:
+        items = ", ".join(medium_priority_bills.head(3)["Category"].tolist())
+        recommendations.append(("Medium", f"Potential to reduce medium priority bills: {items}"))
+
+    if budget_options["Option 1"]["Savings"] < savings_goal * 0.8:
+        starter = money.multiply(monthly_income, STARTER_GOAL_RATE)
+        recommendations.append(("High", f"Your savings goal may be too ambitious. Consider adjusting from "
+                                        f"{savings_goal:,} UGX to {starter:,.0f} UGX as a starting point."))
+
+    one_time = [category for category, frequency in zip(bills["Category"], classic_frequencies(bills["Category"]))
+                if frequency == "One-time"]
+    if one_time:
+        recommendations.append(("Medium", f"Plan for one-time expenses: {', '.join(one_time)}"))
+
+    return recommendations
@@ -0,0 +1,165 @@
+"""Headless command-line entry point for the budget engine.
+
+Reads one household (a JSON/YAML object) or many (a list, or JSON lines with
+``--jsonl``) and prints totals, budget options, the adjustment plan and
+recommendations as JSON::
+
+    python -m finance_engine.cli household.json
+    echo '{"monthly_income": 1400000}' | python -m finance_engine.cli -
+    python -m finance_engine.cli households.jsonl --jsonl > results.jsonl
+
+Input fields (all optional except ``monthly_income``)::
+
+    monthly_income, savings_goal (0), risk_appetite ("Medium"),
+    essential_cut (0), discretionary_cut (0),
+    groceries: [{Item, Price, Priority, Category, Flexibility}, ...],
+    bills: [{Category, Amount, Priority, Flexibility, Type}, ...]
+
+Without ``groceries``/``bills`` the built-in catalog is used. Input that is
+not valid JSON/YAML, or a household without a numeric ``monthly_income``,
+is reported with the usage message and exit status 2 before anything is
+computed. Only the
+engine modules are imported on this path, never Streamlit or Plotly, and
+the engine itself is imported after argument parsing so ``--help`` and
+input errors return immediately.
+"""
+import argparse
+import json
+import sys
+
+DEFAULTS = {"savings_goal": 0, "risk_appetite": "Medium", "essential_cut": 0, "discretionary_cut": 0}
+REQUIRED = ("monthly_income",)
+NUMERIC = ("monthly_income", "savings_goal", "essential_cut", "discretionary_cut")
+
+
+def _load_input(text, fmt):
+    if fmt == "yaml":
+        try:
+            import yaml
+        except ImportError:
+            raise SystemExit("YAML input needs PyYAML (pip install pyyaml); use JSON instead")
+        try:
+            return yaml.safe_load(text)
+        except yaml.YAMLError as error:
+            raise ValueError(str(error)) from error
+    if fmt == "jsonl":
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    return json.loads(text)
+
+
+def _detect_format(path, fmt):
+    if fmt:
+        return fmt
+    if path.endswith((".yaml", ".yml")):
+        return "yaml"
+    if path.endswith(".jsonl"):
+        return "jsonl"
+    return "json"
+
+
+def validate(household):
+    """Return what is wrong with one household's input; empty if it can be evaluated."""
+    if not isinstance(household, dict):
+        return [f"expected an object, got {type(household).__name__}"]
+    problems = [f"missing required field {name!r}" for name in REQUIRED if name not in household]
+    for name in NUMERIC:
+        value = household.get(name)
+        if name in household and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            problems.append(f"{name!r} must be a number, got {value!r}")
+    for name in ("groceries", "bills"):
+        if name in household and not isinstance(household[name], list):
+            problems.append(f"{name!r} must be a list of objects")
+    return problems
+
+
+def _plain(value):
+    """``json.dumps`` fallback for NumPy scalars."""
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serialisable")
+
+
+def evaluate(household, include_items=False):
+    """Run the budget pipeline for one household dict and return plain data."""
+    import pandas as pd
+
+    from finance_engine import stages
+    from finance_engine.catalog import load_data
+    from finance_engine.overspend import describe_adjustment_plan
+    from finance_engine.schema import categorize_bills, categorize_groceries
+
+    params = dict(DEFAULTS, **household)
+    monthly_income = params["monthly_income"]
+    if "groceries" in params or "bills" in params:
+        catalog_groceries, catalog_bills = load_data(monthly_income)
+        groceries_df = categorize_groceries(pd.DataFrame(params["groceries"])) if "groceries" in params else catalog_groceries
+        bills_df = categorize_bills(pd.DataFrame(params["bills"])) if "bills" in params else catalog_bills
+        groceries_df["Price"] = groceries_df["Price"].astype("float64")
+        bills_df["Amount"] = bills_df["Amount"].astype("float64")
+    else:
+        groceries_df, bills_df = load_data(monthly_income)
+
+    groceries_df, bills_df = stages.apply_spending_cuts(
+        groceries_df, bills_df, params["essential_cut"], params["discretionary_cut"])
+    groceries_df, bills_df, plan = stages.auto_adjust_spending(groceries_df, bills_df, monthly_income)
+    totals = stages.compute_totals(groceries_df, bills_df, monthly_income)
+    options = stages.generate_budget_options(
+        monthly_income, totals["total_fixed_expenses"], params["savings_goal"], params["risk_appetite"])
+    recommendations = stages.generate_recommendations(
+        groceries_df, bills_df, options, monthly_income, params["savings_goal"])
+
+    result = {
+        "totals": totals,
+        "adjustment_plan": plan,
+        "adjustment_messages": describe_adjustment_plan(plan),
+        "budget_options": options,
+        "recommendations": [{"priority": priority, "text": text} for priority, text in recommendations],
+    }
+    if "household" in household:
+        result = dict(household=household["household"], **result)
+    if include_items:
+        result["groceries"] = groceries_df.to_dict(orient="records")
+        result["bills"] = bills_df.to_dict(orient="records")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute a household budget without the dashboard.")
+    parser.add_argument("input", help="JSON/YAML file, or - for stdin")
+    parser.add_argument("--format", choices=("json", "yaml", "jsonl"), help="input format (default: from extension)")
+    parser.add_argument("--jsonl", action="store_true", help="read and write one household per line")
+    parser.add_argument("--items", action="store_true", help="include the adjusted line items")
+    parser.add_argument("--indent", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        text = sys.stdin.read() if args.input == "-" else open(args.input, encoding="utf-8").read()
+    except OSError as error:
+        parser.error(f"cannot read {args.input}: {error.strerror}")
+    fmt = "jsonl" if args.jsonl else _detect_format(args.input, args.format)
+    try:
+        data = _load_input(text, fmt)
+    except ValueError as error:
+        parser.error(f"{args.input} is not valid {fmt.upper()}: {error}")
+
+    households = data if isinstance(data, list) else [data]
+    problems = [f"household {number}: {problem}" if isinstance(data, list) else problem
+                for number, household in enumerate(households, 1) for problem in validate(household)]
+    if problems:
+        parser.error("; ".join(problems))
+
+    if isinstance(data, list):
+        results = (evaluate(household, args.items) for household in data)
+        if fmt == "jsonl":
+            for result in results:
+                sys.stdout.write(json.dumps(result, default=_plain) + "\n")
+            return 0
+        json.dump(list(results), sys.stdout, default=_plain, indent=args.indent)
+    else:
+        json.dump(evaluate(data, args.items), sys.stdout, default=_plain, indent=args.indent)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Cached Plotly figures for the dashboard charts.
+
+Figures are built from the small aggregated frames the pipeline produces
+(category and priority spending, top expenses, budget allocations) and
+cached as plain figure dicts under a hash of that data, in a bounded LRU. A
+rerun whose aggregates did not change gets the very same dict back, skipping
+figure construction; together with the fixed element keys in
+``CHART_KEYS`` the frontend keeps the mounted chart instead of rebuilding it.
+
+Cached dicts are shared across sessions and must be treated as read-only;
+``st.plotly_chart`` accepts them directly. Plotly is only imported when a
+figure is actually built.
+"""
+import hashlib
+
+import pandas as pd
+
+from finance_engine.memo import StageCache, stage_key
+
+figure_cache = StageCache(maxsize=64)
+
+# Stable Streamlit element keys, one per chart
+CHART_KEYS = {
+    "category_pie": "pie_chart",
+    "priority_bar": "bar_chart",
+    "top_expenses": "top_expenses",
+    "budget_pie1": "budget_pie1",
+    "budget_pie2": "budget_pie2",
+}
+
+
+def frame_digest(frame):
+    """Hash a DataFrame's column names and values (not its index)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(frame.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def cached_figure(name, data, build, cache=None):
+    """Return ``build(data)`` as a figure dict, cached on a hash of ``data``."""
+    cache = figure_cache if cache is None else cache
+    fingerprint = frame_digest(data) if isinstance(data, pd.DataFrame) else data
+    return cache.get_or_compute(stage_key(name, fingerprint), lambda: build(data).to_dict())
+
+
+def _category_pie(category_spending):
+    import plotly.express as px
+
+    return px.pie(category_spending, values="Price", names="Type", title="Spending by Category")
+
+
+def _priority_bar(priority_spending):
+    import plotly.express as px
+
+    fig = px.bar(priority_spending, x="Priority", y="Price", color="Priority", text="Price",
+                 title="Total Spending by Priority Level")
+    fig.update_traces(texttemplate='%{text:,.0f}', textposition='outside')
+    return fig
+
+
+def _top_expenses(top_expenses):
+    import plotly.express as px
+
+    return px.bar(top_expenses, x="Description", y="Price", color="Priority", title="Top 10 Expenses by Amount")
+
+
+def _budget_pie(allocation):
+    import plotly.express as px
+
+    savings, investments, discretionary = allocation
+    return px.pie(
+        pd.DataFrame({
+            "Type": ["Savings", "Investments", "Discretionary"],
+            "Amount": [savings, investments, discretionary],
+        }),
+        values="Amount", names="Type",
+        title="Budget Allocation"
+    )
+
+
+def category_pie(category_spending, cache=None):
+    return cached_figure("category_pie", category_spending, _category_pie, cache)
+
+
+def priority_bar(priority_spending, cache=None):
+    return cached_figure("priority_bar", priority_spending, _priority_bar, cache)
+
+
+def top_expenses_bar(top_expenses, cache=None):
+    return cached_figure("top_expenses", top_expenses.reset_index(drop=True), _top_expenses, cache)
+
+
+def budget_pie(option, cache=None):
+    """Pie of one budget option's savings / investments / discretionary split."""
+    allocation = (float(option["Savings"]), float(option["Investments"]), float(option["Discretionary"]))
+    return cached_figure("budget_pie", allocation, _budget_pie, cache)
@@ -0,0 +1,88 @@
+"""Bitmap index for the dashboard's multiselect filters.
+
+A ``BitmapIndex`` holds, for every value of each indexed column, a packed
+bitmap (one bit per row) of the rows carrying that value, plus optional
+boolean flag bitmaps such as "adjusted". A filter selection resolves by OR-ing
+the bitmaps of the selected values within a column and AND-ing across
+columns, which touches ``rows / 8`` bytes per value instead of comparing
+every row; only the matching rows are then taken from the frame.
+
+The index is built once per data version (the pipeline caches it under the
+adjusted frames' key), so a filter change costs a few bitwise operations
+and one ``take``, even at a million line items.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _pack(mask):
+    return np.packbits(mask)
+
+
+class BitmapIndex:
+    """Per-value row bitmaps over ``columns`` of ``frame``.
+
+    ``flags`` maps a flag name to a boolean array (one entry per row).
+    """
+
+    def __init__(self, frame, columns, flags=None):
+        self.frame = frame
+        self.size = len(frame)
+        self._all = _pack(np.ones(self.size, dtype=bool))
+        self._none = np.zeros_like(self._all)
+        self.bitmaps = {}
+        for column in columns:
+            codes, uniques = pd.factorize(frame[column])
+            self.bitmaps[column] = {value: _pack(codes == code) for code, value in enumerate(uniques)}
+        self.flags = {name: _pack(np.asarray(mask, dtype=bool)) for name, mask in (flags or {}).items()}
+
+    def values(self, column):
+        """Return the values present in ``column``, in first-seen order."""
+        return list(self.bitmaps[column])
+
+    def bitmap(self, selections=None, flags=()):
+        """Packed bitmap of rows matching every selection and flag.
+
+        ``selections`` maps a column to the accepted values; ``None`` leaves
+        the column unfiltered, and an empty list matches nothing.
+        """
+        result = self._all.copy()
+        for column, selected in (selections or {}).items():
+            if selected is None:
+                continue
+            bitmaps = self.bitmaps[column]
+            column_bits = self._none.copy()
+            for value in selected:
+                bits = bitmaps.get(value)
+                if bits is not None:
+                    np.bitwise_or(column_bits, bits, out=column_bits)
+            np.bitwise_and(result, column_bits, out=result)
+        for name in flags:
+            np.bitwise_and(result, self.flags[name], out=result)
+        return result
+
+    def mask(self, selections=None, flags=()):
+        """Boolean row mask matching the filter."""
+        return np.unpackbits(self.bitmap(selections, flags), count=self.size).view(bool)
+
+    def positions(self, selections=None, flags=()):
+        """Row positions matching the filter, ascending."""
+        return np.flatnonzero(np.unpackbits(self.bitmap(selections, flags), count=self.size))
+
+    def count(self, selections=None, flags=()):
+        return int(np.unpackbits(self.bitmap(selections, flags), count=self.size).sum())
+
+    def select(self, selections=None, flags=()):
+        """Materialise the matching rows of the indexed frame."""
+        return self.frame.take(self.positions(selections, flags))
+
+
+def expense_index(expense_details):
+    """Index the combined expense table on Priority, Category and Flexibility."""
+    return BitmapIndex(expense_details, ("Priority", "Category", "Flexibility"))
+
+
+def adjustment_index(detailed_adjustments):
+    """Index item-level adjustments on Priority, flagging adjusted rows."""
+    frame = detailed_adjustments.reset_index(drop=True)
+    return BitmapIndex(frame, ("Priority",), flags={"adjusted": frame["Adjustment"].to_numpy() != 0})
@@ -0,0 +1,111 @@
+"""Goal seek: the smallest cuts that make a savings target feasible.
+
+"Feasible Savings" is the smaller of the two budget options' savings. For
+a target of ``T`` it reaches ``T`` exactly when both options' savings
+share of the surplus is at least ``T`` (the goal only caps it). Cuts only
+ever lower expenses, so that capacity grows monotonically along the order
+the search tries cuts in: the discretionary cut first, from 0 up to its
+maximum, and then, only with discretionary at its maximum, the essential
+cut. ``savings_path`` evaluates that whole path once and ``required_cuts``
+answers any number of targets with one ``np.searchsorted``, which is what
+draws the goal vs required cuts curve.
+
+The path follows ``apply_spending_cuts`` exactly, in whole minor units:
+each item is rounded half to even on its own, so totals are summed per
+distinct amount (``np.unique``) rather than per item. Auto-adjustment
+only runs when cut expenses exceed income. It then leaves no surplus, so
+those points have a capacity of 0. The split is the
+``generate_budget_options`` largest-remainder allocation for the given
+risk appetite. For the splits in ``BUDGET_SPLITS``, the savings share
+never shrinks as the surplus grows. The shares repeat modulo 100, and
+every residue was checked.
+"""
+import numpy as np
+
+from finance_engine import money
+from finance_engine.stages import BUDGET_SPLITS, cut_groups
+from finance_engine.sweep import DISCRETIONARY_CUTS, ESSENTIAL_CUTS
+
+
+def cut_path(essential_cuts=ESSENTIAL_CUTS, discretionary_cuts=DISCRETIONARY_CUTS):
+    """``(essential, discretionary)`` cut arrays in search order."""
+    essential_cuts = np.asarray(essential_cuts, dtype=np.float64)
+    discretionary_cuts = np.asarray(discretionary_cuts, dtype=np.float64)
+    essential = np.concatenate([np.full(len(discretionary_cuts), essential_cuts[0]), essential_cuts[1:]])
+    discretionary = np.concatenate([discretionary_cuts, np.full(len(essential_cuts) - 1, discretionary_cuts[-1])])
+    return essential, discretionary
+
+
+def _cut_totals(minor, cuts):
+    """Sum of ``minor`` after each cut in ``cuts``, rounded per item as the stage does."""
+    amounts, counts = np.unique(minor, return_counts=True)
+    return np.array([int(counts @ money.scale_percent(amounts, -cut)) for cut in cuts], dtype=np.int64)
+
+
+def savings_capacity(monthly_income, total_fixed_expenses, risk_appetite):
+    """Feasible savings with an unlimited goal, per total (minor units in, minor units out)."""
+    splits = BUDGET_SPLITS.get(risk_appetite, BUDGET_SPLITS["High"])
+    remaining = money.to_minor(float(monthly_income)) - np.asarray(total_fixed_expenses, dtype=np.int64)
+    capacity = np.zeros(len(remaining), dtype=np.int64)
+    for i, surplus in enumerate(remaining.tolist()):
+        if surplus > 0:
+            capacity[i] = min(int(money.allocate(surplus, split)[0]) for _, *split in splits)
+    return capacity
+
+
+def savings_path(groceries_df, bills_df, monthly_income, risk_appetite,
+                 essential_cuts=ESSENTIAL_CUTS, discretionary_cuts=DISCRETIONARY_CUTS):
+    """Expenses and feasible-savings capacity at every point of the search path.
+
+    ``groceries_df`` and ``bills_df`` are the uncut frames. Returns a dict of
+    equal-length arrays ``essential_cut``, ``discretionary_cut``,
+    ``total_fixed_expenses`` and ``feasible_savings`` (the latter two in
+    currency units; ``feasible_savings`` is non-decreasing).
+    """
+    amounts, essential, discretionary = cut_groups(groceries_df, bills_df)
+    minor = money.to_minor(amounts)
+    essential_path, discretionary_path = cut_path(essential_cuts, discretionary_cuts)
+
+    fixed = int(minor[~(essential | discretionary)].sum())
+    essential_totals = _cut_totals(minor[essential], np.unique(essential_path))
+    discretionary_totals = _cut_totals(minor[discretionary], np.unique(discretionary_path))
+    totals = (fixed
+              + essential_totals[np.searchsorted(np.unique(essential_path), essential_path)]
+              + discretionary_totals[np.searchsorted(np.unique(discretionary_path), discretionary_path)])
+    capacity = savings_capacity(monthly_income, totals, risk_appetite)
+    return {
+        "essential_cut": essential_path,
+        "discretionary_cut": discretionary_path,
+        "total_fixed_expenses": money.to_units(totals),
+        "feasible_savings": money.to_units(capacity),
+    }
+
+
+def required_cuts(path, targets):
+    """The first point of ``path`` whose feasible savings reach each target.
+
+    Returns a dict of arrays aligned with ``targets``: ``essential_cut`` and
+    ``discretionary_cut`` (NaN where no cut on the path is enough),
+    ``feasible`` and the ``feasible_savings`` at that point (the best
+    possible where infeasible). Targets are rounded to minor units, as the
+    budget options round the goal.
+    """
+    targets = money.quantize(np.atleast_1d(np.asarray(targets, dtype=np.float64)))
+    capacity = path["feasible_savings"]
+    position = np.searchsorted(capacity, targets, side="left")
+    feasible = position < len(capacity)
+    position = np.minimum(position, len(capacity) - 1)
+    return {
+        "target": targets,
+        "essential_cut": np.where(feasible, path["essential_cut"][position], np.nan),
+        "discretionary_cut": np.where(feasible, path["discretionary_cut"][position], np.nan),
+        "feasible": feasible,
+        "feasible_savings": capacity[position],
+    }
+
+
+def goal_seek(groceries_df, bills_df, monthly_income, target, risk_appetite,
+              essential_cuts=ESSENTIAL_CUTS, discretionary_cuts=DISCRETIONARY_CUTS):
+    """The smallest cuts reaching one ``target``, as a dict of scalars."""
+    path = savings_path(groceries_df, bills_df, monthly_income, risk_appetite, essential_cuts, discretionary_cuts)
+    return {name: values[0].item() for name, values in required_cuts(path, target).items()}
@@ -0,0 +1,296 @@
+"""Streaming import of mobile-money and bank statement CSV exports.
+
+Statements are read with the ``csv`` module and processed in fixed-size
+chunks, so memory stays bounded by the chunk size whatever the file size::
+
+    read_rows -> chunked -> normalise_chunk -> LedgerStore.insert_transactions
+
+Each row's date and amount are normalised, and its description is mapped to
+the Priority/Category/Flexibility taxonomy of the budget catalog. Rows that
+cannot be parsed are written to a rejects CSV with the reason, and the run
+returns counts and a rows/sec rate.
+
+Each chunk is committed as it is written. Every transaction records the
+statement's absolute path and its line number, and the ledger keeps one row
+per household, file and line, so re-running an import that stopped part-way
+skips the rows already stored instead of adding them twice.
+
+Run from the command line with::
+
+    python -m finance_engine.importer statement.csv --db ledger.db --household default
+"""
+import argparse
+import csv
+import os
+import re
+import time
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+
+from finance_engine.catalog import BILLS, GROCERIES
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Header names seen in mobile-money and bank exports, matched case-insensitively
+DATE_COLUMNS = ("date", "transaction date", "txn date", "value date", "posting date", "date/time")
+DESCRIPTION_COLUMNS = ("description", "details", "narration", "narrative", "memo", "transaction details",
+                       "transaction type", "type")
+AMOUNT_COLUMNS = ("amount", "transaction amount", "amount (ugx)")
+DEBIT_COLUMNS = ("debit", "withdrawal", "withdrawals", "paid out", "money out", "debit amount")
+CREDIT_COLUMNS = ("credit", "deposit", "deposits", "paid in", "money in", "credit amount")
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%d %b %Y", "%d-%b-%Y", "%d %B %Y",
+                "%Y/%m/%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S")
+
+# Taxonomy for common statement payees not named in the catalog:
+# keyword -> (Priority, Category, Flexibility)
+PAYEE_KEYWORDS = {
+    "rent": ("Critical", "Housing", "None"),
+    "landlord": ("Critical", "Housing", "None"),
+    "nwsc": ("Critical", "Utilities", "Low"),
+    "umeme": ("Critical", "Utilities", "Medium"),
+    "yaka": ("Critical", "Utilities", "Medium"),
+    "school": ("Critical", "Education", "None"),
+    "fees": ("Critical", "Education", "None"),
+    "shell": ("Essential", "Transport", "Medium"),
+    "boda": ("Essential", "Transport", "Medium"),
+    "taxi": ("Essential", "Transport", "Medium"),
+    "church": ("Essential", "Donations", "Medium"),
+    "pharmacy": ("Essential", "Healthcare", "Low"),
+    "clinic": ("Essential", "Healthcare", "Low"),
+    "hospital": ("Essential", "Healthcare", "Low"),
+    "supermarket": ("Essential", "Food Staples", "Medium"),
+    "market": ("Essential", "Food Staples", "Medium"),
+    "airtime": ("Discretionary", "Communication", "High"),
+    "bundle": ("Discretionary", "Communication", "High"),
+    "restaurant": ("Discretionary", "Entertainment", "High"),
+    "bar": ("Discretionary", "Entertainment", "High"),
+}
+UNMATCHED = ("Discretionary", "Uncategorised", "High")
+
+_WORD = re.compile(r"[a-z]+")
+_AMOUNT_JUNK = re.compile(r"[^0-9.\-]")
+
+
+def _catalog_keywords():
+    keywords = {}
+    for item in GROCERIES:
+        for word in _WORD.findall(item["Item"].lower()):
+            keywords.setdefault(word, (item["Priority"], item["Category"], item["Flexibility"]))
+    for bill in BILLS:
+        for word in _WORD.findall(bill["Category"].lower()):
+            keywords.setdefault(word, (bill["Priority"], bill["Type"], bill["Flexibility"]))
+    keywords.update(PAYEE_KEYWORDS)
+    return keywords
+
+
+KEYWORDS = _catalog_keywords()
+
+
+@lru_cache(maxsize=65536)
+def classify(description):
+    """Map a statement description to ``(priority, category, flexibility)``."""
+    for word in _WORD.findall(description.lower()):
+        if word in KEYWORDS:
+            return KEYWORDS[word]
+    return UNMATCHED
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_cached(value):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError(f"unrecognised date {value!r}")
+
+
+def parse_date(value):
+    """Normalise a statement date to ISO ``YYYY-MM-DD``."""
+    return _parse_date_cached(value.strip())
+
+
+def parse_amount(value):
+    """Parse ``"UGX 12,000"``, ``"(1,500.00)"`` or ``"-700"`` into a float.
+
+    Returns ``None`` for an empty cell; parentheses mean a negative amount.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    negative = value.startswith("(") and value.endswith(")")
+    cleaned = _AMOUNT_JUNK.sub("", value)
+    if cleaned in ("", "-", "."):
+        raise ValueError(f"unrecognised amount {value!r}")
+    amount = float(cleaned)
+    return -amount if negative else amount
+
+
+def _find(header, candidates):
+    lowered = {name.strip().lower(): name for name in header}
+    for candidate in candidates:
+        if candidate in lowered:
+            return lowered[candidate]
+    return None
+
+
+def detect_columns(header):
+    """Work out which statement columns hold the date, description and amounts."""
+    columns = {
+        "date": _find(header, DATE_COLUMNS),
+        "description": _find(header, DESCRIPTION_COLUMNS),
+        "amount": _find(header, AMOUNT_COLUMNS),
+        "debit": _find(header, DEBIT_COLUMNS),
+        "credit": _find(header, CREDIT_COLUMNS),
+    }
+    if columns["date"] is None or columns["description"] is None:
+        raise ValueError(f"Statement header {header!r} has no date or description column")
+    if columns["amount"] is None and columns["debit"] is None:
+        raise ValueError(f"Statement header {header!r} has no amount or debit column")
+    return columns
+
+
+def read_rows(path, encoding="utf-8-sig"):
+    """Yield ``(line_number, row)`` dicts from a CSV file without loading it."""
+    with open(path, newline="", encoding=encoding) as handle:
+        reader = csv.DictReader(handle)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def chunked(iterable, size):
+    """Yield lists of up to ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def normalise_chunk(chunk, columns, household, source="", spend_sign=-1):
+    """Normalise one chunk of raw rows.
+
+    Returns ``(transactions, rejects, inflows)``; transactions are spending
+    rows ready for ``LedgerStore.insert_transactions`` with positive amounts,
+    rejects are ``(line_number, row, reason)`` and inflows counts credits,
+    which are not budget spending and are skipped. With a single signed
+    amount column, ``spend_sign`` says which sign marks money going out.
+    """
+    transactions, rejects, inflows = [], [], 0
+    for line_number, row in chunk:
+        try:
+            date = parse_date(row.get(columns["date"]) or "")
+            if columns["amount"] is not None:
+                amount = parse_amount(row.get(columns["amount"]) or "")
+                if amount is None:
+                    raise ValueError("missing amount")
+                spent = amount * spend_sign
+            else:
+                debit = parse_amount(row.get(columns["debit"]) or "")
+                credit = parse_amount(row.get(columns["credit"]) or "") if columns["credit"] else None
+                if not debit and not credit:
+                    raise ValueError("missing amount")
+                spent = abs(debit) if debit else -abs(credit)
+        except ValueError as error:
+            rejects.append((line_number, row, str(error)))
+            continue
+        if spent <= 0:
+            inflows += 1
+            continue
+
+        description = (row.get(columns["description"]) or "").strip()
+        priority, category, flexibility = classify(description)
+        transactions.append({
+            "household": household,
+            "date": date,
+            "month": date[:7],
+            "description": description,
+            "amount": spent,
+            "priority": priority,
+            "category": category,
+            "flexibility": flexibility,
+            "source": source,
+            "source_line": line_number,
+        })
+    return transactions, rejects, inflows
+
+
+def import_statement(path, store, household, rejects_path=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                     encoding="utf-8-sig", spend_sign=-1, progress=None):
+    """Stream a statement CSV into ``store`` in chunks of ``chunk_size`` rows.
+
+    Rejected rows go to ``rejects_path`` (default: ``<path>.rejects.csv``).
+    ``progress``, if given, is called with the running stats after each
+    chunk. Returns a stats dict with row counts, elapsed seconds and
+    ``rows_per_sec``; ``duplicates`` counts rows an earlier import of the
+    same file already stored.
+    """
+    path = str(path)
+    rejects_path = rejects_path or f"{path}.rejects.csv"
+    source = os.path.abspath(path)
+    with open(path, newline="", encoding=encoding) as handle:
+        header = next(csv.reader(handle), None)
+    if not header:
+        raise ValueError(f"{path} is empty")
+    columns = detect_columns(header)
+
+    stats = {"rows": 0, "imported": 0, "duplicates": 0, "rejected": 0, "inflows": 0, "unmatched": 0, "chunks": 0}
+    started = time.perf_counter()
+    with open(rejects_path, "w", newline="", encoding="utf-8") as rejects_file:
+        rejects_writer = csv.writer(rejects_file)
+        rejects_writer.writerow(["line", "reason"] + header)
+        for chunk in chunked(read_rows(path, encoding), chunk_size):
+            transactions, rejects, inflows = normalise_chunk(chunk, columns, household, source, spend_sign)
+            inserted = store.insert_transactions(transactions)
+            for line_number, row, reason in rejects:
+                rejects_writer.writerow([line_number, reason] + [row.get(name, "") for name in header])
+
+            stats["rows"] += len(chunk)
+            stats["imported"] += inserted
+            stats["duplicates"] += len(transactions) - inserted
+            stats["rejected"] += len(rejects)
+            stats["inflows"] += inflows
+            stats["unmatched"] += sum(1 for t in transactions if t["category"] == UNMATCHED[1])
+            stats["chunks"] += 1
+            if progress is not None:
+                progress(_with_rate(stats, started))
+    return _with_rate(stats, started)
+
+
+def _with_rate(stats, started):
+    elapsed = time.perf_counter() - started
+    return dict(stats, seconds=elapsed, rows_per_sec=stats["rows"] / elapsed if elapsed > 0 else 0.0)
+
+
+def main(argv=None):
+    from finance_engine.ledger import LedgerStore
+
+    parser = argparse.ArgumentParser(description="Import a statement CSV into the ledger database.")
+    parser.add_argument("statement")
+    parser.add_argument("--db", required=True, help="ledger SQLite file")
+    parser.add_argument("--household", default="default")
+    parser.add_argument("--rejects", help="rejects CSV (default: <statement>.rejects.csv)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--encoding", default="utf-8-sig")
+    parser.add_argument("--positive-is-spending", action="store_true",
+                        help="treat positive values in a signed amount column as payments out")
+    args = parser.parse_args(argv)
+
+    def report(stats):
+        print(f"{stats['rows']:,} rows, {stats['imported']:,} imported, {stats['rejected']:,} rejected "
+              f"({stats['rows_per_sec']:,.0f} rows/sec)", flush=True)
+
+    stats = import_statement(args.statement, LedgerStore(args.db), args.household, args.rejects,
+                             args.chunk_size, args.encoding,
+                             1 if args.positive_is_spending else -1, progress=report)
+    print(f"Done: {stats['imported']:,} transactions imported, {stats['duplicates']:,} already imported, "
+          f"{stats['inflows']:,} inflows skipped, "
+          f"{stats['unmatched']:,} uncategorised, {stats['rejected']:,} rejected "
+          f"in {stats['seconds']:.1f}s ({stats['rows_per_sec']:,.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""Persistent ledger of budget line items and real transactions.
+
+The store is a single SQLite file. Line items are the monthly budget rows the
+dashboards work on (one grocery or bill per row, per household and month);
+transactions are dated payments imported from statements. Both tables are
+indexed by household and month first, so loading one month's slice is an
+index range scan whose cost depends on that slice, not on how many years of
+history sit in the file.
+
+``load_month`` returns the same ``(groceries_df, bills_df)`` pair as
+``finance_engine.catalog.load_data``, so a stored month can feed the
+pipeline directly.
+
+By default each thread opens its own connection. The store keeps them by
+thread: a thread's connection is released when the thread is gone, and
+``close`` closes every one still open. A store built with ``pool_size``
+instead shares a fixed ``ConnectionPool``, which bounds the number of open
+connections when many worker threads serve requests.
+"""
+import queue
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+
+import pandas as pd
+
+from finance_engine import money
+from finance_engine.catalog import TITHE_RATE, _static_frames
+from finance_engine.schema import categorize_bills, categorize_groceries
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS line_items (
+    id INTEGER PRIMARY KEY,
+    household TEXT NOT NULL,
+    month TEXT NOT NULL,
+    kind TEXT NOT NULL CHECK (kind IN ('grocery', 'bill')),
+    description TEXT NOT NULL,
+    quantity TEXT NOT NULL DEFAULT '',
+    amount REAL NOT NULL,
+    priority TEXT NOT NULL,
+    category TEXT NOT NULL,
+    flexibility TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS line_items_month ON line_items (household, month, kind);
+CREATE INDEX IF NOT EXISTS line_items_priority ON line_items (household, month, priority);
+CREATE INDEX IF NOT EXISTS line_items_category ON line_items (household, category, month);
+CREATE INDEX IF NOT EXISTS line_items_flexibility ON line_items (household, month, flexibility);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    household TEXT NOT NULL,
+    date TEXT NOT NULL,
+    month TEXT NOT NULL,
+    description TEXT NOT NULL,
+    amount REAL NOT NULL,
+    priority TEXT NOT NULL,
+    category TEXT NOT NULL,
+    flexibility TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    source_line INTEGER
+);
+CREATE INDEX IF NOT EXISTS transactions_date ON transactions (household, date);
+CREATE INDEX IF NOT EXISTS transactions_month ON transactions (household, month, priority);
+CREATE INDEX IF NOT EXISTS transactions_category ON transactions (household, category, month);
+CREATE INDEX IF NOT EXISTS transactions_flexibility ON transactions (household, month, flexibility);
+
+-- Bumped on every write to a (household, month) slice; part of cache keys
+CREATE TABLE IF NOT EXISTS revisions (
+    household TEXT NOT NULL,
+    month TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    PRIMARY KEY (household, month)
+) WITHOUT ROWID;
+"""
+
+# Created after ``_migrate`` has added the column to files from before it.
+# A statement row is imported once per household; rows without a source line
+# (entered by hand) are never duplicates, as NULLs are distinct.
+IMPORT_KEY_SCHEMA = """
+CREATE UNIQUE INDEX IF NOT EXISTS transactions_source_line ON transactions (household, source, source_line);
+"""
+
+# Columns added since the first release: (table, column, declaration)
+ADDED_COLUMNS = (("transactions", "source_line", "INTEGER"),)
+
+LINE_ITEM_COLUMNS = ("household", "month", "kind", "description", "quantity", "amount",
+                     "priority", "category", "flexibility")
+TRANSACTION_COLUMNS = ("household", "date", "month", "description", "amount",
+                       "priority", "category", "flexibility", "source")
+
+# Line items whose amount is derived from income when a month is loaded
+INCOME_LINKED_AMOUNTS = {"Tithe": TITHE_RATE}
+
+
+def month_of(date):
+    """Return the ``YYYY-MM`` month of an ISO date string."""
+    return date[:7]
+
+
+def _open(path):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _migrate(conn):
+    for table, column, declaration in ADDED_COLUMNS:
+        if column not in {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+
+class ConnectionPool:
+    """Fixed set of SQLite connections handed out to one thread at a time."""
+
+    def __init__(self, path, size):
+        self.size = size
+        self._idle = queue.Queue()
+        for _ in range(size):
+            self._idle.put(_open(path))
+
+    @contextmanager
+    def connection(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        for _ in range(self.size):
+            self._idle.get().close()
+
+
+class LedgerStore:
+    """SQLite-backed store of line items and transactions.
+
+    One connection is opened per thread, so a store can be shared between
+    Streamlit sessions; with ``pool_size`` the threads share that many
+    pooled connections instead.
+    """
+
+    def __init__(self, path, pool_size=None):
+        self.path = str(path)
+        # Per-thread connections, dropped with their thread
+        self._connections = weakref.WeakKeyDictionary()
+        self._connections_lock = threading.Lock()
+        self._pool = ConnectionPool(self.path, pool_size) if pool_size else None
+        with self.transaction() as conn:
+            conn.executescript(SCHEMA)
+            _migrate(conn)
+            conn.executescript(IMPORT_KEY_SCHEMA)
+
+    def _connect(self):
+        thread = threading.current_thread()
+        with self._connections_lock:
+            conn = self._connections.get(thread)
+            if conn is None:
+                conn = self._connections[thread] = _open(self.path)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        if self._pool is None:
+            yield self._connect()
+        else:
+            with self._pool.connection() as conn:
+                yield conn
+
+    @contextmanager
+    def transaction(self, immediate=False):
+        """Commit on success, roll back on error.
+
+        ``immediate`` takes SQLite's write lock up front (``BEGIN IMMEDIATE``),
+        so what the transaction reads cannot change under it before it commits.
+        """
+        with self.connection() as conn:
+            with conn:
+                if immediate:
+                    conn.execute("BEGIN IMMEDIATE")
+                yield conn
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+        with self._connections_lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+
+    def _bump(self, conn, keys):
+        conn.executemany(
+            "INSERT INTO revisions (household, month, revision) VALUES (?, ?, 1) "
+            "ON CONFLICT (household, month) DO UPDATE SET revision = revision + 1",
+            sorted(keys))
+
+    def revision(self, household, month):
+        """Return the write counter of one month's slice (0 if never written)."""
+        with self.connection() as conn:
+            row = conn.execute(
+                "SELECT revision FROM revisions WHERE household = ? AND month = ?", (household, month)).fetchone()
+        return row[0] if row else 0
+
+    # Writes
+
+    def _insert_line_items(self, conn, rows):
+        values = [tuple(row.get(column, "") if column == "quantity" else row[column] for column in LINE_ITEM_COLUMNS)
+                  for row in rows]
+        conn.executemany(
+            f"INSERT INTO line_items ({', '.join(LINE_ITEM_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(LINE_ITEM_COLUMNS))})", values)
+        self._bump(conn, {(v[0], v[1]) for v in values})
+        return len(values)
+
+    def insert_line_items(self, rows):
+        """Bulk insert line items given as mappings with ``LINE_ITEM_COLUMNS``."""
+        with self.transaction() as conn:
+            return self._insert_line_items(conn, rows)
+
+    def insert_transactions(self, rows):
+        """Bulk insert transactions; return how many rows were new.
+
+        ``month`` is derived from ``date`` when missing. Rows that carry a
+        ``source_line`` are keyed by household, source and line: one already
+        stored is skipped, so importing a statement again (say, after a crash
+        part-way through) adds only the rows that are missing.
+        """
+        values = []
+        for row in rows:
+            row = dict(row)
+            row.setdefault("month", month_of(row["date"]))
+            row.setdefault("source", "")
+            values.append(tuple(row[column] for column in TRANSACTION_COLUMNS) + (row.get("source_line"),))
+        columns = TRANSACTION_COLUMNS + ("source_line",)
+        with self.transaction() as conn:
+            inserted = conn.executemany(
+                f"INSERT INTO transactions ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT (household, source, source_line) DO NOTHING", values).rowcount
+            if inserted:
+                self._bump(conn, {(v[0], v[2]) for v in values})
+        return inserted
+
+    def _replace_month(self, conn, household, month, rows):
+        conn.execute("DELETE FROM line_items WHERE household = ? AND month = ?", (household, month))
+        self._bump(conn, {(household, month)})
+        return self._insert_line_items(conn, [dict(row, household=household, month=month) for row in rows])
+
+    def replace_month(self, household, month, rows):
+        """Replace one month's line items with ``rows`` in a single transaction."""
+        with self.transaction(immediate=True) as conn:
+            return self._replace_month(conn, household, month, rows)
+
+    def seed_month(self, household, month):
+        """Copy the built-in catalog into an empty month; return rows written.
+
+        A month that already has line items is found with a plain read, so
+        the dashboard can call this on every rerun without taking the write
+        lock. Only an empty month takes it; the check is then repeated inside
+        the write transaction, so sessions seeding the same month at once
+        write the catalog only once.
+        """
+        if self._has_line_items(household, month):
+            return 0
+        groceries_df, bills_df = _static_frames()
+        rows = [
+            {"kind": "grocery", "description": r.Item, "quantity": r.Quantity, "amount": r.Price,
+             "priority": r.Priority, "category": r.Category, "flexibility": r.Flexibility}
+            for r in groceries_df.itertuples(index=False)
+        ] + [
+            {"kind": "bill", "description": r.Category, "amount": r.Amount,
+             "priority": r.Priority, "category": r.Type, "flexibility": r.Flexibility}
+            for r in bills_df.itertuples(index=False)
+        ]
+        with self.transaction(immediate=True) as conn:
+            if self._has_line_items(household, month, conn):
+                return 0
+            return self._replace_month(conn, household, month, rows)
+
+    # Queries
+
+    def _has_line_items(self, household, month, conn=None):
+        if conn is None:
+            with self.connection() as conn:
+                return self._has_line_items(household, month, conn)
+        return conn.execute("SELECT 1 FROM line_items WHERE household = ? AND month = ? LIMIT 1",
+                            (household, month)).fetchone() is not None
+
+    def count_line_items(self, household, month):
+        with self.connection() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM line_items WHERE household = ? AND month = ?", (household, month)).fetchone()[0]
+
+    def months(self, household):
+        """Return the months that have line items, oldest first."""
+        with self.connection() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT month FROM line_items WHERE household = ? ORDER BY month", (household,))
+            return [month for (month,) in rows]
+
+    def line_items(self, household, start_month, end_month=None, priority=None, category=None,
+                   flexibility=None, kind=None):
+        """Return line items for ``start_month``..``end_month`` (inclusive) as a DataFrame.
+
+        ``priority``, ``category`` and ``flexibility`` accept a value or a
+        list of values.
+        """
+        where = ["household = ?", "month BETWEEN ? AND ?"]
+        params = [household, start_month, end_month or start_month]
+        for column, value in (("priority", priority), ("category", category),
+                              ("flexibility", flexibility), ("kind", kind)):
+            if value is None:
+                continue
+            values = [value] if isinstance(value, str) else list(value)
+            where.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        with self.connection() as conn:
+            return pd.read_sql_query(
+                f"SELECT {', '.join(LINE_ITEM_COLUMNS)} FROM line_items WHERE {' AND '.join(where)} ORDER BY month, id",
+                conn, params=params)
+
+    def transactions(self, household, start_date, end_date, category=None):
+        """Return transactions dated ``start_date``..``end_date`` (inclusive ISO dates)."""
+        where = ["household = ?", "date BETWEEN ? AND ?"]
+        params = [household, start_date, end_date]
+        if category is not None:
+            values = [category] if isinstance(category, str) else list(category)
+            where.append(f"category IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        with self.connection() as conn:
+            return pd.read_sql_query(
+                f"SELECT {', '.join(TRANSACTION_COLUMNS)} FROM transactions WHERE {' AND '.join(where)} ORDER BY date, id",
+                conn, params=params)
+
+    def transactions_since(self, household, after_id=0, start_date=None):
+        """Return transactions with ``id`` above ``after_id`` in insertion order.
+
+        For streaming consumers: remember the largest ``id`` seen and ask for
+        the rows after it. ``start_date`` bounds the first read.
+        """
+        where = ["household = ?", "id > ?"]
+        params = [household, after_id]
+        if start_date is not None:
+            where.append("date >= ?")
+            params.append(start_date)
+        with self.connection() as conn:
+            return pd.read_sql_query(
+                f"SELECT id, {', '.join(TRANSACTION_COLUMNS)} FROM transactions WHERE {' AND '.join(where)} ORDER BY id",
+                conn, params=params)
+
+    def monthly_category_totals(self, household, start_month, end_month):
+        """Return transaction totals per month and category for a month range."""
+        with self.connection() as conn:
+            return pd.read_sql_query(
+                "SELECT month, category, SUM(amount) AS amount, COUNT(*) AS transactions FROM transactions "
+                "WHERE household = ? AND month BETWEEN ? AND ? GROUP BY month, category ORDER BY month, category",
+                conn, params=[household, start_month, end_month])
+
+    def load_month(self, household, month, monthly_income):
+        """Return ``(groceries_df, bills_df)`` for one month, shaped like ``load_data``."""
+        items = self.line_items(household, month)
+        groceries = items[items["kind"] == "grocery"]
+        bills = items[items["kind"] == "bill"]
+
+        groceries_df = categorize_groceries(pd.DataFrame({
+            "Item": groceries["description"].to_numpy(),
+            "Quantity": groceries["quantity"].to_numpy(),
+            "Price": groceries["amount"].to_numpy(dtype="float64"),
+            "Priority": groceries["priority"].to_numpy(),
+            "Category": groceries["category"].to_numpy(),
+            "Flexibility": groceries["flexibility"].to_numpy(),
+        }))
+        bills_df = categorize_bills(pd.DataFrame({
+            "Category": bills["description"].to_numpy(),
+            "Amount": bills["amount"].to_numpy(dtype="float64"),
+            "Priority": bills["priority"].to_numpy(),
+            "Flexibility": bills["flexibility"].to_numpy(),
+            "Type": bills["category"].to_numpy(),
+        }))
+        for description, rate in INCOME_LINKED_AMOUNTS.items():
+            bills_df.loc[bills_df["Category"] == description, "Amount"] = money.multiply(monthly_income, rate)
+        return groceries_df, bills_df
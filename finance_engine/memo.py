@@ -0,0 +1,61 @@
+"""Bounded memoization for pipeline stages.
+
+Every stage result is stored under a key derived from a hash of the stage name,
+its scalar inputs and the keys of the stages it consumes. Upstream keys stand
+in for the upstream frames, so building a key never touches a DataFrame.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def stage_key(name, *inputs):
+    """Hash a stage name and its inputs into a stable hex key."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((name,) + inputs).encode("utf-8"))
+    return f"{name}:{digest.hexdigest()}"
+
+
+class StageCache:
+    """Thread-safe LRU cache of stage results.
+
+    Cached values are shared between reruns and sessions, so callers must
+    treat them as read-only.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Compute outside the lock so slow stages don't serialise sessions
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,278 @@
+"""Integer money: amounts as ``int64`` counts of the currency's minor unit.
+
+Float amounts drift: ``200000/3``, ``income * 0.1`` and repeated
+``*= (1 - cut/100)`` each leave a fraction that totals then carry along.
+``Decimal`` would be exact but is far too slow for whole ledgers. The budget
+stages instead convert amounts to minor units once, work on ``int64`` numpy
+arrays, and convert back at the end. The rounding rules are explicit:
+
+* converting to minor units rounds half to even (``to_minor``);
+* scaling by a rational factor is exact integer arithmetic, rounded half to
+  even once at the end (``scale``); factors given as floats or percentages
+  are read as their shortest decimal (``ratio(0.1) == (1, 10)``);
+* splitting a total into shares uses the largest-remainder method, so the
+  shares always add up to the total (``allocate``; ``allocate_rows``,
+  ``allocate_groups`` and ``allocate_counts`` split many totals at once
+  with the same result).
+
+``DECIMALS`` is the currency's ISO 4217 exponent. The shilling has no minor
+unit in use (exponent 0), so minor units are whole shillings and every
+amount converted back is an integer-valued float: frames keep their float64
+columns, and sums of them are exact up to 2**53.
+
+Products that could overflow ``int64`` (very large amounts times a factor
+with a large denominator) fall back to Python integers, which are slower
+but still exact.
+"""
+from fractions import Fraction
+
+import numpy as np
+
+DECIMALS = 0
+SCALE = 10 ** DECIMALS
+_INT64_MAX = 2 ** 63 - 1
+# Below this many shares, allocate() in Python ints beats numpy's call overhead
+_SMALL = 16
+
+
+def to_minor(amounts):
+    """Round currency amounts to ``int64`` minor units, half to even.
+
+    A scalar comes back as a Python ``int`` (``round`` is half to even too).
+    """
+    if isinstance(amounts, (int, float)):
+        return round(amounts * SCALE)
+    return np.rint(np.asarray(amounts, dtype=np.float64) * SCALE).astype(np.int64)
+
+
+def to_units(minor):
+    """Convert minor units back to float64 currency amounts."""
+    if isinstance(minor, int):
+        return minor / SCALE
+    return np.asarray(minor, dtype=np.int64) / SCALE
+
+
+def quantize(amounts):
+    """Round currency amounts to whole minor units, keeping them as floats."""
+    return to_units(to_minor(amounts))
+
+
+def ratio(factor):
+    """Return ``factor`` as an exact ``(numerator, denominator)`` pair.
+
+    Floats are read as their shortest decimal representation, so
+    ``ratio(0.1)`` is ``(1, 10)`` rather than the binary fraction.
+    """
+    fraction = Fraction(str(factor)) if isinstance(factor, (float, np.floating)) else Fraction(factor)
+    return fraction.numerator, fraction.denominator
+
+
+def _divide_half_even(numerator, denominator):
+    # floor division keeps the remainder in [0, denominator); // and % also
+    # work on object arrays of Python ints, where np.divmod does not
+    quotient, remainder = numerator // denominator, numerator % denominator
+    twice = 2 * remainder
+    return quotient + ((twice > denominator) | ((twice == denominator) & (quotient % 2 == 1)))
+
+
+def _fits(minor, multiplier):
+    largest = int(np.abs(minor).max()) if np.size(minor) else 0
+    if np.ndim(multiplier):
+        multiplier = int(np.abs(multiplier).max()) if np.size(multiplier) else 0
+    return largest * abs(int(multiplier)) <= _INT64_MAX
+
+
+def scale(minor, numerator, denominator=1):
+    """Multiply minor units by ``numerator / denominator``, rounding half to even.
+
+    ``numerator`` and ``denominator`` may be integer arrays that broadcast
+    against ``minor``, one factor per amount.
+    """
+    minor = np.asarray(minor, dtype=np.int64)
+    if np.ndim(numerator) or np.ndim(denominator):
+        numerator, denominator = np.asarray(numerator, dtype=np.int64), np.asarray(denominator, dtype=np.int64)
+    else:
+        numerator, denominator = int(numerator), int(denominator)
+    if np.any(denominator <= 0):
+        raise ValueError(f"denominator must be positive, got {np.min(denominator)}")
+    if _fits(minor, numerator):
+        return _divide_half_even(minor * numerator, denominator)
+    exact = _divide_half_even(minor.astype(object) * numerator, np.asarray(denominator, dtype=object))
+    return np.asarray(exact, dtype=np.int64)
+
+
+def percent_ratios(percent):
+    """Exact ``(numerators, denominators)`` of ``1 + percent/100``, per entry of an array."""
+    percent = np.asarray(percent)
+    if percent.dtype.kind in "iu" or np.array_equal(percent, np.round(percent)):
+        return 100 + percent.astype(np.int64), np.full(percent.shape, 100, dtype=np.int64)
+    # One exact ratio per distinct percentage, gathered back per entry
+    distinct, inverse = np.unique(percent, return_inverse=True)
+    numerators, denominators = np.array([ratio(value.item()) for value in distinct], dtype=np.int64).reshape(-1, 2).T
+    inverse = inverse.reshape(percent.shape)
+    return (100 * denominators + numerators)[inverse], (100 * denominators)[inverse]
+
+
+def scale_percent(minor, percent):
+    """Apply a ``percent`` change (``-10`` cuts by 10%) to minor units.
+
+    ``percent`` may be an array with one change per amount.
+    """
+    if np.ndim(percent):
+        return scale(minor, *percent_ratios(percent))
+    numerator, denominator = ratio(percent)
+    return scale(minor, 100 * denominator + numerator, 100 * denominator)
+
+
+def multiply(amount, factor):
+    """``amount * factor`` in currency units, exact and rounded to minor units."""
+    return to_units(scale(to_minor(amount), *ratio(factor)))
+
+
+def _allocate_small(total, weights):
+    # allocate() in Python ints, for the few-share case (budget option splits)
+    if total < 0:
+        return [-share for share in _allocate_small(-total, weights)]
+    weight_total = sum(weights)
+    if weight_total <= 0:
+        if total:
+            raise ValueError("Cannot allocate a non-zero total over zero weights")
+        return [0] * len(weights)
+    quotients, remainders = zip(*(divmod(weight * total, weight_total) for weight in weights))
+    quotients = list(quotients)
+    # sorted() stays stable with reverse=True, so ties go to the earlier share
+    for i in sorted(range(len(weights)), key=remainders.__getitem__, reverse=True)[:total - sum(quotients)]:
+        quotients[i] += 1
+    return quotients
+
+
+def allocate(total, weights):
+    """Split ``total`` minor units in proportion to ``weights``.
+
+    Largest-remainder method: every share is first rounded down, then the
+    units left over go one each to the shares with the largest remainders
+    (ties to the earlier share). The shares sum to ``total`` exactly.
+    ``weights`` are non-negative integers (minor units or percentages).
+    """
+    total = int(total)
+    if len(weights) <= _SMALL:
+        return np.array(_allocate_small(total, [int(weight) for weight in weights]), dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.int64)
+    if total < 0:
+        return -allocate(-total, weights)
+    weight_total = int(weights.sum())
+    if weight_total <= 0:
+        if total:
+            raise ValueError("Cannot allocate a non-zero total over zero weights")
+        return np.zeros(len(weights), dtype=np.int64)
+
+    if _fits(weights, total):
+        quotient, remainder = np.divmod(weights * total, weight_total)
+    else:
+        product = weights.astype(object) * total
+        quotient, remainder = (product // weight_total).astype(np.int64), (product % weight_total).astype(np.int64)
+    leftover = total - int(quotient.sum())
+    if leftover:
+        # The leftover-th largest remainder, found in linear time; every share
+        # above it gets a unit, and the earliest shares equal to it the rest
+        threshold = np.partition(remainder, len(remainder) - leftover)[len(remainder) - leftover]
+        above = remainder > threshold
+        quotient[above] += 1
+        quotient[np.flatnonzero(remainder == threshold)[:leftover - int(above.sum())]] += 1
+    return quotient
+
+
+def allocate_rows(totals, weights):
+    """``allocate`` applied to each row: ``totals[i]`` split by ``weights[i]``.
+
+    ``totals`` is non-negative with one entry per row of the 2-D ``weights``;
+    returns an ``int64`` array shaped like ``weights``. Meant for a few
+    columns (the budget option splits), where sorting each row is cheap.
+    """
+    totals = np.asarray(totals, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.int64)
+    weight_totals = weights.sum(axis=1)
+    if np.any(totals < 0) or np.any((weight_totals <= 0) & (totals != 0)):
+        raise ValueError("Cannot allocate negative totals or non-zero totals over zero weights")
+    if not _fits(weights, totals):
+        return np.array([allocate(total, row) for total, row in zip(totals.tolist(), weights)],
+                        dtype=np.int64).reshape(weights.shape)
+    divisor = np.maximum(weight_totals, 1)[:, None]
+    product = weights * totals[:, None]
+    quotient, remainder = product // divisor, product % divisor
+    leftover = totals - quotient.sum(axis=1)
+    # Rank each row's remainders, largest first and ties to the earlier column
+    order = np.argsort(-remainder, axis=1, kind="stable")
+    extra = np.arange(weights.shape[1]) < leftover[:, None]
+    np.put_along_axis(quotient, order, np.take_along_axis(quotient, order, axis=1) + extra, axis=1)
+    return quotient
+
+
+def allocate_groups(totals, groups, weights):
+    """``allocate`` for many groups at once, over items in ragged groups.
+
+    Item ``j`` belongs to group ``groups[j]``; each group's ``totals`` entry
+    (non-negative) is split over its items' ``weights``, ties going to the
+    item that comes first. Returns one ``int64`` share per item, and every
+    group's shares sum to its total.
+    """
+    totals = np.asarray(totals, dtype=np.int64)
+    groups = np.asarray(groups, dtype=np.intp)
+    weights = np.asarray(weights, dtype=np.int64)
+    if not len(weights):
+        if np.any(totals != 0):
+            raise ValueError("Cannot allocate a non-zero total over zero weights")
+        return np.zeros(0, dtype=np.int64)
+    # Group sums of integer-valued floats are exact up to 2**53
+    weight_totals = np.bincount(groups, weights=weights, minlength=len(totals)).astype(np.int64)
+    if np.any(totals < 0) or np.any((weight_totals <= 0) & (totals != 0)):
+        raise ValueError("Cannot allocate negative totals or non-zero totals over zero weights")
+    item_totals = totals[groups]
+    divisor = np.maximum(weight_totals, 1)[groups]
+    if _fits(weights, totals):
+        product = weights * item_totals
+        quotient, remainder = product // divisor, product % divisor
+    else:
+        product = weights.astype(object) * item_totals
+        quotient, remainder = (product // divisor).astype(np.int64), (product % divisor).astype(np.int64)
+    leftover = totals - np.bincount(groups, weights=quotient, minlength=len(totals)).astype(np.int64)
+    if np.any(leftover):
+        # Within each group, the leftover units go to the largest remainders,
+        # ties to the earlier item: rank the items in (group, -remainder, item) order
+        order = np.lexsort((np.arange(len(weights)), -remainder, groups))
+        ranked_groups = groups[order]
+        rank = np.arange(len(order)) - np.searchsorted(ranked_groups, ranked_groups)
+        quotient[order[rank < leftover[ranked_groups]]] += 1
+    return quotient
+
+
+def allocate_counts(total, weights, counts):
+    """``allocate`` over ``counts[k]`` items of weight ``weights[k]`` each.
+
+    Returns the summed share of each weight's items: what ``allocate`` would
+    give ``np.repeat(weights, counts)``, summed back per weight, without
+    expanding the items. Items of equal weight have equal remainders, so the
+    leftover units go to whole runs of them in order.
+    """
+    total = int(total)
+    weights = np.asarray(weights, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+    if total < 0:
+        return -allocate_counts(-total, weights, counts)
+    weight_total = int(weights @ counts) if len(weights) else 0
+    if weight_total <= 0:
+        if total:
+            raise ValueError("Cannot allocate a non-zero total over zero weights")
+        return np.zeros(len(weights), dtype=np.int64)
+    if _fits(weights, total):
+        quotient, remainder = weights * total // weight_total, weights * total % weight_total
+    else:
+        product = weights.astype(object) * total
+        quotient, remainder = (product // weight_total).astype(np.int64), (product % weight_total).astype(np.int64)
+    shares = quotient * counts
+    leftover = total - int(shares.sum())
+    if leftover:
+        order = np.argsort(-remainder, kind="stable")
+        before = np.cumsum(counts[order]) - counts[order]
+        shares[order] += np.clip(leftover - before, 0, counts[order])
+    return shares
@@ -0,0 +1,236 @@
+"""Streaming spending monitor over incoming transactions.
+
+The dashboard compares whole months after the fact. ``SpendingMonitor``
+instead watches transactions as they arrive and says so as soon as a
+category runs hot ("you've already spent 80% of your Protein budget and
+it's the 12th"). It keeps a small running state per category (grocery
+Category or bill Type, as the importer classifies transactions):
+
+* month-to-date spend against the category's budget, the sum of its
+  adjusted line items (``category_budgets``);
+* a rolling mean and variance of the last ``window`` transaction amounts,
+  updated with Welford's algorithm (adding the new amount and removing the
+  one leaving the window), so no history is re-read.
+
+Each ``observe`` is O(1). It returns the alerts the transaction triggered:
+
+* ``share``: month-to-date spend crossed one of ``SHARE_THRESHOLDS`` of
+  the budget (only the highest threshold crossed is reported);
+* ``pace``: spend is running ``PACE_RATIO`` times ahead of the share of the
+  month that has passed;
+* ``anomaly``: the amount is more than ``Z_THRESHOLD`` standard deviations
+  above the rolling mean, once ``MIN_HISTORY`` amounts are in the window;
+* ``unbudgeted``: the first spend of the month in a category with no budget.
+
+Share, pace and unbudgeted alerts fire once per category and month.
+Transactions should arrive in roughly date order: the first transaction of
+a later month starts that month afresh, and late ones from an earlier month
+only update the rolling statistics.
+"""
+import calendar
+import math
+from collections import deque
+from datetime import date as Date
+
+SHARE_THRESHOLDS = (0.5, 0.8, 1.0)
+SHARE_LEVELS = ("Medium", "High", "Critical")
+PACE_RATIO = 1.5
+# Pace alerts wait until this share of the budget is spent
+PACE_MIN_SHARE = 0.25
+Z_THRESHOLD = 3.0
+MIN_HISTORY = 10
+DEFAULT_WINDOW = 100
+
+
+def category_budgets(groceries_df, bills_df):
+    """Monthly budget per category: adjusted grocery prices by Category and bill amounts by Type."""
+    budgets = {}
+    for categories, amounts in ((groceries_df["Category"], groceries_df["Price"]),
+                                (bills_df["Type"], bills_df["Amount"])):
+        for category, amount in zip(categories.astype(str).tolist(), amounts.tolist()):
+            budgets[category] = budgets.get(category, 0.0) + amount
+    return budgets
+
+
+def _ordinal(day):
+    suffix = "th" if 11 <= day % 100 <= 13 else {1: "st", 2: "nd", 3: "rd"}.get(day % 10, "th")
+    return f"{day}{suffix}"
+
+
+class CategoryState:
+    """Running figures for one category."""
+
+    __slots__ = ("month", "spent", "transactions", "next_threshold", "paced", "flagged",
+                 "window", "n", "mean", "m2")
+
+    def __init__(self, window):
+        self.month = None
+        self.spent = 0.0
+        self.transactions = 0
+        self.next_threshold = 0
+        self.paced = False
+        self.flagged = False
+        self.window = deque(maxlen=window)
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def start_month(self, month):
+        self.month = month
+        self.spent = 0.0
+        self.transactions = 0
+        self.next_threshold = 0
+        self.paced = False
+        self.flagged = False
+
+    def push(self, amount):
+        """Add ``amount`` to the rolling window (Welford, with removal)."""
+        if self.n == self.window.maxlen:
+            old = self.window[0]
+            if self.n == 1:
+                self.mean = self.m2 = 0.0
+            else:
+                mean = (self.n * self.mean - old) / (self.n - 1)
+                self.m2 -= (old - self.mean) * (old - mean)
+                self.mean = mean
+            self.n -= 1
+        self.window.append(amount)
+        self.n += 1
+        delta = amount - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (amount - self.mean)
+
+    @property
+    def variance(self):
+        return max(self.m2, 0.0) / (self.n - 1) if self.n > 1 else 0.0
+
+
+class SpendingMonitor:
+    """Per-category running state and alerts for one household."""
+
+    def __init__(self, budgets=None, window=DEFAULT_WINDOW, share_thresholds=SHARE_THRESHOLDS,
+                 pace_ratio=PACE_RATIO, pace_min_share=PACE_MIN_SHARE, z_threshold=Z_THRESHOLD,
+                 min_history=MIN_HISTORY):
+        self.budgets = dict(budgets or {})
+        self.window = window
+        self.share_thresholds = tuple(share_thresholds)
+        self.pace_ratio = pace_ratio
+        self.pace_min_share = pace_min_share
+        self.z_threshold = z_threshold
+        self.min_history = max(min_history, 2)
+        self.states = {}
+        self.events = 0
+        self._days = {}
+
+    def set_budgets(self, budgets):
+        """Replace the budgets, e.g. after the plan changed; running state is kept."""
+        self.budgets = dict(budgets)
+
+    def _month_days(self, month):
+        days = self._days.get(month)
+        if days is None:
+            days = self._days[month] = calendar.monthrange(int(month[:4]), int(month[5:7]))[1]
+        return days
+
+    def observe(self, date, category, amount):
+        """Record one transaction; returns the list of alerts it raised.
+
+        ``date`` is an ISO ``YYYY-MM-DD`` string or a ``date``.
+        """
+        if isinstance(date, Date):
+            date = date.isoformat()
+        month, day = date[:7], int(date[8:10])
+        amount = float(amount)
+        self.events += 1
+
+        state = self.states.get(category)
+        if state is None:
+            state = self.states[category] = CategoryState(self.window)
+        late = state.month is not None and month < state.month
+        if state.month is None or month > state.month:
+            state.start_month(month)
+        alerts = []
+
+        # Anomaly check against the window before this amount joins it
+        if state.n >= self.min_history:
+            variance = state.variance
+            if variance > 0:
+                z = (amount - state.mean) / math.sqrt(variance)
+                if z > self.z_threshold:
+                    alerts.append(self._alert(
+                        "anomaly", "Medium", date, category, state,
+                        f"Unusually large {category} payment: {amount:,.0f} UGX is {z:.1f} standard deviations "
+                        f"above the recent average of {state.mean:,.0f} UGX", amount=amount, z=z))
+        state.push(amount)
+        if late:
+            return alerts
+
+        state.spent += amount
+        state.transactions += 1
+
+        budget = self.budgets.get(category, 0.0)
+        if budget <= 0:
+            if not state.flagged:
+                state.flagged = True
+                alerts.append(self._alert(
+                    "unbudgeted", "Medium", date, category, state,
+                    f"{category} has no budget, but {state.spent:,.0f} UGX has been spent on it this month"))
+            return alerts
+
+        share = state.spent / budget
+        thresholds = self.share_thresholds
+        crossed = state.next_threshold
+        while crossed < len(thresholds) and share >= thresholds[crossed]:
+            crossed += 1
+        if crossed > state.next_threshold:
+            state.next_threshold = crossed
+            threshold = thresholds[crossed - 1]
+            when = f"it's the {_ordinal(day)}"
+            if threshold >= 1:
+                message = (f"You've spent your whole {category} budget ({share:.0%} of {budget:,.0f} UGX) "
+                           f"and {when}")
+            else:
+                message = f"You've already spent {threshold:.0%} of your {category} budget and {when}"
+            alerts.append(self._alert("share", SHARE_LEVELS[min(crossed, len(SHARE_LEVELS)) - 1], date,
+                                      category, state, message, threshold=threshold))
+
+        if not state.paced and share >= self.pace_min_share:
+            elapsed = day / self._month_days(month)
+            if share > self.pace_ratio * elapsed:
+                state.paced = True
+                alerts.append(self._alert(
+                    "pace", "High", date, category, state,
+                    f"{category} spending is ahead of pace: {share:.0%} of the budget spent by the "
+                    f"{_ordinal(day)}, on course for {share / elapsed:.0%} by month end"))
+        return alerts
+
+    def _alert(self, kind, level, date, category, state, message, **details):
+        budget = self.budgets.get(category, 0.0)
+        return dict(kind=kind, level=level, date=date, category=category, spent=state.spent, budget=budget,
+                    message=message, **details)
+
+    def observe_many(self, dates, categories, amounts):
+        """Feed parallel sequences of transactions; returns all alerts raised."""
+        alerts = []
+        for date, category, amount in zip(dates, categories, amounts):
+            raised = self.observe(date, category, amount)
+            if raised:
+                alerts.extend(raised)
+        return alerts
+
+    def snapshot(self):
+        """Current figures per category: month, spend, budget, remaining and rolling stats."""
+        rows = {}
+        for category, state in self.states.items():
+            budget = self.budgets.get(category, 0.0)
+            rows[category] = {
+                "month": state.month,
+                "spent": state.spent,
+                "transactions": state.transactions,
+                "budget": budget,
+                "remaining": budget - state.spent,
+                "share": state.spent / budget if budget > 0 else None,
+                "mean": state.mean,
+                "std": math.sqrt(state.variance),
+            }
+        return rows
@@ -0,0 +1,397 @@
+"""Sharded, restartable batch run of the budget pipeline for many households.
+
+The nightly job recomputes every household's budget, adjustment plan and
+savings projection::
+
+    python -m finance_engine.nightly households.jsonl out/ --workers 8
+    python -m finance_engine.nightly households.jsonl out/ --ledger ledger.db --month 2026-01
+
+The input holds one household per line, with the ``finance_engine.cli``
+fields plus ``household`` (an id) and ``current_savings``. Line items come
+from the built-in catalog, or from ``--ledger`` for ``--month``; inline
+``groceries``/``bills`` are not read here (use the cli for those).
+
+The input is split into shards of ``--shard-size`` lines, found by one scan
+for their byte offsets, so workers seek straight to their lines. Each
+worker process evaluates a whole shard at once: the shard's line items go
+through ``batch.run_batch`` (which matches the stages to the minor unit),
+the recommendation rules through ``rules.evaluate_batch`` and the savings
+projection through ``projection.final_balance_percentiles``, all as array
+operations over the shard. Only ``--planner optimize``, whose cut plan is
+per item, runs ``run_pipeline`` per household. Each worker keeps its own
+catalog template and ledger connection and writes one ``shard-NNNNN.npz``
+of result columns, named in ``COLUMNS``. The parent is the only writer of
+``manifest.json`` and replaces it atomically as shards finish, so a run
+that crashes or is killed picks up where it stopped: a restart skips
+shards the manifest lists as done and retries failed ones.
+
+Workers share nothing but the input file, so throughput should grow with
+the worker count up to the number of cores; ``benchmarks.nightly_scaling``
+measures it on a given machine.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+DEFAULT_SHARD_SIZE = 1000
+DEFAULT_PROJECTION_MONTHS = 12
+DEFAULT_PROJECTION_PATHS = 1000
+MANIFEST = "manifest.json"
+OPTIONS = ("Option 1", "Option 2")
+PLAN_COLUMNS = ("overspend", "discretionary_reduction", "flexible_essential_reduction", "residual_overspend")
+TOTAL_COLUMNS = ("total_groceries", "total_bills", "total_fixed_expenses", "disposable_income")
+COLUMNS = (
+    ("household", str),
+    ("monthly_income", np.float64),
+    ("savings_goal", np.float64),
+    *((name, np.float64) for name in TOTAL_COLUMNS),
+    *((name, np.float64) for name in PLAN_COLUMNS),
+    *((f"option{n}_{part}", np.float64) for n in (1, 2) for part in ("savings", "investments", "discretionary")),
+    *((f"option{n}_feasible", bool) for n in (1, 2)),
+    ("recommendations", np.int32),
+    ("critical_recommendations", np.int32),
+    ("projection_p10", np.float64),
+    ("projection_p50", np.float64),
+    ("projection_p90", np.float64),
+)
+
+# Per-process state, set up by ``_init_worker``
+_worker = {}
+
+
+def plan_shards(path, shard_size=DEFAULT_SHARD_SIZE):
+    """Split the non-blank lines of ``path`` into shards.
+
+    Returns a list of ``{"shard", "offset", "rows", "first_row"}`` dicts;
+    ``offset`` is the byte offset of the shard's first line.
+    """
+    shards = []
+    rows = 0
+    offset = 0
+    with open(path, "rb") as handle:
+        for line in handle:
+            if line.strip():
+                if rows % shard_size == 0:
+                    shards.append({"shard": len(shards), "offset": offset, "rows": 0, "first_row": rows})
+                shards[-1]["rows"] += 1
+                rows += 1
+            offset += len(line)
+    return shards
+
+
+def _read_shard(path, shard):
+    households = []
+    with open(path, "rb") as handle:
+        handle.seek(shard["offset"])
+        for line in handle:
+            if line.strip():
+                households.append(json.loads(line))
+                if len(households) == shard["rows"]:
+                    break
+    return households
+
+
+def _init_worker(settings):
+    _worker.clear()
+    _worker.update(settings)
+    if settings["ledger"]:
+        from finance_engine.ledger import LedgerStore
+
+        _worker["store"] = LedgerStore(settings["ledger"])
+
+
+def _evaluate(household, row, settings):
+    from finance_engine.catalog import AS_NEEDED_ITEMS
+    from finance_engine.cli import DEFAULTS
+    from finance_engine.pipeline import run_pipeline
+    from finance_engine.projection import simulate_savings
+
+    params = dict(DEFAULTS, **household)
+    household_id = str(params.get("household", f"row-{row}"))
+    monthly_income = float(params["monthly_income"])
+    results = run_pipeline(
+        monthly_income, params["savings_goal"], params["risk_appetite"], params["essential_cut"],
+        params["discretionary_cut"], ledger=_worker.get("store"), household=household_id,
+        month=settings["month"], views=False, planner=settings["planner"])
+
+    plan = results["adjustment_plan"] or {}
+    options = results["budget_options"]
+    totals = results["totals"]
+    groceries_df = results["groceries"]
+    balances = simulate_savings(
+        float(params.get("current_savings", 0)), options[settings["option"]]["Savings"], monthly_income,
+        totals["total_fixed_expenses"], months=settings["months"], paths=settings["paths"],
+        as_needed_amounts=groceries_df.loc[groceries_df["Item"].isin(AS_NEEDED_ITEMS), "Price"].tolist())
+    p10, p50, p90 = np.percentile(balances[:, -1], (10, 50, 90))
+
+    record = {"household": household_id, "monthly_income": monthly_income,
+              "savings_goal": float(params["savings_goal"])}
+    record.update((name, totals[name]) for name in TOTAL_COLUMNS)
+    record.update((name, plan.get(name, 0.0)) for name in PLAN_COLUMNS)
+    for n, option in enumerate(OPTIONS, 1):
+        for part in ("savings", "investments", "discretionary", "feasible"):
+            record[f"option{n}_{part}"] = options[option][part.capitalize()]
+    recommendations = results["recommendations"]
+    record.update(recommendations=len(recommendations),
+                  critical_recommendations=sum(level == "Critical" for level, _ in recommendations),
+                  projection_p10=p10, projection_p50=p50, projection_p90=p90)
+    return record
+
+
+def _catalog_items(income):
+    """The catalog's line items for every household, with the tithe set per income."""
+    from finance_engine import money
+    from finance_engine.batch import KINDS, encode, line_items_from_frames
+    from finance_engine.catalog import TITHE_RATE, load_data
+    from finance_engine.taxonomy import FLEXIBILITIES, PRIORITIES
+
+    template = _worker.get("catalog")
+    if template is None:
+        items = line_items_from_frames(*load_data(0))
+        template = _worker["catalog"] = dict(
+            items, kind=encode(items["kind"], KINDS), priority=encode(items["priority"], PRIORITIES),
+            flexibility=encode(items["flexibility"], FLEXIBILITIES),
+            tithe=(items["kind"] == "bill") & (items["description"] == "Tithe"))
+    n, k = len(income), len(template["amount"])
+    amount = np.tile(template["amount"], (n, 1))
+    amount[:, template["tithe"]] = money.multiply(income, TITHE_RATE)[:, None]
+    line_items = {name: np.tile(template[name], n)
+                  for name in ("kind", "description", "priority", "flexibility", "category")}
+    line_items.update(household=np.repeat(np.arange(n), k), amount=amount.ravel())
+    return line_items
+
+
+def _ledger_items(household_ids, income, settings):
+    from finance_engine.batch import line_items_from_frames
+
+    store = _worker["store"]
+    parts = [line_items_from_frames(*store.load_month(household_id, settings["month"], monthly_income),
+                                    household=i)
+             for i, (household_id, monthly_income) in enumerate(zip(household_ids, income.tolist()))]
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def _as_needed(line_items, adjusted, n):
+    """Each household's adjusted as-needed amounts, grouped by how many it has.
+
+    Yields ``(households, amounts)`` with ``amounts`` of shape
+    ``(len(households), items)``; line items are in household order.
+    """
+    from finance_engine.batch import KINDS, encode
+    from finance_engine.catalog import AS_NEEDED_ITEMS
+
+    as_needed = ((encode(line_items["kind"], KINDS) == KINDS.index("grocery"))
+                 & np.isin(line_items["description"], AS_NEEDED_ITEMS))
+    owners = line_items["household"][as_needed]
+    amounts = adjusted[as_needed]
+    counts = np.bincount(owners, minlength=n)
+    for count in np.unique(counts).tolist():
+        households = np.flatnonzero(counts == count)
+        yield households, amounts[np.isin(owners, households)].reshape(len(households), count)
+
+
+def _evaluate_shard(households, first_row, settings):
+    """Result columns for a shard, from one ``run_batch`` over its line items."""
+    from finance_engine.batch import run_batch
+    from finance_engine.cli import DEFAULTS
+    from finance_engine.projection import final_balance_percentiles
+    from finance_engine.rules import RULES, batch_inputs, evaluate_batch
+
+    params = [dict(DEFAULTS, **household) for household in households]
+    n = len(params)
+    household_ids = [str(p.get("household", f"row-{first_row + i}")) for i, p in enumerate(params)]
+    income = np.array([float(p["monthly_income"]) for p in params])
+    table = {
+        "household": np.arange(n),
+        "monthly_income": income,
+        "savings_goal": np.array([float(p["savings_goal"]) for p in params]),
+        "risk_appetite": [p["risk_appetite"] for p in params],
+        "essential_cut": np.array([float(p["essential_cut"]) for p in params]),
+        "discretionary_cut": np.array([float(p["discretionary_cut"]) for p in params]),
+    }
+    line_items = _ledger_items(household_ids, income, settings) if settings["ledger"] else _catalog_items(income)
+    result = run_batch(table, line_items)
+    columns = result["households"]
+
+    fired = evaluate_batch(batch_inputs(table, line_items, result))
+    option = f"option{OPTIONS.index(settings['option']) + 1}"
+    current = np.array([float(p.get("current_savings", 0)) for p in params])
+    projection = np.empty((3, n))
+    for members, amounts in _as_needed(line_items, result["items"]["adjusted_amount"], n):
+        projection[:, members] = final_balance_percentiles(
+            current[members], columns[f"{option}_savings"][members], income[members],
+            columns["total_fixed_expenses"][members], amounts, months=settings["months"], paths=settings["paths"])
+
+    record = {"household": household_ids, "monthly_income": income, "savings_goal": table["savings_goal"]}
+    record.update((name, columns[name]) for name in TOTAL_COLUMNS)
+    # Households that needed no adjustment have 0 in every plan column
+    record.update((name, np.where(columns["adjusted"], columns[name], 0.0)) for name in PLAN_COLUMNS)
+    record.update((f"option{number}_{part}", columns[f"option{number}_{part}"])
+                  for number in (1, 2) for part in ("savings", "investments", "discretionary", "feasible"))
+    record.update(
+        recommendations=sum(fired.values()),
+        critical_recommendations=sum(fired[name] for name, r in RULES.items() if r.level == "Critical"),
+        projection_p10=projection[0], projection_p50=projection[1], projection_p90=projection[2])
+    return record
+
+
+def _write_columns(path, columns):
+    columns = {name: np.asarray(columns[name], dtype=dtype) for name, dtype in COLUMNS}
+    # np.savez appends .npz to names without it, so the temporary name keeps the suffix
+    temporary = path[:-len(".npz")] + ".tmp.npz"
+    np.savez(temporary, **columns)
+    os.replace(temporary, path)
+
+
+def run_shard(input_path, shard, output_dir):
+    """Evaluate one shard in a worker and write its column file."""
+    settings = _worker
+    started = time.perf_counter()
+    households = _read_shard(input_path, shard)
+    if settings["planner"] == "tiers":
+        columns = _evaluate_shard(households, shard["first_row"], settings)
+    else:
+        # The minimum-pain plan is solved per item, through the full pipeline
+        records = [_evaluate(household, shard["first_row"] + i, settings) for i, household in enumerate(households)]
+        columns = {name: [record[name] for record in records] for name, _ in COLUMNS}
+    computed = time.perf_counter()
+    name = f"shard-{shard['shard']:05d}.npz"
+    _write_columns(os.path.join(output_dir, name), columns)
+    return {"shard": shard["shard"], "file": name, "rows": len(households), "pid": os.getpid(),
+            "seconds": time.perf_counter() - started, "write_seconds": time.perf_counter() - computed}
+
+
+def _fingerprint(input_path, shard_size, settings):
+    stat = os.stat(input_path)
+    return {"input": os.path.abspath(input_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+            "shard_size": shard_size, **{k: v for k, v in settings.items() if k != "store"}}
+
+
+def load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST)) as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+
+
+def _write_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST)
+    with open(path + ".tmp", "w") as handle:
+        json.dump(manifest, handle, indent=1)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(path + ".tmp", path)
+
+
+def run(input_path, output_dir, workers=None, shard_size=DEFAULT_SHARD_SIZE, ledger=None, month=None,
+        planner="tiers", option="Option 1", months=DEFAULT_PROJECTION_MONTHS, paths=DEFAULT_PROJECTION_PATHS):
+    """Process every shard of ``input_path`` not yet done in ``output_dir``.
+
+    Returns a report with the run's throughput and, per worker process, the
+    shards and households it did, its busy seconds and households/second.
+    A manifest from a different input or settings raises ``ValueError``
+    rather than mixing two runs in one directory.
+    """
+    if ledger and not month:
+        raise ValueError("--ledger needs --month")
+    if option not in OPTIONS:
+        raise ValueError(f"Unknown option {option!r}; expected one of {list(OPTIONS)!r}")
+    settings = {"ledger": ledger and os.path.abspath(ledger), "month": month, "planner": planner,
+                "option": option, "months": months, "paths": paths}
+    os.makedirs(output_dir, exist_ok=True)
+    fingerprint = _fingerprint(input_path, shard_size, settings)
+
+    manifest = load_manifest(output_dir)
+    if manifest is None:
+        manifest = {"run": fingerprint, "shards": {}}
+    elif manifest["run"] != fingerprint:
+        raise ValueError(f"{output_dir} holds a run of different input or settings; use a new directory")
+
+    shards = plan_shards(input_path, shard_size)
+    done = {int(key) for key, entry in manifest["shards"].items()
+            if entry.get("status") == "done" and os.path.exists(os.path.join(output_dir, entry["file"]))}
+    pending = [shard for shard in shards if shard["shard"] not in done]
+    manifest["total_shards"] = len(shards)
+    _write_manifest(output_dir, manifest)
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pending) or 1))
+    per_worker = {}
+    failed = 0
+    started = time.perf_counter()
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(settings,)) as pool:
+            futures = {pool.submit(run_shard, input_path, shard, output_dir): shard for shard in pending}
+            for future in as_completed(futures):
+                shard = futures[future]
+                try:
+                    entry = dict(future.result(), status="done")
+                except Exception as exc:
+                    failed += 1
+                    entry = {"status": "failed", "rows": shard["rows"], "error": f"{type(exc).__name__}: {exc}"}
+                else:
+                    stats = per_worker.setdefault(entry["pid"], {"shards": 0, "households": 0, "seconds": 0.0})
+                    stats["shards"] += 1
+                    stats["households"] += entry["rows"]
+                    stats["seconds"] += entry["seconds"]
+                manifest["shards"][str(shard["shard"])] = entry
+                _write_manifest(output_dir, manifest)
+    elapsed = time.perf_counter() - started
+
+    processed = sum(stats["households"] for stats in per_worker.values())
+    for stats in per_worker.values():
+        stats["households_per_second"] = stats["households"] / stats["seconds"] if stats["seconds"] else 0.0
+    return {
+        "shards": len(shards),
+        "skipped": len(done),
+        "processed": len(pending) - failed,
+        "failed": failed,
+        "households": processed,
+        "workers": workers,
+        "seconds": elapsed,
+        "households_per_second": processed / elapsed if elapsed else 0.0,
+        "per_worker": {str(pid): stats for pid, stats in sorted(per_worker.items())},
+    }
+
+
+def load_results(output_dir):
+    """Concatenate the finished shards' columns in input order."""
+    manifest = load_manifest(output_dir) or {"shards": {}}
+    files = [entry["file"] for _, entry in sorted(manifest["shards"].items(), key=lambda item: int(item[0]))
+             if entry.get("status") == "done"]
+    parts = [np.load(os.path.join(output_dir, name)) for name in files]
+    return {name: np.concatenate([part[name] for part in parts]) if parts else np.zeros(0, dtype=dtype)
+            for name, dtype in COLUMNS}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the budget pipeline for every household in a JSONL file.")
+    parser.add_argument("input", help="JSON lines, one household per line")
+    parser.add_argument("output", help="directory for shard column files and the manifest")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument("--ledger", help="LedgerStore database to read line items from")
+    parser.add_argument("--month", help="ledger month (YYYY-MM)")
+    parser.add_argument("--planner", choices=("tiers", "optimize"), default="tiers")
+    parser.add_argument("--option", choices=OPTIONS, default="Option 1", help="budget option to project")
+    parser.add_argument("--months", type=int, default=DEFAULT_PROJECTION_MONTHS, help="projection horizon")
+    parser.add_argument("--paths", type=int, default=DEFAULT_PROJECTION_PATHS, help="simulated projection paths")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run(args.input, args.output, args.workers, args.shard_size, args.ledger, args.month,
+                     args.planner, args.option, args.months, args.paths)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    json.dump(report, sys.stdout, indent=1)
+    sys.stdout.write("\n")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Tiered overspend solver.
+
+``auto_adjust_spending`` scales spending down in two tiers: discretionary
+items first, then flexible essentials (Essential priority with Medium or High
+flexibility, at most 50%). Both reduction factors follow from the tier totals,
+so they are solved in closed form over one array of amounts and two boolean
+tier masks instead of by filtering, scaling and re-summing frames per tier.
+"""
+import numpy as np
+
+from finance_engine import money
+
+MAX_ESSENTIAL_REDUCTION = 0.5
+_CAP_NUMERATOR, _CAP_DENOMINATOR = money.ratio(MAX_ESSENTIAL_REDUCTION)
+
+
+def solve_overspend(amounts, discretionary, flexible_essential, monthly_income):
+    """Reduce ``amounts`` until they fit ``monthly_income``.
+
+    ``amounts`` and ``monthly_income`` are in ``int64`` minor units (see
+    ``finance_engine.money``); ``discretionary`` and ``flexible_essential``
+    are boolean masks over ``amounts``. Returns ``(adjusted_amounts, plan)``
+    where ``plan`` is ``None`` when no adjustment was needed, otherwise a dict
+    with the ``overspend``, the ``discretionary_reduction`` and
+    ``flexible_essential_reduction`` factors (0 when a tier was not used) and
+    the ``residual_overspend`` left after both tiers, in currency units.
+
+    Each tier's reduction is shared out over its items by largest remainder,
+    so an uncapped reduction absorbs the overspend to the unit.
+    """
+    amounts = np.asarray(amounts, dtype=np.int64)
+    overspend = int(amounts.sum()) - int(monthly_income)
+    if overspend <= 0:
+        return amounts, None
+
+    discretionary_items = np.flatnonzero(discretionary)
+    flexible_items = np.flatnonzero(flexible_essential)
+    discretionary_amounts = amounts[discretionary_items]
+    flexible_amounts = amounts[flexible_items]
+    total_discretionary = int(discretionary_amounts.sum())
+    total_flexible = int(flexible_amounts.sum())
+    adjusted = amounts.copy()
+
+    # The discretionary tier only applies when it can absorb the whole overspend
+    if 0 < overspend < total_discretionary:
+        adjusted[discretionary_items] -= money.allocate(overspend, discretionary_amounts)
+        discretionary_reduction = overspend / total_discretionary
+        remaining = 0
+    else:
+        discretionary_reduction = 0.0
+        remaining = overspend
+
+    flexible_reduction = 0.0
+    flexible_cut = 0
+    if remaining > 0 and total_flexible > 0:
+        # Never more than the cap, rounded down to whole minor units
+        flexible_cut = min(remaining, total_flexible * _CAP_NUMERATOR // _CAP_DENOMINATOR)
+        adjusted[flexible_items] -= money.allocate(flexible_cut, flexible_amounts)
+        flexible_reduction = min(MAX_ESSENTIAL_REDUCTION, remaining / total_flexible)
+
+    plan = {
+        "overspend": float(money.to_units(overspend)),
+        "discretionary_reduction": discretionary_reduction,
+        "flexible_essential_reduction": flexible_reduction,
+        "residual_overspend": float(money.to_units(remaining - flexible_cut)),
+    }
+    return adjusted, plan
+
+
+def describe_adjustment_plan(plan):
+    """Render a solver plan as the dashboard's adjustment messages."""
+    if not plan:
+        return []
+    messages = []
+    if plan["discretionary_reduction"] > 0:
+        messages.append(f"Reduced discretionary spending by {plan['discretionary_reduction']*100:.0f}%")
+    if plan["flexible_essential_reduction"] > 0:
+        messages.append(f"Reduced flexible essential spending by {plan['flexible_essential_reduction']*100:.0f}%")
+    if plan["residual_overspend"] > 0:
+        messages.append(f"Unable to fully balance budget. Still overspending by {plan['residual_overspend']:,.0f} UGX. Consider increasing income.")
+    return messages
@@ -0,0 +1,169 @@
+"""Server-side sorting and pagination for large dashboard tables.
+
+Styling a whole table with a pandas ``Styler`` formats and colours every cell
+in Python and ships all of it to the browser, which stalls past a few
+thousand rows. A ``PagedTable`` does that work once per data version
+instead: amounts and percentages become display strings in whole-column
+numpy operations, the highlight flags are a boolean array, and each sort
+order is an ``argsort`` computed the first time it is asked for. A request
+then only filters a precomputed order by the row mask, slices one page and
+takes those rows, so the cost of a rerun grows with the page size rather
+than the ledger.
+"""
+import numpy as np
+import pandas as pd
+
+DEFAULT_PAGE_SIZE = 50
+PAGE_SIZES = (25, 50, 100, 250)
+
+
+def _group_thousands(digits):
+    """Insert thousands separators into an ``S`` array of unsigned integers.
+
+    The digits are viewed as a byte matrix (one left-aligned row per value).
+    Values with the same number of digits share one column mapping into the
+    wider grouped rows, so each digit count is a single fancy-indexed copy;
+    numpy drops the NUL padding when the rows are viewed as strings again.
+    """
+    size = digits.itemsize
+    width = size + (size - 1) // 3
+    source = np.ascontiguousarray(digits).view(np.uint8).reshape(len(digits), size)
+    n_digits = (source != 0).sum(axis=1)
+    # Two extra source columns to gather from: a comma and the NUL padding
+    source = np.hstack([source, np.full((len(digits), 1), ord(","), dtype=np.uint8),
+                        np.zeros((len(digits), 1), dtype=np.uint8)])
+
+    grouped = np.empty((len(digits), width), dtype=np.uint8)
+    for n in np.flatnonzero(np.bincount(n_digits)):
+        columns = []
+        for position in range(n):
+            if position and (n - position) % 3 == 0:
+                columns.append(size)
+            columns.append(position)
+        columns += [size + 1] * (width - len(columns))
+        rows = n_digits == n
+        grouped[rows] = source[rows][:, columns]
+    return grouped.view(f"S{width}").ravel()
+
+
+def _format_numbers(values, decimals=0, thousands=False, suffix=""):
+    """Format ``values`` exactly as ``format`` with ``.<decimals>f`` would, in whole-array string operations.
+
+    ``thousands`` adds the ``,`` option.
+
+    ``np.rint`` of the scaled value rounds the same way as ``format`` except
+    near a tie, where the scaling itself rounded (``0.05 * 10`` is exactly
+    ``0.5``, while ``0.05`` is slightly above it), and past 2**53. The few
+    values within one unit in the last place of a tie are formatted by
+    Python instead. Negative values keep their sign when they round to zero,
+    as in ``format`` (``-0.04`` gives ``"-0.0"``). Non-finite values come
+    out blank.
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    if not len(values):
+        return np.zeros(0, dtype=str)
+    finite = np.isfinite(values)
+    raw = np.where(finite, values, 0.0) * 10 ** decimals
+    scaled = np.rint(raw)
+    exact = np.abs(np.abs(raw - scaled) - 0.5) > np.spacing(np.abs(raw))
+    magnitude = np.abs(np.where(exact, scaled, 0.0)).astype(np.int64)
+
+    text = (magnitude // 10 ** decimals).astype("S19")
+    if thousands:
+        text = _group_thousands(text)
+    if decimals:
+        fraction = np.char.zfill((magnitude % 10 ** decimals).astype(f"S{decimals}"), decimals)
+        text = np.char.add(np.char.add(text, b"."), fraction)
+    text = np.char.add(np.char.add(np.where(np.signbit(values), b"-", b""), text), suffix.encode("ascii"))
+    text = np.where(finite, text, b"").astype(str)
+
+    inexact = np.flatnonzero(finite & ~exact)
+    if len(inexact):
+        spec = f"{',' if thousands else ''}.{decimals}f"
+        fallback = np.array([f"{value:{spec}}{suffix}" for value in values[inexact]])
+        text = text.astype(np.result_type(text, fallback))
+        text[inexact] = fallback
+    return text
+
+
+def format_amounts(values, suffix=" UGX"):
+    """Format ``values`` like ``"{:,.0f} UGX"``, as a numpy string array."""
+    return _format_numbers(values, thousands=True, suffix=suffix)
+
+
+def format_percentages(values, digits=1):
+    """Format ``values`` like ``"{:.1f}%"``, as a numpy string array; non-finite values are blank."""
+    return _format_numbers(values, decimals=digits, suffix="%")
+
+
+class PagedTable:
+    """Pre-formatted ``display`` rows served one sorted page at a time.
+
+    ``sort_keys`` maps a sort name to the key arrays for ``np.lexsort``
+    (primary key last), and ``highlight`` flags the rows to colour.
+    """
+
+    def __init__(self, display, sort_keys, highlight):
+        self.display = display.reset_index(drop=True)
+        self.size = len(display)
+        self.sort_keys = sort_keys
+        self.highlight = np.asarray(highlight, dtype=bool)
+        self._orders = {}
+
+    def order(self, sort_by, descending=False):
+        """Row positions in ``sort_by`` order, computed once per sort."""
+        order = self._orders.get(sort_by)
+        if order is None:
+            order = self._orders[sort_by] = np.lexsort(self.sort_keys[sort_by])
+        return order[::-1] if descending else order
+
+    def page(self, mask=None, sort_by=None, descending=False, page=1, page_size=DEFAULT_PAGE_SIZE):
+        """Return one page of the rows selected by the boolean ``mask``.
+
+        ``page`` is 1-based and clamped to the available pages. Returns a dict
+        with the page's ``rows`` and ``highlight`` flags, the ``total``
+        number of matching rows, and the clamped ``page`` and ``pages``.
+        """
+        order = self.order(sort_by or next(iter(self.sort_keys)), descending)
+        if mask is not None:
+            order = order[np.asarray(mask, dtype=bool)[order]]
+        total = len(order)
+        pages = max(1, -(-total // page_size))
+        page = min(max(int(page), 1), pages)
+        visible = order[(page - 1) * page_size:page * page_size]
+        return {
+            "rows": self.display.take(visible),
+            "highlight": self.highlight[visible],
+            "total": total,
+            "page": page,
+            "pages": pages,
+        }
+
+
+def adjustment_pages(detailed_adjustments):
+    """Page the item-level adjustments, row-aligned with ``adjustment_index``.
+
+    The default sort is by priority, then largest reduction first, as the
+    dashboard table used to sort.
+    """
+    frame = detailed_adjustments.reset_index(drop=True)
+    adjustment = frame["Adjustment"].to_numpy(dtype=np.float64)
+    priority = frame["Priority"].cat.codes.to_numpy()
+    description = frame["Description"].to_numpy(dtype=object)
+    display = pd.DataFrame({
+        "Description": description,
+        "Priority": frame["Priority"],
+        "Original Amount": format_amounts(frame["Original Price"]),
+        "Adjusted Amount": format_amounts(frame["Price"]),
+        "Amount Saved": format_amounts(adjustment),
+        "% Change": format_percentages(frame["% Change"]),
+    })
+    sort_keys = {
+        "Priority": (adjustment, priority),
+        "Description": (description.astype(str),),
+        "Original Amount": (frame["Original Price"].to_numpy(),),
+        "Adjusted Amount": (frame["Price"].to_numpy(),),
+        "Amount Saved": (adjustment,),
+        "% Change": (np.nan_to_num(frame["% Change"].to_numpy(dtype=np.float64), nan=0.0),),
+    }
+    return PagedTable(display, sort_keys, adjustment < 0)
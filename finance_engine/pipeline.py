@@ -0,0 +1,252 @@
+"""Staged, memoized budget pipeline.
+
+The dashboard inputs fan out into a small dependency graph::
+
+    load_data(income) -> apply_spending_cuts(cuts) -> auto_adjust_spending(income)
+        -> totals, adjustment summary, expense breakdown
+        -> generate_budget_options(goal, risk) -> recommendations, budget data
+        -> filter indexes for the expense and adjustment tables, paged adjustment table
+
+Each node's key is a hash of its own scalar inputs and its parents' keys, so a
+widget change only recomputes the nodes downstream of it. Moving the risk
+slider, for example, reuses the cut and adjusted frames and only rebuilds the
+budget options and what reads them.
+"""
+from finance_engine import stages
+from finance_engine.aggregates import RunningAggregates, edit_frames
+from finance_engine.catalog import load_data
+from finance_engine.filter_index import adjustment_index, expense_index
+from finance_engine.goalseek import savings_path
+from finance_engine.memo import StageCache, stage_key
+from finance_engine.paging import adjustment_pages
+from finance_engine.planner import goal_first_options, optimize_spending
+from finance_engine.sweep import sweep
+from finance_engine.trace import NULL_TRACER
+
+default_cache = StageCache(maxsize=256)
+
+
+def _adjust(groceries_df, bills_df, monthly_income):
+    groceries_df, bills_df, adjustment_plan = stages.auto_adjust_spending(groceries_df, bills_df, monthly_income)
+    return {
+        "groceries": groceries_df,
+        "bills": bills_df,
+        "adjustment_plan": adjustment_plan,
+        "overspend": adjustment_plan["overspend"] if adjustment_plan else 0.0,
+        "totals": stages.compute_totals(groceries_df, bills_df, monthly_income),
+    }
+
+
+def _optimize(groceries_df, bills_df, monthly_income, savings_goal):
+    groceries_df, bills_df, cut_plan = optimize_spending(groceries_df, bills_df, monthly_income, savings_goal)
+    return {
+        "groceries": groceries_df,
+        "bills": bills_df,
+        "adjustment_plan": None,
+        "cut_plan": cut_plan,
+        "overspend": cut_plan["overspend"] if cut_plan else 0.0,
+        "totals": stages.compute_totals(groceries_df, bills_df, monthly_income),
+    }
+
+
+def _cached(cache, tracer, name, key, compute, rows=None):
+    """``cache.get_or_compute`` inside a tracing span named after the stage."""
+    with tracer.span(name) as span:
+        hits = cache.hits
+        value = cache.get_or_compute(key, compute)
+        span.cached = cache.hits > hits
+        if rows is not None:
+            span.rows = rows(value)
+    return value
+
+
+def _frame_rows(frames):
+    return sum(len(frame) for frame in frames)
+
+
+def run_pipeline(monthly_income, savings_goal, risk_appetite, essential_cut, discretionary_cut, cache=None,
+                 ledger=None, household=None, month=None, tracer=NULL_TRACER, edits=None, views=True,
+                 planner="tiers", recommender=None):
+    """Run every stage for one household, reusing cached stage results.
+
+    Line items come from the built-in catalog, or from ``ledger`` (a
+    ``LedgerStore``) for ``household`` and ``month`` when one is given. The
+    ledger slice's revision is part of the key, so edits reload it. Each
+    stage runs in a ``tracer`` span that records whether it was cached.
+
+    ``edits`` holds ``st.data_editor`` change sets per kind
+    (``{"grocery": state, "bill": state}``) made on the loaded frames. The
+    edited frames feed every stage below, and the ``live`` entry of the
+    result comes from running aggregates that apply the same edits as row
+    deltas (see ``finance_engine.aggregates`` for what that does and does
+    not save).
+
+    With ``views=False`` only the budget itself is computed (adjusted
+    frames, totals, options and recommendations), skipping the dashboard's
+    charts, tables and filter indexes.
+
+    ``planner="optimize"`` replaces the tiered auto-adjustment with the
+    minimum-pain cut plan that meets ``savings_goal`` and the fixed option
+    splits with goal-first options (see ``finance_engine.planner``).
+
+    ``recommender`` is a ``finance_engine.rules.RecommendationEngine`` kept
+    across one household's reruns; given one, recommendations re-evaluate
+    only the rules whose inputs changed instead of coming from the cache.
+    """
+    cache = default_cache if cache is None else cache
+
+    if ledger is None:
+        data_key = stage_key("load_data", monthly_income)
+        groceries_df, bills_df = _cached(
+            cache, tracer, "load_data", data_key, lambda: load_data(monthly_income), _frame_rows)
+    else:
+        data_key = stage_key("load_month", ledger.path, household, month, ledger.revision(household, month),
+                             monthly_income)
+        groceries_df, bills_df = _cached(
+            cache, tracer, "load_data", data_key,
+            lambda: ledger.load_month(household, month, monthly_income), _frame_rows)
+
+    loaded, loaded_key = (groceries_df, bills_df), data_key
+    edits = {kind: state for kind, state in (edits or {}).items() if state}
+    if edits:
+        data_key = stage_key("edit_line_items", data_key, edits)
+        groceries_df, bills_df = _cached(
+            cache, tracer, "edit_line_items", data_key, lambda: edit_frames(*loaded, edits), _frame_rows)
+
+    source_groceries, source_bills = groceries_df, bills_df
+
+    cuts_key = stage_key("apply_spending_cuts", data_key, essential_cut, discretionary_cut)
+    cut_groceries, cut_bills = _cached(
+        cache, tracer, "apply_spending_cuts", cuts_key,
+        lambda: stages.apply_spending_cuts(groceries_df, bills_df, essential_cut, discretionary_cut), _frame_rows)
+
+    if planner == "optimize":
+        adjust_key = stage_key("optimize_spending", cuts_key, monthly_income, savings_goal)
+        adjusted = _cached(
+            cache, tracer, "optimize_spending", adjust_key,
+            lambda: _optimize(cut_groceries, cut_bills, monthly_income, savings_goal),
+            lambda value: len(value["groceries"]) + len(value["bills"]))
+        make_options = goal_first_options
+    elif planner == "tiers":
+        adjust_key = stage_key("auto_adjust_spending", cuts_key, monthly_income)
+        adjusted = _cached(
+            cache, tracer, "auto_adjust_spending", adjust_key,
+            lambda: _adjust(cut_groceries, cut_bills, monthly_income),
+            lambda value: len(value["groceries"]) + len(value["bills"]))
+        make_options = stages.generate_budget_options
+    else:
+        raise ValueError(f"Unknown planner {planner!r}; expected 'tiers' or 'optimize'")
+    groceries_df, bills_df = adjusted["groceries"], adjusted["bills"]
+    totals = adjusted["totals"]
+
+    options_key = stage_key("generate_budget_options", adjust_key, monthly_income, savings_goal, risk_appetite)
+    budget_options = _cached(
+        cache, tracer, "generate_budget_options", options_key,
+        lambda: make_options(monthly_income, totals["total_fixed_expenses"], savings_goal, risk_appetite))
+
+    if recommender is None:
+        recommendations = _cached(
+            cache, tracer, "generate_recommendations",
+            stage_key("generate_recommendations", adjust_key, options_key, monthly_income, savings_goal),
+            lambda: stages.generate_recommendations(groceries_df, bills_df, budget_options, monthly_income,
+                                                    savings_goal),
+            len)
+    else:
+        with tracer.span("generate_recommendations") as span:
+            recommendations = recommender.run(groceries_df, bills_df, budget_options, monthly_income, savings_goal)
+            span.rows = len(recommender.evaluated)
+
+    results = {
+        "data_key": data_key,
+        "loaded": loaded,
+        "source": (source_groceries, source_bills),
+        "groceries": groceries_df,
+        "bills": bills_df,
+        "adjustment_plan": adjusted["adjustment_plan"],
+        "cut_plan": adjusted.get("cut_plan"),
+        "overspend": adjusted["overspend"],
+        "totals": totals,
+        "budget_options": budget_options,
+        "recommendations": recommendations,
+    }
+    if not views:
+        return results
+
+    breakdown = _cached(
+        cache, tracer, "create_expense_breakdown", stage_key("create_expense_breakdown", adjust_key, monthly_income),
+        lambda: stages.create_expense_breakdown(groceries_df, bills_df, monthly_income),
+        lambda value: len(value["expense_breakdown"]))
+    budget_data = _cached(
+        cache, tracer, "create_budget_data", stage_key("create_budget_data", options_key),
+        lambda: stages.create_budget_data(budget_options), len)
+
+    summary_key = stage_key("create_adjustment_summary", adjust_key, monthly_income)
+    priority_summary, detailed_adjustments = _cached(
+        cache, tracer, "create_adjustment_summary", summary_key,
+        lambda: stages.create_adjustment_summary(groceries_df, bills_df, monthly_income),
+        lambda value: len(value[1]))
+
+    if planner == "tiers":
+        base_aggregates = _cached(
+            cache, tracer, "running_aggregates", stage_key("running_aggregates", loaded_key),
+            lambda: RunningAggregates.from_frames(*loaded), lambda value: len(value.cells))
+        with tracer.span("live_summary") as span:
+            aggregates = base_aggregates.copy()
+            for kind, frame in zip(("grocery", "bill"), loaded):
+                aggregates.apply_editor_state(kind, frame, edits.get(kind))
+            live = aggregates.summary(monthly_income, savings_goal, risk_appetite, essential_cut, discretionary_cut)
+            span.rows = len(aggregates.cells)
+    else:
+        # The cut plan is per item, so its figures come from the stages above
+        live = {
+            "totals": totals,
+            "adjustment_plan": None,
+            "budget_options": budget_options,
+            "category_spending": breakdown["category_spending"],
+            "priority_spending": breakdown["priority_spending"],
+            "priority_summary": priority_summary,
+        }
+
+    # Filter indexes, rebuilt only when the adjusted frames change
+    expense_filter_index = _cached(
+        cache, tracer, "expense_index", stage_key("expense_index", adjust_key),
+        lambda: expense_index(stages.create_expense_details(groceries_df, bills_df)),
+        lambda index: index.size)
+    adjustment_filter_index = _cached(
+        cache, tracer, "adjustment_index", stage_key("adjustment_index", summary_key),
+        lambda: adjustment_index(detailed_adjustments), lambda index: index.size)
+    # Display strings, highlight flags and sort orders for the paged table
+    adjustment_table = _cached(
+        cache, tracer, "adjustment_pages", stage_key("adjustment_pages", summary_key),
+        lambda: adjustment_pages(detailed_adjustments), lambda table: table.size)
+
+    results.update(
+        live=live,
+        visualizations=dict(breakdown, budget_data=budget_data),
+        priority_summary=priority_summary,
+        detailed_adjustments=detailed_adjustments,
+        expense_index=expense_filter_index,
+        adjustment_index=adjustment_filter_index,
+        adjustment_pages=adjustment_table,
+    )
+    return results
+
+
+def run_sweep(results, monthly_income, savings_goal, cache=None, tracer=NULL_TRACER):
+    """Cached what-if grid over cuts and risk for a ``run_pipeline`` result."""
+    cache = default_cache if cache is None else cache
+    groceries_df, bills_df = results["source"]
+    return _cached(
+        cache, tracer, "sweep", stage_key("sweep", results["data_key"], monthly_income, savings_goal),
+        lambda: sweep(groceries_df, bills_df, monthly_income, savings_goal),
+        lambda grid: grid["feasible_savings"].size)
+
+
+def run_goal_seek(results, monthly_income, risk_appetite, cache=None, tracer=NULL_TRACER):
+    """Cached goal-seek path (see ``finance_engine.goalseek``) for a ``run_pipeline`` result."""
+    cache = default_cache if cache is None else cache
+    groceries_df, bills_df = results["source"]
+    return _cached(
+        cache, tracer, "goal_seek", stage_key("goal_seek", results["data_key"], monthly_income, risk_appetite),
+        lambda: savings_path(groceries_df, bills_df, monthly_income, risk_appetite),
+        lambda path: len(path["feasible_savings"]))
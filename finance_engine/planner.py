@@ -0,0 +1,145 @@
+"""Minimum-pain cut planner.
+
+An alternative to the fixed tiers of ``auto_adjust_spending`` and the fixed
+splits of ``generate_budget_options``. Every line item is a decision
+variable: the amount cut from it, bounded by its Flexibility (``None`` is
+fixed; ``Low``, ``Medium`` and ``High`` allow up to ``MAX_REDUCTION`` of the
+amount) and costing ``PRIORITY_PAIN x FLEXIBILITY_PAIN`` per shilling cut.
+The planner cuts just enough for expenses to leave ``savings_goal`` of the
+income, at minimum total pain.
+
+With linear pain this LP is a fractional knapsack. Its optimum fills the pain
+levels from cheapest up. There are only 20 (priority, flexibility)
+combinations, so the solution is one ``bincount`` of each item's maximum cut
+per pain level and a cumulative sum over the few distinct levels. Levels
+below the one that reaches the required cut are cut in full; that level's
+cut is split over its items in proportion to their maximum, by the
+largest-remainder ``money.allocate``. Nothing is looped per item, so a
+10,000-item ledger solves in about a millisecond.
+
+Amounts are worked in integer minor units (see ``finance_engine.money``),
+like the tiered stages: the cuts add up to the required amount exactly, and
+the goal-first options add up to the surplus.
+"""
+import numpy as np
+
+from finance_engine import money
+from finance_engine.batch import OPTION_SHARES, encode, risk_code
+from finance_engine.taxonomy import FLEXIBILITIES, PRIORITIES
+
+# Pain per shilling cut, in PRIORITIES and FLEXIBILITIES order
+PRIORITY_PAIN = {"Critical": 16.0, "Essential": 8.0, "Discretionary": 2.0, "Nice-to-have": 1.0, "Investment": 4.0}
+FLEXIBILITY_PAIN = {"None": 0.0, "Low": 3.0, "Medium": 2.0, "High": 1.0}
+MAX_REDUCTION = {"None": 0.0, "Low": 0.1, "Medium": 0.25, "High": 0.5}
+
+# Maximum cuts as exact percentages, so capacities are whole minor units
+_MAX_REDUCTION_PERCENT = np.array([round(MAX_REDUCTION[f] * 100) for f in FLEXIBILITIES], dtype=np.int64)
+# Pain per (priority, flexibility) combination, and each combination's rank
+# among the distinct pain levels
+_COMBO_PAIN = np.array([PRIORITY_PAIN[p] * FLEXIBILITY_PAIN[f] for p in PRIORITIES for f in FLEXIBILITIES])
+_LEVELS, _COMBO_LEVEL = np.unique(_COMBO_PAIN, return_inverse=True)
+
+
+def plan_cuts(amounts, priority, flexibility, required):
+    """Cut ``required`` from ``amounts`` at minimum pain.
+
+    ``priority`` and ``flexibility`` are values or codes per item (see
+    ``batch.encode``). Returns ``(reductions, plan)`` with the per-item cut
+    and a dict of the ``required``, achieved ``reduction``, ``shortfall``
+    (what the bounds could not cover) and total ``pain``.
+
+    Everything is worked in minor units: each item's capacity is its maximum
+    cut rounded half to even, and the one partly cut level hands its cut to
+    its items by ``money.allocate`` over their capacities, so the reductions
+    add up to ``required`` exactly whenever the capacity allows it.
+    """
+    amounts = money.to_minor(np.asarray(amounts, dtype=np.float64))
+    required = money.to_minor(float(required))
+    priority = encode(priority, PRIORITIES)
+    flexibility = encode(flexibility, FLEXIBILITIES)
+
+    capacity = money.scale(np.clip(amounts, 0, None), _MAX_REDUCTION_PERCENT[flexibility], 100)
+    combo = priority.astype(np.intp) * len(FLEXIBILITIES) + flexibility
+    level = _COMBO_LEVEL[combo]
+
+    # Cheapest pain level first; a level is cut fully, partly or not at all
+    level_capacity = np.bincount(level, weights=capacity, minlength=len(_LEVELS)).astype(np.int64)
+    before = np.cumsum(level_capacity) - level_capacity
+    level_cut = np.clip(required - before, 0, level_capacity)
+    reductions = np.where(level_cut[level] == level_capacity[level], capacity, 0)
+    partial = np.flatnonzero((level_cut > 0) & (level_cut < level_capacity))
+    for cut_level in partial:
+        items = np.flatnonzero(level == cut_level)
+        reductions[items] = money.allocate(level_cut[cut_level], capacity[items])
+
+    reduction = int(reductions.sum())
+    return money.to_units(reductions), {
+        "required": money.to_units(required),
+        "reduction": money.to_units(reduction),
+        "shortfall": money.to_units(max(required - reduction, 0)),
+        "pain": float(money.to_units(reductions) @ _COMBO_PAIN[combo]),
+    }
+
+
+def optimize_spending(groceries_df, bills_df, monthly_income, savings_goal):
+    """Cut the frames at minimum pain until expenses leave ``savings_goal``.
+
+    Returns ``(groceries_df, bills_df, plan)`` like ``auto_adjust_spending``;
+    ``plan`` is ``None`` when the goal already fits. Amounts come back as
+    whole minor units, so the adjusted expenses leave the goal exactly.
+    """
+    n_groceries = len(groceries_df)
+    amounts = money.to_minor(np.concatenate([groceries_df["Price"].to_numpy(dtype=np.float64),
+                                             bills_df["Amount"].to_numpy(dtype=np.float64)]))
+    income = money.to_minor(float(monthly_income))
+    required = int(amounts.sum()) + money.to_minor(float(savings_goal)) - income
+    if required <= 0:
+        return groceries_df, bills_df, None
+
+    reductions, plan = plan_cuts(
+        money.to_units(amounts),
+        np.concatenate([encode(groceries_df["Priority"], PRIORITIES), encode(bills_df["Priority"], PRIORITIES)]),
+        np.concatenate([encode(groceries_df["Flexibility"], FLEXIBILITIES),
+                        encode(bills_df["Flexibility"], FLEXIBILITIES)]),
+        money.to_units(required))
+    plan["overspend"] = money.to_units(max(int(amounts.sum()) - income, 0))
+    adjusted = money.to_units(amounts - money.to_minor(reductions))
+    return (groceries_df.assign(Price=adjusted[:n_groceries]), bills_df.assign(Amount=adjusted[n_groceries:]),
+            plan)
+
+
+def goal_first_options(income, fixed_expenses, savings_goal, risk):
+    """Budget options that save the goal first and split the rest by risk.
+
+    Same shape as ``generate_budget_options``; the surplus beyond the goal
+    goes to investments and discretionary spending in each option's ratio,
+    by the same largest-remainder split, so each option adds up to the
+    surplus exactly. Unknown risks get the High ratios, as there.
+    """
+    remaining = money.to_minor(float(income)) - money.to_minor(float(fixed_expenses))
+    savings = min(money.to_minor(float(savings_goal)), max(remaining, 0))
+    surplus = max(remaining - savings, 0)
+    options = {}
+    for name, shares in OPTION_SHARES.items():
+        _, investments_share, discretionary_share = shares[risk_code(risk)]
+        investments, discretionary = money.allocate(surplus, [investments_share, discretionary_share])
+        invest_ratio = investments_share / (investments_share + discretionary_share)
+        options[name] = {
+            "Savings": money.to_units(savings),
+            "Investments": money.to_units(int(investments)),
+            "Discretionary": money.to_units(int(discretionary)),
+            "Description": (f"Goal first: save {money.to_units(savings):,.0f} UGX, then {invest_ratio:.0%} of the rest "
+                            f"to investments and {1 - invest_ratio:.0%} to discretionary"),
+            "Feasible": remaining > 0,
+        }
+    return options
+
+
+def describe_cut_plan(plan):
+    """Return the dashboard messages for a cut plan (empty when ``None``)."""
+    if plan is None:
+        return []
+    messages = [f"Cut {plan['reduction']:,.0f} UGX at minimum pain to reach the savings goal"]
+    if plan["shortfall"] > 0:
+        messages.append(f"Flexibility limits leave {plan['shortfall']:,.0f} UGX of the goal uncovered")
+    return messages
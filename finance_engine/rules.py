@@ -0,0 +1,333 @@
+"""Declarative recommendation rules and an incremental rule engine.
+
+Each rule in ``RULES`` declares the inputs it reads, a ``when`` predicate
+over them, a level and a message. Inputs are small named values computed
+from the adjusted frames and budget options (see ``INPUTS``):
+
+* ``totals``: total expenses and income;
+* ``savings``: the feasible savings of the budget options and the goal;
+* ``discretionary``: discretionary spending and income;
+* ``top_groceries`` / ``top_bills``: the ``TOP_K`` largest rows per frame;
+* ``investments``: the bills of type Investments.
+
+``evaluate`` runs every rule once, as ``stages.generate_recommendations``
+does. A ``RecommendationEngine`` keeps state across reruns of one
+household. It fingerprints each input, re-runs only the rules whose inputs
+changed, and keeps each frame's top-k in a ``TopK`` heap. The heap is
+updated with only the rows whose amount changed, instead of re-sorting.
+
+``when`` predicates use plain comparisons, so they also work on arrays:
+``evaluate_batch`` evaluates every rule for many households at once from
+``batch_inputs``, the columns ``finance_engine.batch.run_batch`` returns.
+"""
+import heapq
+
+import numpy as np
+
+from finance_engine.batch import KINDS, encode, household_index
+from finance_engine.memo import stage_key
+from finance_engine.taxonomy import PRIORITIES
+
+TOP_K = 3
+LEVELS = ("Critical", "High", "Medium")
+
+RULES = {}
+
+
+class Rule:
+    """A recommendation: ``message(values)`` at ``level`` when ``when(values)``."""
+
+    def __init__(self, name, level, inputs, when, message):
+        self.name = name
+        self.level = level
+        self.inputs = tuple(inputs)
+        self.when = when
+        self.message = message
+
+    def evaluate(self, values):
+        if not self.when(values):
+            return None
+        return (self.level, self.message(values))
+
+
+def rule(name, level, inputs, when, registry=RULES):
+    """Register the decorated message function as a rule in ``registry``."""
+    def register(message):
+        registry[name] = Rule(name, level, inputs, when, message)
+        return message
+    return register
+
+
+# Inputs, from the adjusted frames, the budget options, income and goal
+
+def _totals(groceries, bills, budget_options, monthly_income, savings_goal):
+    return {"total_expenses": float(groceries["Price"].sum() + bills["Amount"].sum()),
+            "monthly_income": monthly_income}
+
+
+def _savings(groceries, bills, budget_options, monthly_income, savings_goal):
+    return {"feasible_savings": min(budget_options["Option 1"]["Savings"], budget_options["Option 2"]["Savings"]),
+            "savings_goal": savings_goal}
+
+
+def _discretionary(groceries, bills, budget_options, monthly_income, savings_goal):
+    spending = (groceries.loc[groceries["Priority"] == "Discretionary", "Price"].sum()
+                + bills.loc[bills["Priority"] == "Discretionary", "Amount"].sum())
+    return {"discretionary_spending": float(spending), "monthly_income": monthly_income}
+
+
+def _top(frame, name, amount):
+    rows = frame.nlargest(TOP_K, amount)
+    return {"items": list(zip(rows[name], rows[amount].astype(float))), "count": len(frame)}
+
+
+def _top_groceries(groceries, bills, budget_options, monthly_income, savings_goal):
+    return _top(groceries, "Item", "Price")
+
+
+def _top_bills(groceries, bills, budget_options, monthly_income, savings_goal):
+    return _top(bills, "Category", "Amount")
+
+
+def _investments(groceries, bills, budget_options, monthly_income, savings_goal):
+    names = bills.loc[bills["Type"] == "Investments", "Category"].tolist()
+    return {"names": names, "count": len(names)}
+
+
+INPUTS = {
+    "totals": _totals,
+    "savings": _savings,
+    "discretionary": _discretionary,
+    "top_groceries": _top_groceries,
+    "top_bills": _top_bills,
+    "investments": _investments,
+}
+
+
+def _listing(items):
+    return ", ".join(f"{name} ({amount:,.0f} UGX)" for name, amount in items)
+
+
+# The rules, in the order their recommendations are listed
+
+@rule("overspend", "Critical", ("totals",),
+      when=lambda v: v["totals"]["total_expenses"] > v["totals"]["monthly_income"])
+def _overspend(v):
+    overspend_amount = v["totals"]["total_expenses"] - v["totals"]["monthly_income"]
+    return (f"Your expenses exceed income by {overspend_amount:,.0f} UGX! "
+            "The system has automatically adjusted your spending. "
+            "Consider permanent reductions in discretionary items.")
+
+
+@rule("savings_goal", "High", ("savings",),
+      when=lambda v: v["savings"]["feasible_savings"] < v["savings"]["savings_goal"] * 0.8)
+def _savings_goal(v):
+    return (f"Your savings goal may be too ambitious. Current feasible savings: "
+            f"{v['savings']['feasible_savings']:,.0f} UGX vs goal: {v['savings']['savings_goal']:,.0f} UGX. "
+            "Consider adjusting your savings target or reducing expenses.")
+
+
+@rule("top_groceries", "Medium", ("top_groceries",), when=lambda v: v["top_groceries"]["count"] > 0)
+def _highest_groceries(v):
+    return (f"Highest grocery costs: {_listing(v['top_groceries']['items'])}. "
+            "Consider cheaper alternatives or reducing quantities.")
+
+
+@rule("top_bills", "Medium", ("top_bills",), when=lambda v: v["top_bills"]["count"] > 0)
+def _highest_bills(v):
+    return f"Highest bills: {_listing(v['top_bills']['items'])}. Review for potential savings."
+
+
+@rule("discretionary_share", "High", ("discretionary",),
+      when=lambda v: v["discretionary"]["discretionary_spending"] > v["discretionary"]["monthly_income"] * 0.15)
+def _discretionary_share(v):
+    spending, income = v["discretionary"]["discretionary_spending"], v["discretionary"]["monthly_income"]
+    # Without income there is no share to quote, only the spending
+    share = f" ({spending / income * 100:.0f}% of income)" if income > 0 else ""
+    return (f"High discretionary spending: {spending:,.0f} UGX{share}. "
+            "Consider reducing non-essential expenses.")
+
+
+@rule("investments", "Medium", ("investments",), when=lambda v: v["investments"]["count"] > 0)
+def _investments_due(v):
+    return (f"Investment expenses coming up: {', '.join(v['investments']['names'])}. "
+            "Plan accordingly to avoid cash flow issues.")
+
+
+def rule_inputs(rules):
+    """The input names read by ``rules``, in ``INPUTS`` order."""
+    needed = {name for r in rules.values() for name in r.inputs}
+    return [name for name in INPUTS if name in needed]
+
+
+def evaluate(groceries, bills, budget_options, monthly_income, savings_goal, rules=RULES):
+    """Evaluate every rule once; returns ``[(level, message)]`` in rule order."""
+    values = {name: INPUTS[name](groceries, bills, budget_options, monthly_income, savings_goal)
+              for name in rule_inputs(rules)}
+    return [result for result in (r.evaluate(values) for r in rules.values()) if result is not None]
+
+
+class TopK:
+    """The ``k`` largest amounts of a keyed row set, under row updates.
+
+    Rows live in a max-heap with lazy deletion: an update pushes a new entry
+    and leaves the old one stale, to be dropped when it surfaces. Ties are
+    broken by row position, as ``nlargest`` keeps the first occurrence.
+    """
+
+    def __init__(self, k=TOP_K):
+        self.k = k
+        self._heap = []
+        self._rows = {}
+        self._sequence = 0
+        self._amounts = None
+        self._frame = None
+
+    def __len__(self):
+        return len(self._rows)
+
+    def update(self, key, name, amount, position):
+        self._sequence += 1
+        self._rows[key] = (name, amount, position, self._sequence)
+        heapq.heappush(self._heap, (-amount, position, self._sequence, key))
+
+    def remove(self, key):
+        self._rows.pop(key, None)
+
+    def _live(self, entry):
+        row = self._rows.get(entry[3])
+        return row is not None and row[3] == entry[2]
+
+    def top(self):
+        """``[(name, amount)]`` of the ``k`` largest rows, largest first."""
+        found = []
+        while self._heap and len(found) < self.k:
+            entry = heapq.heappop(self._heap)
+            if self._live(entry):
+                found.append(entry)
+        for entry in found:
+            heapq.heappush(self._heap, entry)
+        # Rebuild once stale entries outnumber live ones
+        if len(self._heap) > 2 * len(self._rows) + self.k:
+            self._heap = [entry for entry in self._heap if self._live(entry)]
+            heapq.heapify(self._heap)
+        return [(self._rows[entry[3]][0], -entry[0]) for entry in found]
+
+    def sync(self, frame, name, amount):
+        """Apply the rows of ``frame`` that changed since the last sync.
+
+        Rows are keyed by index label. Only added rows and rows whose name,
+        amount or position changed touch the heap. Returns how many did.
+        """
+        # Cached pipeline frames come back as the same object when unchanged
+        if frame is self._frame:
+            return 0
+        index = frame.index
+        names = frame[name].to_numpy(dtype=object)
+        amounts = frame[amount].to_numpy(dtype=np.float64)
+        positions = np.arange(len(frame))
+        if self._amounts is None:
+            changed = positions
+        else:
+            previous_index, previous_names, previous_amounts = self._amounts
+            if index.equals(previous_index):
+                # Same rows in the same order: compare the columns directly
+                changed = np.flatnonzero((amounts != previous_amounts) | (names != previous_names))
+            else:
+                at = previous_index.get_indexer(index)
+                known = at >= 0
+                changed = np.flatnonzero(~known | (at != positions)
+                                         | (amounts != previous_amounts[at]) | (names != previous_names[at]))
+                for key in previous_index.difference(index):
+                    self.remove(key)
+        for position in changed:
+            self.update(index[position], names[position], float(amounts[position]), int(position))
+        self._amounts = (index, names, amounts)
+        self._frame = frame
+        return len(changed)
+
+
+class RecommendationEngine:
+    """Incremental ``evaluate`` for one household across reruns.
+
+    Holds each input's last fingerprint and each rule's last result; a run
+    recomputes the inputs, and re-evaluates a rule only when one of its
+    inputs changed. ``evaluated`` lists the rules the last run re-evaluated.
+    """
+
+    def __init__(self, rules=RULES, k=TOP_K):
+        self.rules = rules
+        self.top = {"top_groceries": TopK(k), "top_bills": TopK(k)}
+        self.evaluated = []
+        self._fingerprints = {}
+        self._results = {}
+
+    def _input(self, name, groceries, bills, budget_options, monthly_income, savings_goal):
+        if name == "top_groceries":
+            self.top[name].sync(groceries, "Item", "Price")
+            return {"items": self.top[name].top(), "count": len(self.top[name])}
+        if name == "top_bills":
+            self.top[name].sync(bills, "Category", "Amount")
+            return {"items": self.top[name].top(), "count": len(self.top[name])}
+        return INPUTS[name](groceries, bills, budget_options, monthly_income, savings_goal)
+
+    def run(self, groceries, bills, budget_options, monthly_income, savings_goal):
+        """Return ``[(level, message)]`` like ``evaluate``."""
+        changed = set()
+        values = {}
+        for name in rule_inputs(self.rules):
+            values[name] = self._input(name, groceries, bills, budget_options, monthly_income, savings_goal)
+            fingerprint = stage_key(name, values[name])
+            if self._fingerprints.get(name) != fingerprint:
+                self._fingerprints[name] = fingerprint
+                changed.add(name)
+
+        self.evaluated = []
+        for name, r in self.rules.items():
+            if name not in self._results or changed.intersection(r.inputs):
+                self._results[name] = r.evaluate(values)
+                self.evaluated.append(name)
+        return [self._results[name] for name in self.rules if self._results[name] is not None]
+
+
+def batch_inputs(households, line_items, result):
+    """Rule inputs as per-household arrays, from a ``run_batch`` ``result``.
+
+    ``line_items`` are the batch's long-format items; ``category`` (grocery
+    Category / bill Type) is only needed by the investments rule. Top-k
+    inputs carry only their row ``count``: a batch tells which households a
+    rule fires for, and ``evaluate`` formats one household's messages.
+    """
+    columns = result["households"]
+    n = len(columns["household"])
+    income = np.asarray(households["monthly_income"], dtype=np.float64)
+    idx = household_index(columns["household"], line_items["household"])
+    kind = encode(line_items["kind"], KINDS)
+    priority = encode(line_items["priority"], PRIORITIES)
+    adjusted = result["items"]["adjusted_amount"]
+
+    def per_household(mask, weights=None):
+        return np.bincount(idx[mask], weights=None if weights is None else weights[mask], minlength=n)
+
+    is_bill = kind == KINDS.index("bill")
+    investments = (per_household((np.asarray(line_items["category"]) == "Investments") & is_bill)
+                   if "category" in line_items else np.zeros(n, dtype=np.int64))
+    return {
+        "totals": {"total_expenses": columns["total_fixed_expenses"], "monthly_income": income},
+        "savings": {"feasible_savings": np.minimum(columns["option1_savings"], columns["option2_savings"]),
+                    "savings_goal": np.asarray(households["savings_goal"], dtype=np.float64)},
+        "discretionary": {"discretionary_spending": per_household(priority == PRIORITIES.index("Discretionary"),
+                                                                  adjusted),
+                          "monthly_income": income},
+        "top_groceries": {"count": per_household(~is_bill)},
+        "top_bills": {"count": per_household(is_bill)},
+        "investments": {"count": investments},
+    }
+
+
+def evaluate_batch(values, rules=RULES):
+    """Evaluate every rule's ``when`` on per-household arrays.
+
+    Returns ``{rule name: boolean array}``, one entry per household.
+    """
+    return {name: np.asarray(r.when(values), dtype=bool) for name, r in rules.items()}
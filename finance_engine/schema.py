@@ -0,0 +1,68 @@
+"""Shared taxonomy for budget line items.
+
+Priority, Flexibility, Category/Type and Frequency are stored as pandas
+categoricals over the vocabularies below, so filters (``isin``) and
+``groupby`` compare small integer codes instead of Python strings and each
+column takes one byte per row. Amount columns stay dense ``float64``.
+
+The vocabularies are closed except for categories: statement imports and
+user ledgers can introduce new ones, which are appended after the known
+values. The priority order is the budget's own ranking, which is also what
+``sort_values`` on a priority column follows. The vocabularies themselves
+live in ``finance_engine.taxonomy`` and are re-exported here.
+"""
+import pandas as pd
+
+from finance_engine.taxonomy import CATEGORIES, FLEXIBILITIES, FREQUENCIES, PRIORITIES
+
+PRIORITY = pd.CategoricalDtype(PRIORITIES)
+FLEXIBILITY = pd.CategoricalDtype(FLEXIBILITIES)
+FREQUENCY = pd.CategoricalDtype(FREQUENCIES)
+CATEGORY = pd.CategoricalDtype(CATEGORIES)
+
+# Closed vocabularies per column
+_CLOSED = {"Priority": PRIORITY, "Flexibility": FLEXIBILITY, "Frequency": FREQUENCY}
+# Category-like columns, per frame: "Category" for groceries, "Type" for bills
+_OPEN = ("Category", "Type")
+
+
+def category_dtype(values):
+    """Return ``CATEGORY`` extended with any unknown values, in first-seen order."""
+    known = set(CATEGORIES)
+    extra = [v for v in pd.unique(pd.Series(values, dtype=object)) if v not in known and pd.notna(v)]
+    return pd.CategoricalDtype(CATEGORIES + tuple(extra)) if extra else CATEGORY
+
+
+def as_categorical(values, dtype):
+    """Convert a Series to ``dtype``, rejecting values outside its vocabulary."""
+    converted = values.astype(dtype)
+    unknown = converted.isna() & values.notna()
+    if unknown.any():
+        bad = sorted(set(values[unknown].astype(str)))
+        raise ValueError(f"Unknown values {bad!r}; expected one of {list(dtype.categories)!r}")
+    return converted
+
+
+def categorize(frame, category_columns=_OPEN):
+    """Return ``frame`` with taxonomy columns as shared categoricals.
+
+    ``category_columns`` are the category-like columns to encode; pass
+    ``("Type",)`` for a bills frame whose ``Category`` holds descriptions.
+    """
+    frame = frame.copy()
+    for column, dtype in _CLOSED.items():
+        if column in frame and not isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = as_categorical(frame[column], dtype)
+    for column in category_columns:
+        if column in frame and not isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype(category_dtype(frame[column]))
+    return frame
+
+
+def categorize_groceries(groceries_df):
+    return categorize(groceries_df, ("Category",))
+
+
+def categorize_bills(bills_df):
+    # A bill's "Category" is its description; "Type" is the taxonomy column
+    return categorize(bills_df, ("Type",))
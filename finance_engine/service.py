@@ -0,0 +1,257 @@
+"""Asynchronous HTTP API over the budget engine for stored households.
+
+One process serves many households. The event loop only parses requests and
+writes responses; ledger reads and the pandas stages run in a thread pool,
+against a ``LedgerStore`` whose SQLite connections come from a fixed pool,
+and results are shared through the pipeline's stage cache::
+
+    python -m finance_engine.service --db ledger.db --port 8080 --workers 8
+
+Endpoints (JSON responses; query parameters as in the dashboard)::
+
+    GET  /health
+    GET  /households/{household}/months
+    POST /households/{household}/{month}/seed
+    GET  /households/{household}/{month}/budget
+         ?income=1400000&goal=50000&risk=Medium&essential_cut=0&discretionary_cut=0
+    GET  /households/{household}/{month}/projection
+         ?...budget parameters...&option=Option 1&current=0&months=60&paths=1000
+
+Parameters outside their range (negative income or goal, cuts outside
+0-100, ``months`` outside 1-``MAX_MONTHS``, ``paths`` outside
+1-``MAX_PATHS``) are rejected with 400 before any work is done.
+
+``budget`` returns totals, the adjustment plan and its messages, budget
+options and recommendations; ``projection`` returns the Monte Carlo
+percentile bands for the chosen option's savings. The server speaks plain
+HTTP/1.1 with keep-alive and needs nothing outside the standard library and
+the engine's own dependencies.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from finance_engine.ledger import LedgerStore
+
+MAX_BODY = 1 << 20
+MAX_MONTHS = 600
+# simulate_savings allocates (paths, months) float arrays, so both are capped
+MAX_PATHS = 100_000
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _plain(value):
+    """``json.dumps`` fallback for NumPy scalars."""
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serialisable")
+
+
+def _number(params, name, default, cast=float, low=None, high=None):
+    """Query parameter ``name`` as a number in ``[low, high]``, or ``default`` when absent."""
+    value = params.get(name, [None])[-1]
+    if value is None:
+        return default
+    try:
+        value = cast(value)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be a number")
+    if not math.isfinite(value) or (low is not None and value < low) or (high is not None and value > high):
+        bounds = f"between {low} and {high}" if high is not None else f"at least {low}"
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be a finite number {bounds}")
+    return value
+
+
+def budget_params(params):
+    risk = params.get("risk", ["Medium"])[-1]
+    if risk not in ("Low", "Medium", "High"):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "risk must be Low, Medium or High")
+    if "income" not in params:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "income is required")
+    return {
+        "monthly_income": _number(params, "income", None, low=0),
+        "savings_goal": _number(params, "goal", 0.0, low=0),
+        "risk_appetite": risk,
+        "essential_cut": _number(params, "essential_cut", 0, int, 0, 100),
+        "discretionary_cut": _number(params, "discretionary_cut", 0, int, 0, 100),
+    }
+
+
+class BudgetService:
+    """Blocking handlers; each one runs on a worker thread."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def _pipeline(self, household, month, params):
+        from finance_engine.pipeline import run_pipeline
+
+        if not self.store.count_line_items(household, month):
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No line items for {household} in {month}")
+        return run_pipeline(**params, ledger=self.store, household=household, month=month, views=False)
+
+    def months(self, household, params):
+        return {"household": household, "months": self.store.months(household)}
+
+    def seed(self, household, month, params):
+        return {"household": household, "month": month, "rows": self.store.seed_month(household, month)}
+
+    def budget(self, household, month, params):
+        from finance_engine.overspend import describe_adjustment_plan
+
+        results = self._pipeline(household, month, budget_params(params))
+        return {
+            "household": household,
+            "month": month,
+            "totals": results["totals"],
+            "adjustment_plan": results["adjustment_plan"],
+            "adjustment_messages": describe_adjustment_plan(results["adjustment_plan"]),
+            "budget_options": results["budget_options"],
+            "recommendations": [{"priority": priority, "text": text}
+                                for priority, text in results["recommendations"]],
+        }
+
+    def projection(self, household, month, params):
+        from finance_engine.catalog import AS_NEEDED_ITEMS
+        from finance_engine.projection import DEFAULT_PATHS, projection_bands, simulate_savings
+
+        budget = budget_params(params)
+        current = _number(params, "current", 0.0)
+        months = _number(params, "months", 60, int, 1, MAX_MONTHS)
+        paths = _number(params, "paths", DEFAULT_PATHS, int, 1, MAX_PATHS)
+        results = self._pipeline(household, month, budget)
+        option = params.get("option", ["Option 1"])[-1]
+        if option not in results["budget_options"]:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unknown option {option!r}")
+        groceries_df = results["groceries"]
+        balances = simulate_savings(
+            current, results["budget_options"][option]["Savings"],
+            budget["monthly_income"], results["totals"]["total_fixed_expenses"], months=months, paths=paths,
+            as_needed_amounts=groceries_df.loc[groceries_df["Item"].isin(AS_NEEDED_ITEMS), "Price"].tolist())
+        return {"household": household, "month": month, "option": option, "bands": projection_bands(balances)}
+
+    def route(self, method, path, params):
+        """Return ``(handler, args)`` for a request, or raise ``HTTPError``."""
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        if parts == ["health"] and method == "GET":
+            return (lambda: {"status": "ok"}), ()
+        if len(parts) == 3 and parts[0] == "households" and parts[2] == "months" and method == "GET":
+            return self.months, (parts[1], params)
+        if len(parts) == 4 and parts[0] == "households":
+            handler = {("POST", "seed"): self.seed, ("GET", "budget"): self.budget,
+                       ("GET", "projection"): self.projection}.get((method, parts[3]))
+            if handler is not None:
+                return handler, (parts[1], parts[2], params)
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {method} {path}")
+
+
+class Server:
+    """asyncio HTTP/1.1 front end that offloads handlers to a thread pool."""
+
+    def __init__(self, service, workers=None):
+        self.service = service
+        self.executor = ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS, thread_name_prefix="budget-worker")
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length") or 0)
+        if length > MAX_BODY:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        if length:
+            await reader.readexactly(length)
+        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+        return method, target, keep_alive
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, default=_plain).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, target, keep_alive = request
+                    url = urlsplit(target)
+                    handler, args = self.service.route(method, url.path, parse_qs(url.query))
+                    payload = await loop.run_in_executor(self.executor, handler, *args)
+                    status = HTTPStatus.OK
+                except HTTPError as exc:
+                    status, payload = exc.status, {"error": str(exc)}
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as exc:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(exc).__name__}: {exc}"}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8080, ready=None):
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the budget engine over HTTP.")
+    parser.add_argument("--db", default=os.environ.get("FINANCE_LEDGER_DB", "ledger.db"), help="SQLite ledger file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help=f"worker threads (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--pool-size", type=int, default=None, help="SQLite connections (default: one per worker)")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or DEFAULT_WORKERS
+    store = LedgerStore(args.db, pool_size=args.pool_size or workers)
+    server = Server(BudgetService(store), workers)
+    try:
+        asyncio.run(server.serve(args.host, args.port,
+                                 ready=lambda port: print(f"Serving budgets from {args.db} on http://{args.host}:{port}")))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.executor.shutdown()
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
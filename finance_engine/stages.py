@@ -0,0 +1,258 @@
+"""Pure budget pipeline stages.
+
+Each stage takes explicit inputs and returns new objects; input frames are
+never modified, which is what makes the results safe to memoize.
+"""
+import numpy as np
+import pandas as pd
+
+from finance_engine import money, rules
+from finance_engine.overspend import solve_overspend
+
+ESSENTIAL_PRIORITIES = ["Essential", "Critical"]
+GROCERY_DISCRETIONARY_PRIORITIES = ["Nice-to-have", "Discretionary"]
+BILL_DISCRETIONARY_PRIORITIES = ["Discretionary", "Investment"]
+
+# Auto-adjust tiers: discretionary first, then flexible essentials
+GROCERY_DISCRETIONARY_TIER = ["Discretionary", "Nice-to-have"]
+BILL_DISCRETIONARY_TIER = ["Discretionary"]
+FLEXIBLE = ["Medium", "High"]
+
+
+def _member(column, values):
+    """``column.isin(values)`` as a numpy mask, via the codes for categoricals."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        lookup = np.array([category in values for category in column.cat.categories] + [False])
+        return lookup[column.array.codes]
+    return column.isin(values).to_numpy()
+
+
+def _cut(amounts, essential, discretionary, essential_cut, discretionary_cut):
+    minor = money.to_minor(amounts)
+    return np.where(essential, money.scale_percent(minor, -essential_cut),
+                    np.where(discretionary, money.scale_percent(minor, -discretionary_cut), minor))
+
+
+def cut_groups(groceries_df, bills_df):
+    """Amounts with the essential and discretionary masks ``apply_spending_cuts`` uses.
+
+    Returns ``(amounts, essential, discretionary)`` over the groceries, then
+    the bills.
+    """
+    return (
+        np.concatenate([groceries_df["Price"].to_numpy(dtype=np.float64),
+                        bills_df["Amount"].to_numpy(dtype=np.float64)]),
+        np.concatenate([_member(groceries_df["Priority"], ESSENTIAL_PRIORITIES),
+                        _member(bills_df["Priority"], ESSENTIAL_PRIORITIES)]),
+        np.concatenate([_member(groceries_df["Priority"], GROCERY_DISCRETIONARY_PRIORITIES),
+                        _member(bills_df["Priority"], BILL_DISCRETIONARY_PRIORITIES)]),
+    )
+
+
+# Apply user-requested spending cuts, in whole minor units
+def apply_spending_cuts(groceries_df, bills_df, essential_cut, discretionary_cut):
+    price = groceries_df["Price"].to_numpy(dtype=np.float64)
+    groceries_df = groceries_df.assign(**{
+        "Price": money.to_units(_cut(price, _member(groceries_df["Priority"], ESSENTIAL_PRIORITIES),
+                                     _member(groceries_df["Priority"], GROCERY_DISCRETIONARY_PRIORITIES),
+                                     essential_cut, discretionary_cut)),
+        "Original Price": money.quantize(price),
+    })
+
+    amount = bills_df["Amount"].to_numpy(dtype=np.float64)
+    bills_df = bills_df.assign(**{
+        "Amount": money.to_units(_cut(amount, _member(bills_df["Priority"], ESSENTIAL_PRIORITIES),
+                                      _member(bills_df["Priority"], BILL_DISCRETIONARY_PRIORITIES),
+                                      essential_cut, discretionary_cut)),
+        "Original Amount": money.quantize(amount),
+    })
+    return groceries_df, bills_df
+
+
+def compute_totals(groceries_df, bills_df, monthly_income):
+    total_groceries = groceries_df["Price"].sum()
+    total_bills = bills_df["Amount"].sum()
+    total_fixed_expenses = total_bills + total_groceries
+    return {
+        "total_groceries": total_groceries,
+        "total_bills": total_bills,
+        "total_fixed_expenses": total_fixed_expenses,
+        "disposable_income": monthly_income - total_fixed_expenses,
+    }
+
+
+# Automatic spending adjustment when expenses exceed income
+def auto_adjust_spending(groceries_df, bills_df, monthly_income):
+    """Scale flexible spending down until expenses fit ``monthly_income``.
+
+    Returns ``(groceries_df, bills_df, adjustment_plan)`` where the plan is
+    ``None`` when no adjustment was needed, otherwise the structured plan
+    from ``solve_overspend``. The input frames are returned unchanged when
+    nothing needs adjusting.
+    """
+    n_groceries = len(groceries_df)
+    amounts = money.to_minor(np.concatenate([groceries_df["Price"].to_numpy(dtype=np.float64),
+                                             bills_df["Amount"].to_numpy(dtype=np.float64)]))
+    discretionary = np.concatenate([_member(groceries_df["Priority"], GROCERY_DISCRETIONARY_TIER),
+                                    _member(bills_df["Priority"], BILL_DISCRETIONARY_TIER)])
+    flexible_essential = np.concatenate([
+        _member(groceries_df["Priority"], ["Essential"]) & _member(groceries_df["Flexibility"], FLEXIBLE),
+        _member(bills_df["Priority"], ["Essential"]) & _member(bills_df["Flexibility"], FLEXIBLE),
+    ])
+
+    adjusted, adjustment_plan = solve_overspend(amounts, discretionary, flexible_essential,
+                                                money.to_minor(monthly_income))
+    if adjustment_plan is None:
+        return groceries_df, bills_df, None
+
+    adjusted = money.to_units(adjusted)
+    groceries_df = groceries_df.assign(Price=adjusted[:n_groceries])
+    bills_df = bills_df.assign(Amount=adjusted[n_groceries:])
+    return groceries_df, bills_df, adjustment_plan
+
+
+# Budget option splits per risk appetite: (name, savings %, investments %, discretionary %)
+BUDGET_SPLITS = {
+    "Low": (("Conservative", 70, 20, 10), ("Moderate Conservative", 60, 30, 10)),
+    "Medium": (("Balanced", 50, 40, 10), ("Growth Focus", 40, 50, 10)),
+    "High": (("Aggressive", 30, 60, 10), ("Very Aggressive", 20, 70, 10)),
+}
+
+
+# Budget options with enhanced logic
+def generate_budget_options(income, fixed_expenses, savings_goal, risk):
+    """Split the surplus after ``fixed_expenses`` two ways for ``risk``.
+
+    The split is a largest-remainder allocation in minor units, so each
+    option's savings, investments and discretionary add up to the surplus
+    exactly; savings are then capped at ``savings_goal``.
+    """
+    remaining = money.to_minor(float(income)) - money.to_minor(float(fixed_expenses))
+
+    if remaining <= 0:
+        return {
+            "Option 1": {
+                "Savings": 0,
+                "Investments": 0,
+                "Discretionary": 0,
+                "Description": "No surplus after fixed expenses. Need to reduce costs.",
+                "Feasible": False
+            },
+            "Option 2": {
+                "Savings": 0,
+                "Investments": 0,
+                "Discretionary": 0,
+                "Description": "No surplus after fixed expenses. Need to reduce costs.",
+                "Feasible": False
+            }
+        }
+
+    goal = money.to_minor(float(savings_goal))
+    options = {}
+    for number, (name, *split) in enumerate(BUDGET_SPLITS.get(risk, BUDGET_SPLITS["High"]), 1):
+        savings, investments, discretionary = money.allocate(remaining, split)
+        options[f"Option {number}"] = {
+            "Savings": money.to_units(min(goal, int(savings))),
+            "Investments": money.to_units(int(investments)),
+            "Discretionary": money.to_units(int(discretionary)),
+            "Description": f"{name}: {split[0]}% savings, {split[1]}% investments, {split[2]}% discretionary",
+            "Feasible": True
+        }
+    return options
+
+
+# Enhanced recommendations, from the rules in ``finance_engine.rules``
+def generate_recommendations(groceries, bills, budget_options, monthly_income, savings_goal):
+    return rules.evaluate(groceries, bills, budget_options, monthly_income, savings_goal)
+
+
+def create_expense_breakdown(groceries_df, bills_df, monthly_income):
+    # Expense breakdown
+    expense_data = pd.concat([
+        groceries_df[["Item", "Price", "Category"]].rename(columns={"Item": "Description"}).assign(Type="Groceries"),
+        bills_df[["Category", "Amount", "Type"]].rename(columns={"Category": "Description", "Amount": "Price"})
+    ])
+
+    # Category breakdown
+    category_spending = expense_data.groupby("Type", observed=True)["Price"].sum().reset_index()
+    category_spending["Percentage"] = category_spending["Price"] / monthly_income * 100
+
+    # Priority breakdown
+    priority_spending = pd.concat([
+        groceries_df[["Priority", "Price"]],
+        bills_df[["Priority", "Amount"]].rename(columns={"Amount": "Price"})
+    ], ignore_index=True).groupby("Priority", observed=True)["Price"].sum().reset_index()
+
+    return {
+        "expense_breakdown": expense_data,
+        "category_spending": category_spending,
+        "priority_spending": priority_spending,
+    }
+
+
+# Combined line-item table for the Expense Analysis tab
+def create_expense_details(groceries_df, bills_df):
+    return pd.concat([
+        groceries_df[["Item", "Category", "Price", "Priority", "Flexibility"]].rename(columns={"Item": "Description"}),
+        bills_df[["Category", "Type", "Amount", "Priority", "Flexibility"]].rename(columns={
+            "Category": "Description",
+            "Type": "Category",
+            "Amount": "Price"
+        })
+    ], ignore_index=True)
+
+
+def create_budget_data(budget_options):
+    # Budget options visualization
+    return pd.DataFrame([
+        {"Option": "Option 1", "Type": "Savings", "Amount": budget_options["Option 1"]["Savings"]},
+        {"Option": "Option 1", "Type": "Investments", "Amount": budget_options["Option 1"]["Investments"]},
+        {"Option": "Option 1", "Type": "Discretionary", "Amount": budget_options["Option 1"]["Discretionary"]},
+        {"Option": "Option 2", "Type": "Savings", "Amount": budget_options["Option 2"]["Savings"]},
+        {"Option": "Option 2", "Type": "Investments", "Amount": budget_options["Option 2"]["Investments"]},
+        {"Option": "Option 2", "Type": "Discretionary", "Amount": budget_options["Option 2"]["Discretionary"]}
+    ])
+
+
+# Create visualizations
+def create_visualizations(groceries_df, bills_df, monthly_income, budget_options):
+    visualizations = create_expense_breakdown(groceries_df, bills_df, monthly_income)
+    visualizations["budget_data"] = create_budget_data(budget_options)
+    return visualizations
+
+
+# Create a summary of original vs adjusted spending by priority
+def create_adjustment_summary(groceries_df, bills_df, monthly_income):
+    # Combine groceries and bills
+    all_expenses = pd.concat([
+        groceries_df[["Item", "Original Price", "Price", "Priority"]].rename(columns={"Item": "Description"}),
+        bills_df[["Category", "Original Amount", "Amount", "Priority"]].rename(columns={
+            "Category": "Description",
+            "Original Amount": "Original Price",
+            "Amount": "Price"
+        })
+    ])
+
+    # Calculate adjustments
+    all_expenses["Adjustment"] = all_expenses["Price"] - all_expenses["Original Price"]
+    all_expenses["% Change"] = (all_expenses["Adjustment"] / all_expenses["Original Price"]) * 100
+
+    # Group by priority
+    priority_summary = all_expenses.groupby("Priority", observed=True).agg({
+        "Original Price": "sum",
+        "Price": "sum",
+        "Adjustment": "sum",
+        "% Change": "mean"
+    }).reset_index()
+
+    priority_summary = priority_summary.rename(columns={
+        "Original Price": "Original Amount",
+        "Price": "Adjusted Amount",
+        "Adjustment": "Total Adjustment",
+        "% Change": "Avg % Change"
+    })
+
+    # Calculate percentage of income
+    priority_summary["% of Income"] = (priority_summary["Adjusted Amount"] / monthly_income) * 100
+
+    return priority_summary.sort_values("Adjusted Amount", ascending=False), all_expenses
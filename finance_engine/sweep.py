@@ -0,0 +1,106 @@
+"""What-if sweep over cut percentages and risk appetite.
+
+Every scenario of one household shares the same line items, so the ledger is
+reduced once to its distinct (class, amount) pairs (see
+``finance_engine.batch``). Each distinct cut percentage is applied to those
+pairs once, rounding each item to whole minor units as
+``apply_spending_cuts`` does, which gives every scenario's per-class totals
+exactly; the grid of (risk, essential cut, discretionary cut) scenarios is
+then solved as rows of that small matrix with ``solve_class_totals``. The
+dashboard's default grid (3 x 21 x 51) is a single array pass; grids above
+``PARALLEL_THRESHOLD`` scenarios are split across a process pool.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from finance_engine import money
+from finance_engine.batch import (CLASS_CUT, CUT_DISCRETIONARY, CUT_ESSENTIAL, CUT_NONE, N_CLASSES, RISKS, encode,
+                                  item_classes, line_items_from_frames, solve_class_totals)
+
+ESSENTIAL_CUTS = np.arange(0, 21)
+DISCRETIONARY_CUTS = np.arange(0, 51)
+PARALLEL_THRESHOLD = 2_000_000
+SWEEP_COLUMNS = ("feasible_savings", "disposable_income", "total_fixed_expenses", "residual_overspend")
+
+
+def _cut_class_totals(classes, amounts, counts, cuts):
+    # (len(cuts), N_CLASSES) sums of the given items after each cut
+    return np.array([
+        np.bincount(classes, weights=counts * money.scale_percent(amounts, -cut), minlength=N_CLASSES)
+        for cut in np.asarray(cuts).tolist()
+    ], dtype=np.int64).reshape(-1, N_CLASSES)
+
+
+def ledger_class_totals(groceries_df, bills_df, essential_cuts, discretionary_cuts):
+    """One household's per-class totals after each cut, in minor units.
+
+    Returns ``(base, essential, discretionary)``: the (classes,) totals of the
+    items no cut applies to, and the (cuts, classes) totals of the essential
+    and discretionary items after each of ``essential_cuts`` and
+    ``discretionary_cuts``. A scenario's class totals are ``base +
+    essential[i] + discretionary[j]``.
+    """
+    line_items = line_items_from_frames(groceries_df, bills_df)
+    pairs, counts = np.unique(np.column_stack([item_classes(line_items), money.to_minor(line_items["amount"])]),
+                              axis=0, return_counts=True)
+    classes, amounts = pairs[:, 0].astype(np.intp), pairs[:, 1]
+    cut = CLASS_CUT[classes]
+    totals = []
+    for bucket, cuts in ((CUT_NONE, [0]), (CUT_ESSENTIAL, essential_cuts), (CUT_DISCRETIONARY, discretionary_cuts)):
+        members = cut == bucket
+        totals.append(_cut_class_totals(classes[members], amounts[members], counts[members], cuts))
+    return totals[0][0], totals[1], totals[2]
+
+
+def _solve_scenarios(class_totals, monthly_income, savings_goal, risk, essential_index, discretionary_index):
+    base, essential, discretionary = class_totals
+    n = len(risk)
+    columns, _, _ = solve_class_totals(
+        base + essential[essential_index] + discretionary[discretionary_index],
+        np.full(n, money.to_minor(float(monthly_income))), np.full(n, money.to_minor(float(savings_goal))), risk)
+    columns["feasible_savings"] = np.minimum(columns["option1_savings"], columns["option2_savings"])
+    return {name: columns[name] for name in SWEEP_COLUMNS}
+
+
+def sweep(groceries_df, bills_df, monthly_income, savings_goal, essential_cuts=ESSENTIAL_CUTS,
+          discretionary_cuts=DISCRETIONARY_CUTS, risks=RISKS, workers=None):
+    """Evaluate every (risk, essential cut, discretionary cut) combination.
+
+    ``groceries_df`` and ``bills_df`` are the uncut frames from ``load_data``.
+    Returns a dict with the axis values under ``risks``, ``essential_cuts``
+    and ``discretionary_cuts`` plus one array of shape
+    ``(len(risks), len(essential_cuts), len(discretionary_cuts))`` per name in
+    ``SWEEP_COLUMNS``. ``feasible_savings`` is the smaller of the two budget
+    options' savings, as on the dashboard. ``workers=1`` keeps a large grid
+    in-process.
+    """
+    essential_cuts = np.asarray(essential_cuts, dtype=np.float64)
+    discretionary_cuts = np.asarray(discretionary_cuts, dtype=np.float64)
+    risk_codes = encode(list(risks), RISKS)
+    shape = (len(risk_codes), len(essential_cuts), len(discretionary_cuts))
+
+    grid_risk, grid_essential, grid_discretionary = (axis.ravel() for axis in np.meshgrid(
+        risk_codes, np.arange(len(essential_cuts)), np.arange(len(discretionary_cuts)), indexing="ij"))
+    class_totals = ledger_class_totals(groceries_df, bills_df, essential_cuts, discretionary_cuts)
+
+    n = grid_risk.size
+    workers = workers or os.cpu_count() or 1
+    if n <= PARALLEL_THRESHOLD or workers == 1:
+        results = _solve_scenarios(class_totals, monthly_income, savings_goal,
+                                   grid_risk, grid_essential, grid_discretionary)
+    else:
+        bounds = np.linspace(0, n, workers + 1, dtype=np.intp)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_solve_scenarios, class_totals, monthly_income, savings_goal,
+                            grid_risk[lo:hi], grid_essential[lo:hi], grid_discretionary[lo:hi])
+                for lo, hi in zip(bounds[:-1], bounds[1:])
+            ]
+            parts = [future.result() for future in futures]
+        results = {name: np.concatenate([part[name] for part in parts]) for name in SWEEP_COLUMNS}
+
+    grid = {name: values.reshape(shape) for name, values in results.items()}
+    grid.update(risks=tuple(risks), essential_cuts=essential_cuts, discretionary_cuts=discretionary_cuts)
+    return grid
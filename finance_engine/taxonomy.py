@@ -0,0 +1,81 @@
+"""Budget taxonomy vocabularies and the classic dashboard's priority mapping.
+
+The vocabularies are plain tuples, so array code (``batch``, ``planner``)
+can encode against them without importing pandas; ``finance_engine.schema``
+builds the categorical dtypes from the same tuples.
+
+``family_money.py`` predates the engine's taxonomy. It ranked every item
+Critical / High / Medium / Low and had no flexibility; the engine splits that
+into a five-level Priority and a four-level Flexibility. ``LEGACY_PRIORITY``
+labels engine priorities in the classic scale (investments count as Medium,
+as pig farming did there), and ``from_legacy`` maps a classic priority to
+the engine's ``(priority, flexibility)``, taking the flexibility each classic
+level implied: Critical items were never cut, Low ones first.
+
+The level mapping alone is lossy: the classic dashboard ranked a dozen
+catalog items by hand in ways no level mapping reproduces (Tooth paste was
+Medium there but is Essential here; Gizzards Medium but Nice-to-have).
+``LEGACY_PRIORITY_OVERRIDES`` keeps those per-item classic priorities, and
+``to_legacy`` / ``legacy_priorities`` apply them when given the item's
+description, so the classic view ranks every catalog item as it always did.
+"""
+PRIORITIES = ("Critical", "Essential", "Discretionary", "Nice-to-have", "Investment")
+FLEXIBILITIES = ("None", "Low", "Medium", "High")
+FREQUENCIES = ("Monthly", "Weekly", "One-time", "As needed", "Quarterly", "Termly")
+CATEGORIES = (
+    # Grocery categories
+    "Food Staples", "Protein", "Dairy", "Vegetables", "Beverages", "Personal Care", "Healthcare",
+    # Bill types
+    "Housing", "Utilities", "Transport", "Donations", "Entertainment", "Investments", "Education", "Gifts",
+)
+
+# Classic dashboard priorities, most important first
+LEGACY_PRIORITIES = ("Critical", "High", "Medium", "Low")
+
+LEGACY_PRIORITY = {
+    "Critical": "Critical",
+    "Essential": "High",
+    "Discretionary": "Medium",
+    "Nice-to-have": "Low",
+    "Investment": "Medium",
+}
+# Classic priorities of the catalog items the level mapping gets wrong, by description
+LEGACY_PRIORITY_OVERRIDES = {
+    "Tooth paste": "Medium",
+    "Shoe polish": "Low",
+    "Gizzards": "Medium",
+    "Viennas": "Medium",
+    "Beef": "Medium",
+    "Chicken": "Medium",
+    "Squishy drink": "Low",
+    "Spaghetti": "Medium",
+    "Green pepper": "Medium",
+    "Drinks": "Low",
+    "Carrots": "Medium",
+    "Ginger": "Medium",
+    "Skin care": "Low",
+}
+ENGINE_PRIORITY = {
+    "Critical": ("Critical", "None"),
+    "High": ("Essential", "Low"),
+    "Medium": ("Discretionary", "Medium"),
+    "Low": ("Nice-to-have", "High"),
+}
+
+
+def to_legacy(priority, description=None):
+    """Return the classic label for an engine priority, or the item's own classic label."""
+    return LEGACY_PRIORITY_OVERRIDES.get(description, LEGACY_PRIORITY[priority])
+
+
+def legacy_priorities(priorities, descriptions):
+    """``to_legacy`` over parallel sequences of priorities and descriptions, as a list."""
+    return [to_legacy(priority, description) for priority, description in zip(priorities, descriptions)]
+
+
+def from_legacy(priority):
+    """Return the engine ``(priority, flexibility)`` for a classic priority."""
+    try:
+        return ENGINE_PRIORITY[priority]
+    except KeyError:
+        raise ValueError(f"Unknown priority {priority!r}; expected one of {list(LEGACY_PRIORITIES)!r}") from None
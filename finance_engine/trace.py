@@ -0,0 +1,158 @@
+"""Lightweight timing spans for one dashboard rerun.
+
+A ``Tracer`` collects spans (name, start offset, wall time, row count,
+allocation delta, cache hit) for the current rerun and can append them to a
+JSON-lines file for offline analysis::
+
+    tracer.start_rerun()
+    with tracer.span("auto_adjust_spending") as span:
+        ...
+        span.rows = len(frame)
+    tracer.flush()
+
+A disabled tracer hands out one shared no-op span, so leaving the calls in
+the hot path costs a method call per span. Allocation deltas come from
+``tracemalloc``, which is only started while a tracer with
+``track_allocations`` is enabled.
+
+``tracemalloc`` is process-wide: while any session traces, allocation is
+slower in every session of the process, and the deltas include other
+threads' allocations. Tracers share it by reference count: the first one
+starts it, and the last one to close (or be garbage-collected) stops it,
+unless something else had started it already.
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+import weakref
+from datetime import datetime, timezone
+
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+
+
+def _acquire_tracemalloc():
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+
+
+def _release_tracemalloc():
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+
+
+class _NullSpan:
+    """Shared span for disabled tracers; attribute writes are dropped."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "rows", "cached", "start", "seconds", "alloc_bytes", "_mem")
+
+    def __init__(self, tracer, name, rows=None):
+        self.tracer = tracer
+        self.name = name
+        self.rows = rows
+        self.cached = None
+        self.alloc_bytes = None
+
+    def __enter__(self):
+        if self.tracer.track_allocations:
+            self._mem = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.start
+        if self.tracer.track_allocations:
+            self.alloc_bytes = tracemalloc.get_traced_memory()[0] - self._mem
+        self.tracer._finish(self)
+        return False
+
+    def as_dict(self, origin):
+        return {
+            "name": self.name,
+            "start_ms": (self.start - origin) * 1000,
+            "duration_ms": self.seconds * 1000,
+            "rows": self.rows,
+            "cached": self.cached,
+            "alloc_bytes": self.alloc_bytes,
+        }
+
+
+class Tracer:
+    """Collects spans per rerun; ``enabled=False`` makes every call a no-op."""
+
+    def __init__(self, enabled=False, path=None, track_allocations=True):
+        self.enabled = enabled
+        self.path = path
+        self.track_allocations = enabled and track_allocations
+        self.rerun_id = None
+        self._origin = time.perf_counter()
+        self._spans = []
+        self._release = None
+        if self.track_allocations:
+            _acquire_tracemalloc()
+            self._release = weakref.finalize(self, _release_tracemalloc)
+
+    def start_rerun(self):
+        """Drop the previous rerun's spans and start timing a new one."""
+        if not self.enabled:
+            return
+        self.rerun_id = uuid.uuid4().hex[:12]
+        self._origin = time.perf_counter()
+        self._spans = []
+
+    def span(self, name, rows=None):
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, rows)
+
+    def _finish(self, span):
+        self._spans.append(span)
+
+    def spans(self):
+        """Return the current rerun's spans as dicts, in start order."""
+        return sorted((span.as_dict(self._origin) for span in self._spans), key=lambda s: s["start_ms"])
+
+    def flush(self):
+        """Append the current rerun's spans to ``path`` as JSON lines."""
+        if not self.enabled or not self.path or not self._spans:
+            return
+        timestamp = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        with open(self.path, "a", encoding="utf-8") as handle:
+            for span in self.spans():
+                handle.write(json.dumps(dict(span, rerun=self.rerun_id, time=timestamp, pid=os.getpid())) + "\n")
+
+    def close(self):
+        """Stop tracking allocations; ``tracemalloc`` stops with the last tracer using it."""
+        if self._release is not None:
+            self._release()
+            self._release = None
+        self.track_allocations = False
+
+
+NULL_TRACER = Tracer(enabled=False)
@@ -0,0 +1,49 @@
+"""Running aggregates against the stages, with editor change sets."""
+import pytest
+
+from finance_engine import stages
+from finance_engine.aggregates import RunningAggregates, edit_frames
+from finance_engine.catalog import load_data
+
+INCOME, GOAL, RISK, ESSENTIAL_CUT, DISCRETIONARY_CUT = 1_800_000, 200_000, "Medium", 5, 10
+
+EDITS = {
+    "cleared cell": {"grocery": {"edited_rows": {0: {"Price": None}}}},
+    "cleared category": {"bill": {"edited_rows": {1: {"Type": None}}}},
+    "edited amount": {"grocery": {"edited_rows": {2: {"Price": 9999}}}, "bill": {"edited_rows": {3: {"Amount": 1}}}},
+    "incomplete row added": {"bill": {"added_rows": [{"Category": "Gym"}]}},
+    "row added": {"bill": {"added_rows": [{"Category": "Gym", "Amount": 70000, "Priority": "Discretionary",
+                                           "Flexibility": "High", "Type": "Entertainment"}]}},
+    "rows deleted": {"grocery": {"deleted_rows": [1, 4]}, "bill": {"deleted_rows": [0]}},
+}
+
+
+def _stage_totals(groceries_df, bills_df):
+    groceries_df, bills_df = stages.apply_spending_cuts(groceries_df, bills_df, ESSENTIAL_CUT, DISCRETIONARY_CUT)
+    groceries_df, bills_df, plan = stages.auto_adjust_spending(groceries_df, bills_df, INCOME)
+    return stages.compute_totals(groceries_df, bills_df, INCOME), plan
+
+
+def _live(loaded, edits):
+    aggregates = RunningAggregates.from_frames(*loaded)
+    for kind, frame in zip(("grocery", "bill"), loaded):
+        aggregates.apply_editor_state(kind, frame, edits.get(kind))
+    return aggregates.summary(INCOME, GOAL, RISK, ESSENTIAL_CUT, DISCRETIONARY_CUT)
+
+
+@pytest.mark.parametrize("name", list(EDITS))
+def test_edits_match_the_stages_on_the_edited_frames(name):
+    loaded = load_data(INCOME)
+    live = _live(loaded, EDITS[name])
+    totals, plan = _stage_totals(*edit_frames(*loaded, EDITS[name]))
+    assert live["totals"] == totals
+    assert live["adjustment_plan"] == plan
+
+
+@pytest.mark.parametrize("name", ["cleared cell", "cleared category", "incomplete row added"])
+def test_incomplete_edits_are_ignored(name):
+    loaded = load_data(INCOME)
+    assert _live(loaded, EDITS[name])["totals"] == _live(loaded, {})["totals"]
+    groceries_df, bills_df = edit_frames(*loaded, EDITS[name])
+    assert groceries_df["Price"].tolist() == loaded[0]["Price"].tolist()
+    assert bills_df["Amount"].tolist() == loaded[1]["Amount"].tolist()
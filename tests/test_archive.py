@@ -0,0 +1,79 @@
+"""The append-only snapshot archive."""
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance_engine.archive import SnapshotArchive
+
+OPTIONS = {"Option 1": {"Savings": 100.0, "Investments": 50.0, "Discretionary": 25.0},
+           "Option 2": {"Savings": 80.0, "Investments": 70.0, "Discretionary": 25.0}}
+
+
+def _frames(food, rent):
+    groceries_df = pd.DataFrame({"Item": ["Rice"], "Category": ["Food"], "Priority": ["Essential"],
+                                 "Price": [food * 0.8], "Original Price": [food]})
+    bills_df = pd.DataFrame({"Category": ["Rent"], "Type": ["Housing"], "Priority": ["Critical"],
+                             "Amount": [rent], "Original Amount": [rent]})
+    return groceries_df, bills_df
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = SnapshotArchive(tmp_path / "archive")
+    for number, month in enumerate(pd.period_range("2023-01", "2024-03", freq="M").strftime("%Y-%m")):
+        archive.append_month("a/b", month, *_frames(1_000 + 100 * number, 5_000), OPTIONS, 10_000)
+    return archive
+
+
+def test_months_and_range_reads(archive):
+    months = archive.months("a/b")
+    assert (months[0], months[-1], len(months)) == ("2023-01", "2024-03", 15)
+    assert os.path.isdir(os.path.join(archive.root, "a%2Fb"))
+
+    columns = archive.columns("a/b", "items", "2024-01", "2024-03")
+    assert len(columns["month"]) == 4
+    assert isinstance(columns["original"], np.memmap)
+    descriptions = archive.dictionaries("a/b")["description"]
+    assert [descriptions[code] for code in columns["description"]] == ["Rice", "Rent"] * 2
+    assert archive.columns("someone else")["month"].size == 0
+
+
+def test_months_append_in_order_only(archive):
+    with pytest.raises(ValueError, match="archived through 2024-03"):
+        archive.append_month("a/b", "2024-03", *_frames(1, 1), OPTIONS, 1)
+    with pytest.raises(ValueError):
+        archive.append_month("a/b", "2020-01", *_frames(1, 1), OPTIONS, 1)
+
+
+def test_category_trends(archive):
+    trends = archive.category_trends("a/b", "2024-01")
+    food = trends[trends["Category"] == "Food"]
+    assert food["Month"].tolist() == [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)]
+    assert food["Original"].tolist() == [2_200, 2_300, 2_400]
+    # Changes are of the adjusted totals, 80% of the original here
+    assert food["MoM %"].tolist() == pytest.approx([(2_200 / 2_100 - 1) * 100, (2_300 / 2_200 - 1) * 100,
+                                                    (2_400 / 2_300 - 1) * 100])
+    assert food["YoY %"].tolist() == pytest.approx([120.0, 109.0909090909, 100.0])
+    assert trends.loc[trends["Category"] == "Housing", "MoM %"].tolist() == [0.0, 0.0, 0.0]
+    assert archive.category_trends("nobody").empty
+
+
+def test_budget_history(archive):
+    history = archive.budget_history("a/b", "2024-03")
+    assert history["Option"].tolist() == ["Option 1", "Option 2"]
+    assert history[["Income", "Expenses", "Savings"]].values.tolist() == [[10_000, 6_920, 100], [10_000, 6_920, 80]]
+
+
+def test_an_interrupted_append_is_ignored_and_overwritten(archive):
+    rows = len(archive.columns("a/b")["month"])
+    with open(os.path.join(archive.root, "a%2Fb", "items", "original.bin"), "ab") as handle:
+        handle.write(b"\xff" * 12)
+    assert len(archive.columns("a/b")["original"]) == rows
+
+    archive.append_month("a/b", "2024-04", *_frames(9_000, 5_000), OPTIONS, 10_000)
+    columns = archive.columns("a/b", "items", "2024-04")
+    assert columns["original"].tolist() == [9_000, 5_000]
+    assert os.path.getsize(os.path.join(archive.root, "a%2Fb", "items", "original.bin")) == (rows + 2) * 8
@@ -0,0 +1,110 @@
+"""``run_batch`` against the per-household stages, to the minor unit."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance_engine import stages
+from finance_engine.batch import RISKS, encode, line_items_from_frames, run_batch
+from finance_engine.catalog import load_data
+from finance_engine.taxonomy import PRIORITIES
+
+# From no overspend, through each auto-adjust tier, to the capped essential cut
+INCOMES = (600_000, 1_200_000, 1_550_000, 1_650_000, 1_750_000, 1_850_000, 1_900_000, 2_050_000, 2_500_000,
+           4_000_000)
+CUTS = ((0, 0), (5, 10), (0, 50), (20, 50), (7.5, 12.5), (3, 33))
+GOALS = (0, 50_000, 10_000_000)
+
+
+def _stage_results(groceries_df, bills_df, income, goal, risk, essential_cut, discretionary_cut):
+    groceries_df, bills_df = stages.apply_spending_cuts(groceries_df, bills_df, essential_cut, discretionary_cut)
+    groceries_df, bills_df, plan = stages.auto_adjust_spending(groceries_df, bills_df, income)
+    totals = stages.compute_totals(groceries_df, bills_df, income)
+    options = stages.generate_budget_options(income, totals["total_fixed_expenses"], goal, risk)
+    amounts = np.concatenate([groceries_df["Price"].to_numpy(), bills_df["Amount"].to_numpy()])
+    return amounts, plan, totals, options
+
+
+def _scenarios(perturb):
+    rng = np.random.default_rng(7)
+    scenarios = []
+    for income in INCOMES:
+        groceries_df, bills_df = load_data(income)
+        if perturb:
+            # Odd amounts give the largest-remainder allocations ties and leftovers to place
+            groceries_df = groceries_df.assign(Price=groceries_df["Price"] + rng.integers(0, 997, len(groceries_df)))
+            bills_df = bills_df.assign(Amount=bills_df["Amount"] + rng.integers(0, 997, len(bills_df)))
+        for essential_cut, discretionary_cut in CUTS:
+            for risk in RISKS:
+                for goal in GOALS:
+                    scenarios.append((groceries_df, bills_df, income, goal, risk, essential_cut, discretionary_cut))
+    return scenarios
+
+
+def _batch_inputs(scenarios):
+    line_items = [line_items_from_frames(groceries_df, bills_df, household=i)
+                  for i, (groceries_df, bills_df, *_) in enumerate(scenarios)]
+    line_items = {column: np.concatenate([items[column] for items in line_items]) for column in line_items[0]}
+    households = {
+        "household": np.arange(len(scenarios)),
+        "monthly_income": np.array([s[2] for s in scenarios], dtype=np.float64),
+        "savings_goal": np.array([s[3] for s in scenarios], dtype=np.float64),
+        "risk_appetite": [s[4] for s in scenarios],
+        "essential_cut": np.array([s[5] for s in scenarios], dtype=np.float64),
+        "discretionary_cut": np.array([s[6] for s in scenarios], dtype=np.float64),
+    }
+    return households, line_items
+
+
+@pytest.mark.parametrize("perturb", [False, True])
+def test_run_batch_matches_stages(perturb):
+    scenarios = _scenarios(perturb)
+    households, line_items = _batch_inputs(scenarios)
+    result = run_batch(households, line_items)
+    columns, items = result["households"], result["items"]
+
+    adjusted_any = False
+    for i, scenario in enumerate(scenarios):
+        amounts, plan, totals, options = _stage_results(*scenario)
+        np.testing.assert_array_equal(items["adjusted_amount"][line_items["household"] == i], amounts)
+        for name in ("total_groceries", "total_bills", "total_fixed_expenses", "disposable_income"):
+            assert columns[name][i] == totals[name], (i, name)
+
+        assert bool(columns["adjusted"][i]) == (plan is not None)
+        if plan is not None:
+            adjusted_any = True
+            for name, value in plan.items():
+                assert columns[name][i] == value, (i, name)
+        for number, option in options.items():
+            prefix = number.lower().replace(" ", "")
+            for field in ("Savings", "Investments", "Discretionary", "Feasible"):
+                assert columns[f"{prefix}_{field.lower()}"][i] == option[field], (i, number, field)
+    assert adjusted_any
+
+
+@pytest.mark.parametrize("risks", [
+    ["Low", "Bogus", None, "Medium"],
+    pd.Series(pd.Categorical(["Low", "Bogus", None, "Medium"])),
+])
+def test_unknown_risks_get_the_high_split(risks):
+    scenarios = [(*load_data(1_900_000), 1_900_000, 50_000, "Low", 0, 0)] * 4
+    households, line_items = _batch_inputs(scenarios)
+    expected = run_batch(dict(households, risk_appetite=["Low", "High", "High", "Medium"]), line_items)
+    result = run_batch(dict(households, risk_appetite=risks), line_items)
+    for name, column in expected["households"].items():
+        np.testing.assert_array_equal(result["households"][name], column, err_msg=name)
+    options = stages.generate_budget_options(1_900_000, result["households"]["total_fixed_expenses"][1], 50_000,
+                                             "Bogus")
+    assert result["households"]["option1_savings"][1] == options["Option 1"]["Savings"]
+
+
+@pytest.mark.parametrize("values", [
+    pd.Series(pd.Categorical(["Essential", None], categories=PRIORITIES)),
+    pd.Series(pd.Categorical(["Essential", "Low"])),
+    np.array([0, len(PRIORITIES)]),
+    np.array([-1, 0]),
+    ["Essential", None],
+    ["Essential", "Luxury"],
+])
+def test_encode_rejects_missing_and_unknown_values(values):
+    with pytest.raises(ValueError):
+        encode(values, PRIORITIES)
@@ -0,0 +1,60 @@
+"""Calendar cash-flow schedules."""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from finance_engine.cashflow import cash_flow, occurrence_dates, schedule_items
+from finance_engine.catalog import load_data
+
+JAN, APR = np.datetime64("2024-01-01"), np.datetime64("2024-04-01")
+
+
+def _dates(schedule, start=JAN, end=APR):
+    return [str(d) for d in occurrence_dates(schedule, start, end)]
+
+
+def test_occurrence_dates():
+    assert _dates({"Frequency": "Weekly"}, end=np.datetime64("2024-02-01")) == [
+        "2024-01-06", "2024-01-13", "2024-01-20", "2024-01-27"]
+    assert _dates({"Frequency": "Monthly", "Day": 31}) == ["2024-01-31", "2024-02-29", "2024-03-31"]
+    assert _dates({"Frequency": "Quarterly"}, end=np.datetime64("2024-12-31")) == [
+        "2024-01-01", "2024-04-01", "2024-07-01", "2024-10-01"]
+    assert _dates({"Frequency": "Termly", "Months": [2, 5, 9], "Day": 10}) == ["2024-02-10"]
+    assert _dates({"Frequency": "One-time", "Date": "2024-03-15"}) == ["2024-03-15"]
+    assert _dates({"Frequency": "One-time", "Date": "2024-04-01"}) == []
+    # A horizon starting mid-month drops that month's earlier payments
+    assert _dates({"Frequency": "Monthly", "Day": 5}, start=np.datetime64("2024-01-20")) == ["2024-02-05", "2024-03-05"]
+    with pytest.raises(ValueError, match="Unknown frequency"):
+        occurrence_dates({"Frequency": "Fortnightly"}, JAN, APR)
+
+
+def test_cash_flow_balances():
+    items = [("Rent", {"Frequency": "Monthly", "Day": 5, "Amount": 500_000.0}),
+             ("Bread", {"Frequency": "Weekly", "Amount": 6_000.0}),
+             ("Fees", {"Frequency": "One-time", "Date": "2024-02-20", "Amount": 900_000.0})]
+    flow = cash_flow(items, 3, monthly_income=1_000_000, opening_balance=100_000, start=date(2024, 1, 15), payday=25)
+    assert flow["Month"] == [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)]
+    assert flow["item_month"].tolist() == [[500_000, 500_000, 500_000], [24_000, 24_000, 30_000], [0, 900_000, 0]]
+    np.testing.assert_array_equal(flow["Outflow"], flow["item_month"].sum(axis=0))
+    np.testing.assert_array_equal(flow["Net"], flow["Inflow"] - flow["Outflow"])
+    assert flow["Inflow"].tolist() == [1_000_000] * 3
+    assert flow["Closing Balance"][-1] == 100_000 + 3_000_000 - 2_478_000
+    # The horizon starts on the 1st of start's month; rent on the 5th is paid before payday on the 25th
+    assert flow["Minimum Balance"].tolist() == [-418_000, -848_000, -372_000]
+    assert len(flow["daily_balance"]) == 31 + 29 + 31
+
+
+def test_catalog_schedules_follow_cuts():
+    groceries_df, bills_df = load_data(1_000_000)
+    bills_df["Original Amount"] = bills_df["Amount"]
+    bills_df.loc[bills_df["Category"] == "Skin care", "Amount"] /= 2
+    items = dict(schedule_items(groceries_df, bills_df))
+    assert items["Skin care"] == {"Frequency": "Quarterly", "Amount": 100_000}
+    assert items["Bread"]["Frequency"] == "Weekly"
+    rice = float(groceries_df.set_index("Item").at["Rice", "Price"])
+    assert items["Rice"] == {"Frequency": "Monthly", "Amount": rice}
+
+    flow = cash_flow(schedule_items(groceries_df, bills_df), 12, start=date(2024, 1, 1))
+    skin_care = flow["item_month"][flow["items"].index("Skin care")]
+    assert skin_care.tolist() == [100_000, 0, 0] * 4
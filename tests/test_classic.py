@@ -0,0 +1,64 @@
+"""The classic dashboard's options and recommendations."""
+import pytest
+
+from finance_engine import classic
+from finance_engine.catalog import load_data
+from finance_engine.stages import compute_totals
+from finance_engine.taxonomy import legacy_priorities, to_legacy
+
+
+@pytest.mark.parametrize("risk, savings, investments, discretionary", [
+    ("Low", (500_000, 600_000), (300_000, 180_000), (700_000, 720_000)),
+    ("Medium", (400_000, 450_000), (550_000, 630_000), (550_000, 420_000)),
+    ("High", (250_000, 350_000), (1_000_000, 805_000), (250_000, 345_000)),
+    ("Unknown", (250_000, 350_000), (1_000_000, 805_000), (250_000, 345_000)),
+])
+def test_options_save_a_multiple_of_the_goal_first(risk, savings, investments, discretionary):
+    options = classic.generate_budget_options(3_000_000, 1_500_000, 500_000, risk)
+    for number, option in enumerate(options.values()):
+        assert (option["Savings"], option["Investments"], option["Discretionary"]) == (
+            savings[number], investments[number], discretionary[number])
+
+
+def test_options_keep_the_shortfall_as_savings():
+    option = classic.generate_budget_options(1_000_000, 1_200_000, 500_000, "Low")["Option 1"]
+    assert (option["Savings"], option["Investments"], option["Discretionary"]) == (-200_000, 0, 0)
+
+
+def test_recommendations():
+    income, goal = 1_000_000, 500_000
+    groceries_df, bills_df = load_data(income)
+    totals = compute_totals(groceries_df, bills_df, income)
+    options = classic.generate_budget_options(income, totals["total_fixed_expenses"], goal, "Low")
+    levels = [level for level, _ in classic.generate_recommendations(groceries_df, bills_df, options, income, goal)]
+    assert levels == ["Critical", "High", "Medium", "High", "Medium"]
+
+
+def test_catalog_keeps_its_classic_priorities_and_frequencies():
+    groceries_df, bills_df = load_data(1_000_000)
+    names = groceries_df["Item"].tolist() + bills_df["Category"].tolist()
+    priorities = dict(zip(names, legacy_priorities(groceries_df["Priority"].tolist() + bills_df["Priority"].tolist(),
+                                                   names)))
+    assert [name for name, priority in priorities.items() if priority == "Low"] == [
+        "Shoe polish", "Squishy drink", "Drinks", "Skin care"]
+    assert (priorities["Tooth paste"], priorities["Gizzards"], priorities["Rice"]) == ("Medium", "Medium", "High")
+    frequencies = dict(zip(names, classic.classic_frequencies(names)))
+    assert {name: f for name, f in frequencies.items() if f != "Monthly"} == {
+        "Medicine (Azithromycin)": "As needed", "Pig farming": "One-time"}
+
+
+def test_to_legacy_without_a_description_maps_the_level():
+    assert to_legacy("Nice-to-have") == "Low"
+    assert to_legacy("Nice-to-have", "Gizzards") == "Medium"
+
+
+def test_recommendation_messages():
+    groceries_df, bills_df = load_data(1_000_000)
+    options = classic.generate_budget_options(1_000_000, 3_000_000, 0, "Low")
+    messages = [message for _, message in classic.generate_recommendations(groceries_df, bills_df, options,
+                                                                           1_000_000, 0)]
+    assert messages[1:3] == [
+        "Consider reducing low/medium priority groceries like: Squishy drink, Drinks, Spaghetti",
+        "Potential to reduce medium priority bills: Pig farming, Family dates, Gifts",
+    ]
+    assert messages[-1] == "Plan for one-time expenses: Pig farming"
@@ -0,0 +1,51 @@
+"""The headless command-line entry point."""
+import io
+import json
+
+import pytest
+
+from finance_engine import cli
+
+
+def _run(capsys, monkeypatch, text, *args):
+    monkeypatch.setattr("sys.stdin", io.StringIO(text))
+    code = cli.main(["-", *args])
+    return code, capsys.readouterr().out
+
+
+def test_one_household(capsys, monkeypatch):
+    code, out = _run(capsys, monkeypatch, '{"monthly_income": 5000000, "savings_goal": 300000, "risk_appetite": "Low"}')
+    result = json.loads(out)
+    assert code == 0
+    assert result["adjustment_plan"] is None
+    assert list(result["budget_options"]) == ["Option 1", "Option 2"]
+    assert result["budget_options"]["Option 1"]["Savings"] == 300_000
+
+
+def test_jsonl_keeps_the_household_name(capsys, monkeypatch):
+    code, out = _run(capsys, monkeypatch, '{"household": "a", "monthly_income": 1000000}\n\n'
+                                          '{"household": "b", "monthly_income": 2000000}\n', "--jsonl")
+    assert code == 0
+    assert [json.loads(line)["household"] for line in out.splitlines()] == ["a", "b"]
+
+
+@pytest.mark.parametrize("text, message", [
+    ('{"savings_goal": 1}', "missing required field 'monthly_income'"),
+    ('{"monthly_income": "lots"}', "'monthly_income' must be a number, got 'lots'"),
+    ('[{"monthly_income": 1}, {"monthly_income": 1, "bills": {}}]', "household 2: 'bills' must be a list of objects"),
+    ('[1]', "household 1: expected an object, got int"),
+    ('{"monthly_income": ', "- is not valid JSON"),
+])
+def test_bad_input_exits_with_usage(capsys, monkeypatch, text, message):
+    with pytest.raises(SystemExit) as exit_info:
+        _run(capsys, monkeypatch, text)
+    assert exit_info.value.code == 2
+    err = capsys.readouterr().err
+    assert err.startswith("usage:") and message in err
+
+
+def test_missing_file_exits_with_usage(capsys, tmp_path):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main([str(tmp_path / "missing.json")])
+    assert exit_info.value.code == 2
+    assert "cannot read" in capsys.readouterr().err
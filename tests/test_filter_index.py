@@ -0,0 +1,56 @@
+"""Bitmap-index filters against the plain pandas selections they replace."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance_engine.filter_index import BitmapIndex, adjustment_index
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(7)
+    size = 1_003  # not a multiple of 8, so the last packed byte is partial
+    return pd.DataFrame({
+        "Priority": pd.Categorical(rng.choice(["Critical", "Essential", "Discretionary"], size)),
+        "Category": rng.choice(["Food", "Housing", "Transport", "Utilities"], size),
+        "Amount": rng.integers(0, 100_000, size),
+    })
+
+
+@pytest.mark.parametrize("selections", [
+    None,
+    {"Priority": ["Critical"]},
+    {"Priority": ["Critical", "Discretionary"], "Category": ["Food", "Transport"]},
+    {"Priority": None, "Category": ["Housing", "Not a category"]},
+])
+def test_selections_match_isin(frame, selections):
+    index = BitmapIndex(frame, ("Priority", "Category"))
+    expected = np.ones(len(frame), dtype=bool)
+    for column, values in (selections or {}).items():
+        if values is not None:
+            expected &= frame[column].isin(values).to_numpy()
+    assert np.array_equal(index.mask(selections), expected)
+    assert index.count(selections) == expected.sum()
+    pd.testing.assert_frame_equal(index.select(selections), frame[expected])
+
+
+def test_empty_selection_matches_nothing(frame):
+    index = BitmapIndex(frame, ("Priority",))
+    assert index.count({"Priority": []}) == 0
+    assert index.select({"Priority": []}).empty
+
+
+def test_flags_and_values(frame):
+    large = frame["Amount"].to_numpy() > 50_000
+    index = BitmapIndex(frame, ("Category",), flags={"large": large})
+    assert set(index.values("Category")) == {"Food", "Housing", "Transport", "Utilities"}
+    expected = large & (frame["Category"] == "Food").to_numpy()
+    assert np.array_equal(index.positions({"Category": ["Food"]}, flags=("large",)), np.flatnonzero(expected))
+
+
+def test_adjustment_index_flags_adjusted_rows():
+    details = pd.DataFrame({"Item": ["Rice", "Beef", "Rent"], "Priority": ["Essential", "Discretionary", "Critical"],
+                            "Adjustment": [0.0, -5_000.0, 0.0]}, index=[10, 20, 30])
+    index = adjustment_index(details)
+    assert index.select(flags=("adjusted",))["Item"].tolist() == ["Beef"]
+    assert index.select({"Priority": ["Critical", "Essential"]})["Item"].tolist() == ["Rice", "Rent"]
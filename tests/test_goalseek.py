@@ -0,0 +1,60 @@
+"""Goal seek against the stages it short-cuts."""
+import numpy as np
+import pytest
+
+from finance_engine import stages
+from finance_engine.catalog import load_data
+from finance_engine.goalseek import cut_path, goal_seek, required_cuts, savings_path
+
+ESSENTIAL_CUTS, DISCRETIONARY_CUTS = np.arange(0, 21, 5), np.arange(0, 51, 10)
+
+
+def _feasible_savings(income, essential_cut, discretionary_cut, goal, risk):
+    groceries_df, bills_df = stages.apply_spending_cuts(*load_data(income), essential_cut, discretionary_cut)
+    groceries_df, bills_df, _ = stages.auto_adjust_spending(groceries_df, bills_df, income)
+    fixed = stages.compute_totals(groceries_df, bills_df, income)["total_fixed_expenses"]
+    return fixed, min(o["Savings"] for o in stages.generate_budget_options(income, fixed, goal, risk).values())
+
+
+def test_cut_path_raises_discretionary_first():
+    essential, discretionary = cut_path([0, 5, 10], [0, 25, 50])
+    assert essential.tolist() == [0, 0, 0, 5, 10]
+    assert discretionary.tolist() == [0, 25, 50, 50, 50]
+
+
+@pytest.mark.parametrize("income, risk", [(1_750_000, "Low"), (2_500_000, "Medium"), (2_500_000, "Unknown")])
+def test_path_matches_the_stages(income, risk):
+    path = savings_path(*load_data(income), income, risk, ESSENTIAL_CUTS, DISCRETIONARY_CUTS)
+    assert np.all(np.diff(path["feasible_savings"]) >= 0)
+    for point in range(len(path["essential_cut"])):
+        fixed, savings = _feasible_savings(income, path["essential_cut"][point], path["discretionary_cut"][point],
+                                           1e12, risk)
+        assert savings == path["feasible_savings"][point]
+        # Past income the path keeps the cut total; the stages go on to auto-adjust it, leaving nothing to save
+        if path["total_fixed_expenses"][point] <= income:
+            assert fixed == path["total_fixed_expenses"][point]
+        else:
+            assert savings == 0
+    assert (path["total_fixed_expenses"] > income).any() == (income == 1_750_000)
+
+
+def test_goal_seek_finds_the_first_cuts_that_reach_the_target():
+    income, risk = 2_500_000, "Medium"
+    path = savings_path(*load_data(income), income, risk, ESSENTIAL_CUTS, DISCRETIONARY_CUTS)
+    target = float(path["feasible_savings"][3]) + 1
+    result = goal_seek(*load_data(income), income, target, risk, ESSENTIAL_CUTS, DISCRETIONARY_CUTS)
+    assert result["feasible"] and result["feasible_savings"] >= target
+    assert _feasible_savings(income, result["essential_cut"], result["discretionary_cut"], target, risk)[1] == target
+    # The point before it falls short
+    assert (result["essential_cut"], result["discretionary_cut"]) == (0, 40)
+    assert _feasible_savings(income, 0, 30, target, risk)[1] < target
+
+
+def test_required_cuts_for_many_targets():
+    path = savings_path(*load_data(2_500_000), 2_500_000, "Low", ESSENTIAL_CUTS, DISCRETIONARY_CUTS)
+    best = path["feasible_savings"][-1]
+    result = required_cuts(path, [0, best, best + 1])
+    assert result["feasible"].tolist() == [True, True, False]
+    assert (result["essential_cut"][0], result["discretionary_cut"][0]) == (0, 0)
+    assert np.isnan(result["essential_cut"][2]) and np.isnan(result["discretionary_cut"][2])
+    assert result["feasible_savings"][2] == best
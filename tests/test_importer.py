@@ -0,0 +1,94 @@
+"""Streaming statement import into the ledger."""
+import csv
+
+import pytest
+
+from finance_engine.importer import import_statement, parse_amount, parse_date
+from finance_engine.ledger import LedgerStore
+
+STATEMENT = [
+    ["Date", "Description", "Amount"],
+    ["2024-01-03", "Umeme yaka token", "-50,000"],
+    ["03/01/2024", "Salary", "2,000,000"],
+    ["not a date", "Airtime", "-5,000"],
+    ["2024-01-05", "Airtime bundle", ""],
+    ["2024-01-06", "Kikuubo supermarket", "(12,500)"],
+    ["2024-02-01", "Mystery payee", "-7,000"],
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LedgerStore(tmp_path / "ledger.db")
+    yield store
+    store.close()
+
+
+def _write(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        csv.writer(handle).writerows(rows)
+    return path
+
+
+def test_parsing():
+    assert [parse_date(v) for v in ("2024-01-31", "31/01/2024", "31 Jan 2024")] == ["2024-01-31"] * 3
+    assert [parse_amount(v) for v in ("UGX 12,000", "(1,500.00)", "-700", " ")] == [12000.0, -1500.0, -700.0, None]
+    with pytest.raises(ValueError):
+        parse_amount("n/a")
+
+
+def test_import_classifies_spending_and_skips_inflows_and_rejects(store, tmp_path):
+    path = _write(tmp_path / "statement.csv", STATEMENT)
+    stats = import_statement(path, store, "h", chunk_size=2)
+    assert stats["rows"] == 6 and stats["chunks"] == 3
+    assert (stats["imported"], stats["duplicates"], stats["rejected"], stats["inflows"], stats["unmatched"]) == (
+        3, 0, 2, 1, 1)
+
+    imported = store.transactions("h", "2024-01-01", "2024-12-31")
+    assert imported[["date", "amount", "category"]].values.tolist() == [
+        ["2024-01-03", 50_000, "Utilities"], ["2024-01-06", 12_500, "Food Staples"],
+        ["2024-02-01", 7_000, "Uncategorised"]]
+    assert set(imported["source"]) == {str(path)}
+
+    with open(f"{path}.rejects.csv", newline="", encoding="utf-8") as handle:
+        rejects = list(csv.reader(handle))
+    assert rejects[0] == ["line", "reason", "Date", "Description", "Amount"]
+    assert [(line, reason) for line, reason, *_ in rejects[1:]] == [
+        ("4", "unrecognised date 'not a date'"), ("5", "missing amount")]
+
+
+def test_debit_and_credit_columns(store, tmp_path):
+    path = _write(tmp_path / "bank.csv", [
+        ["Value Date", "Narration", "Debit", "Credit"],
+        ["2024-03-01", "School fees", "300,000", ""],
+        ["2024-03-02", "Transfer in", "", "100,000"],
+        ["2024-03-03", "Nothing", "", ""],
+    ])
+    stats = import_statement(path, store, "h")
+    assert (stats["imported"], stats["inflows"], stats["rejected"]) == (1, 1, 1)
+    assert store.transactions("h", "2024-03-01", "2024-03-31")["category"].tolist() == ["Education"]
+
+
+def test_reimporting_after_a_crash_adds_only_the_missing_rows(store, tmp_path):
+    rows = [["Date", "Description", "Amount"]] + [["2024-01-10", "Boda", "-2,000"]] * 5
+    path = _write(tmp_path / "statement.csv", rows)
+
+    def crash(stats):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        import_statement(path, store, "h", chunk_size=2, progress=crash)
+    assert len(store.transactions("h", "2024-01-01", "2024-01-31")) == 2
+
+    stats = import_statement(path, store, "h", chunk_size=2)
+    assert (stats["imported"], stats["duplicates"]) == (3, 2)
+    assert import_statement(path, store, "h")["imported"] == 0
+    # Identical rows on different lines are separate payments
+    assert len(store.transactions("h", "2024-01-01", "2024-01-31")) == 5
+    assert import_statement(path, store, "other")["imported"] == 5
+
+
+def test_header_without_amount_columns_is_rejected(store, tmp_path):
+    path = _write(tmp_path / "statement.csv", [["Date", "Description"], ["2024-01-01", "Rent"]])
+    with pytest.raises(ValueError, match="no amount or debit column"):
+        import_statement(path, store, "h")
@@ -0,0 +1,102 @@
+"""The SQLite ledger store."""
+import sqlite3
+import threading
+
+import pandas as pd
+import pytest
+
+from finance_engine.catalog import load_data
+from finance_engine.ledger import LedgerStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LedgerStore(tmp_path / "ledger.db")
+    yield store
+    store.close()
+
+
+def _item(description, amount, month="2024-01", **overrides):
+    return dict({"household": "h", "month": month, "kind": "bill", "description": description, "amount": amount,
+                 "priority": "Essential", "category": "Utilities", "flexibility": "Low"}, **overrides)
+
+
+def test_seeded_month_loads_like_the_catalog(store):
+    assert store.seed_month("h", "2024-01") == 36
+    groceries_df, bills_df = store.load_month("h", "2024-01", 2_000_000)
+    expected_groceries, expected_bills = load_data(2_000_000)
+    pd.testing.assert_frame_equal(groceries_df, expected_groceries)
+    pd.testing.assert_frame_equal(bills_df, expected_bills)
+
+
+def test_seeding_a_seeded_month_takes_no_write_lock(store, tmp_path):
+    store.seed_month("h", "2024-01")
+    writer = sqlite3.connect(tmp_path / "ledger.db", timeout=0)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        assert store.seed_month("h", "2024-01") == 0
+    finally:
+        writer.rollback()
+        writer.close()
+
+
+def test_revisions_count_writes(store):
+    assert store.revision("h", "2024-01") == 0
+    store.insert_line_items([_item("Water", 24000)])
+    store.replace_month("h", "2024-01", [_item("Water", 25000)])
+    assert store.revision("h", "2024-01") == 3
+    assert store.revision("h", "2024-02") == 0
+
+
+def test_replace_month_is_atomic(store):
+    store.insert_line_items([_item("Water", 24000)])
+    with pytest.raises(KeyError):
+        store.replace_month("h", "2024-01", [{"description": "Rent"}])
+    assert store.line_items("h", "2024-01")["description"].tolist() == ["Water"]
+
+
+def test_line_item_range_and_filters(store):
+    store.insert_line_items([_item("Water", 1, "2024-01"), _item("Rent", 2, "2024-02", priority="Critical"),
+                             _item("Gym", 3, "2024-03", category="Entertainment"), _item("Water", 4, "2024-04")])
+    assert store.line_items("h", "2024-02", "2024-03")["amount"].tolist() == [2, 3]
+    assert store.line_items("h", "2024-01", "2024-04", priority="Critical")["description"].tolist() == ["Rent"]
+    assert store.line_items("h", "2024-01", "2024-04", category=["Utilities"])["amount"].tolist() == [1, 2, 4]
+    assert store.months("h") == ["2024-01", "2024-02", "2024-03", "2024-04"]
+    assert store.line_items("other", "2024-01", "2024-04").empty
+
+
+def test_transactions_by_date_and_since(store):
+    rows = [{"household": "h", "date": f"2024-01-{day:02d}", "description": "Fuel", "amount": day,
+             "priority": "Essential", "category": "Transport", "flexibility": "Low"} for day in (1, 15, 31)]
+    store.insert_transactions(rows)
+    assert store.transactions("h", "2024-01-10", "2024-01-31")["amount"].tolist() == [15, 31]
+    since = store.transactions_since("h", after_id=1)
+    assert since["amount"].tolist() == [15, 31] and since["month"].unique().tolist() == ["2024-01"]
+    assert store.monthly_category_totals("h", "2024-01", "2024-01")["amount"].tolist() == [47]
+
+
+def test_close_closes_other_threads_connections(store):
+    opened = []
+    thread = threading.Thread(target=lambda: opened.append(store._connect()))
+    thread.start()
+    thread.join()
+    store.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+
+
+def test_opening_a_file_from_before_source_lines_adds_the_column(tmp_path):
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE transactions (id INTEGER PRIMARY KEY, household TEXT NOT NULL, date TEXT NOT NULL, "
+                 "month TEXT NOT NULL, description TEXT NOT NULL, amount REAL NOT NULL, priority TEXT NOT NULL, "
+                 "category TEXT NOT NULL, flexibility TEXT NOT NULL, source TEXT NOT NULL DEFAULT '')")
+    conn.commit()
+    conn.close()
+
+    store = LedgerStore(path)
+    row = {"household": "h", "date": "2024-01-02", "description": "Rent", "amount": 1.0, "priority": "Critical",
+           "category": "Housing", "flexibility": "None", "source": "s.csv", "source_line": 2}
+    assert store.insert_transactions([row, row]) == 1
+    assert store.insert_transactions([dict(row, source_line=None)] * 2) == 2
+    store.close()
@@ -0,0 +1,72 @@
+"""Streaming spending alerts."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance_engine.monitor import CategoryState, SpendingMonitor, category_budgets
+
+
+def _kinds(alerts):
+    return [(alert["kind"], alert["level"]) for alert in alerts]
+
+
+def test_category_budgets_sum_groceries_and_bills():
+    groceries_df = pd.DataFrame({"Category": pd.Categorical(["Protein", "Protein", "Staples"]),
+                                 "Price": [10_000.0, 5_000.0, 2_000.0]})
+    bills_df = pd.DataFrame({"Type": ["Housing", "Staples"], "Amount": [500_000.0, 1_000.0]})
+    assert category_budgets(groceries_df, bills_df) == {"Protein": 15_000, "Staples": 3_000, "Housing": 500_000}
+
+
+def test_share_alerts_fire_once_per_threshold_and_month():
+    monitor = SpendingMonitor({"Protein": 100_000}, pace_ratio=100)
+    assert monitor.observe("2024-01-02", "Protein", 40_000) == []
+    alerts = monitor.observe("2024-01-12", "Protein", 45_000)
+    # Crossing 50% and 80% at once reports only the higher threshold
+    assert _kinds(alerts) == [("share", "High")]
+    assert alerts[0]["message"] == "You've already spent 80% of your Protein budget and it's the 12th"
+    assert monitor.observe("2024-01-13", "Protein", 5_000) == []
+    alerts = monitor.observe("2024-01-21", "Protein", 20_000)
+    assert _kinds(alerts) == [("share", "Critical")]
+    assert alerts[0]["message"].startswith("You've spent your whole Protein budget (110% of 100,000 UGX)")
+    assert monitor.observe("2024-01-22", "Protein", 1_000) == []
+
+    # A new month starts afresh; a late transaction from the old month doesn't count towards it
+    assert _kinds(monitor.observe("2024-02-03", "Protein", 60_000)) == [("share", "Medium")]
+    assert monitor.observe("2024-01-30", "Protein", 90_000) == []
+    assert monitor.snapshot()["Protein"]["spent"] == 60_000
+
+
+def test_pace_and_unbudgeted_alerts():
+    monitor = SpendingMonitor({"Transport": 100_000}, share_thresholds=())
+    assert monitor.observe("2024-04-03", "Transport", 20_000) == []  # below the 25% minimum
+    alerts = monitor.observe("2024-04-03", "Transport", 10_000)
+    assert _kinds(alerts) == [("pace", "High")]
+    assert alerts[0]["message"] == ("Transport spending is ahead of pace: 30% of the budget spent by the 3rd, "
+                                    "on course for 300% by month end")
+    assert monitor.observe("2024-04-04", "Transport", 50_000) == []
+
+    assert _kinds(monitor.observe("2024-04-04", "Gifts", 5_000)) == [("unbudgeted", "Medium")]
+    assert monitor.observe("2024-04-05", "Gifts", 5_000) == []
+    assert monitor.snapshot()["Gifts"]["share"] is None
+
+
+def test_anomalies_need_history_and_a_large_z_score():
+    monitor = SpendingMonitor(window=20)
+    amounts = [1_000.0, 1_200.0] * 5
+    alerts = monitor.observe_many([f"2024-05-{day:02d}" for day in range(1, 11)], ["Food"] * 10, amounts)
+    assert _kinds(alerts) == [("unbudgeted", "Medium")]
+    assert monitor.observe("2024-05-11", "Food", 1_300) == []
+    alerts = monitor.observe("2024-05-12", "Food", 5_000)
+    assert _kinds(alerts) == [("anomaly", "Medium")]
+    assert alerts[0]["z"] > 3
+
+
+@pytest.mark.parametrize("window", [1, 3, 50])
+def test_rolling_statistics_match_the_window(window):
+    state = CategoryState(window)
+    amounts = np.random.default_rng(5).gamma(2.0, 10_000.0, 200)
+    for number, amount in enumerate(amounts, 1):
+        state.push(amount)
+        recent = amounts[max(0, number - window):number]
+        assert state.mean == pytest.approx(recent.mean())
+        assert state.variance == pytest.approx(recent.var(ddof=1) if len(recent) > 1 else 0.0, abs=1e-3)
@@ -0,0 +1,77 @@
+"""The sharded nightly run: sharding, results and resuming."""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from finance_engine import nightly
+
+HOUSEHOLDS = [
+    {"household": "a", "monthly_income": 5_000_000, "savings_goal": 300_000, "risk_appetite": "Low"},
+    {"monthly_income": 1_000_000, "savings_goal": 100_000},
+    {"household": "c", "monthly_income": 2_500_000, "essential_cut": 10, "discretionary_cut": 30,
+     "current_savings": 1_000_000},
+    {"household": "d", "monthly_income": 1_750_000, "risk_appetite": "Bogus"},
+    {"household": "e", "monthly_income": 3_000_000, "savings_goal": 2_000_000, "risk_appetite": "High"},
+]
+SETTINGS = {"shard_size": 2, "workers": 1, "months": 6, "paths": 200}
+
+
+@pytest.fixture
+def households(tmp_path):
+    path = tmp_path / "households.jsonl"
+    lines = [json.dumps(household) for household in HOUSEHOLDS]
+    path.write_text("\n".join(lines[:2]) + "\n\n" + "\n".join(lines[2:]) + "\n")
+    return str(path)
+
+
+def test_plan_shards_skips_blank_lines(households):
+    shards = nightly.plan_shards(households, 2)
+    assert [(s["rows"], s["first_row"]) for s in shards] == [(2, 0), (2, 2), (1, 4)]
+    assert [household["household"] for household in nightly._read_shard(households, shards[1])] == ["c", "d"]
+
+
+def test_shard_results_match_the_pipeline_per_household(households, tmp_path):
+    report = nightly.run(households, str(tmp_path / "out"), **SETTINGS)
+    assert (report["shards"], report["processed"], report["failed"], report["households"]) == (3, 3, 0, 5)
+    results = nightly.load_results(str(tmp_path / "out"))
+    assert results["household"].tolist() == ["a", "row-1", "c", "d", "e"]
+
+    settings = {"ledger": None, "month": None, "planner": "tiers", "option": "Option 1", "months": 6, "paths": 200}
+    for row, household in enumerate(HOUSEHOLDS):
+        expected = nightly._evaluate(household, row, settings)
+        for name, _ in nightly.COLUMNS:
+            if name.startswith("projection"):
+                assert results[name][row] == pytest.approx(expected[name], rel=1e-9, abs=1e-6), name
+            else:
+                assert results[name][row] == expected[name], name
+
+
+def test_a_restart_redoes_only_unfinished_shards(households, tmp_path):
+    output = str(tmp_path / "out")
+    nightly.run(households, output, **SETTINGS)
+    before = nightly.load_results(output)
+
+    manifest = nightly.load_manifest(output)
+    os.remove(os.path.join(output, manifest["shards"]["1"]["file"]))
+    manifest["shards"]["2"] = {"status": "failed", "rows": 1, "error": "killed"}
+    with open(os.path.join(output, nightly.MANIFEST), "w") as handle:
+        json.dump(manifest, handle)
+
+    report = nightly.run(households, output, **SETTINGS)
+    assert (report["skipped"], report["processed"], report["households"]) == (1, 2, 3)
+    after = nightly.load_results(output)
+    assert all(np.array_equal(before[name], after[name]) for name, _ in nightly.COLUMNS)
+
+    with pytest.raises(ValueError, match="different input or settings"):
+        nightly.run(households, output, **dict(SETTINGS, paths=100))
+
+
+def test_a_failed_shard_is_recorded_and_left_out(tmp_path):
+    path = tmp_path / "households.jsonl"
+    path.write_text(json.dumps(HOUSEHOLDS[0]) + "\n" + json.dumps({"household": "x", "monthly_income": "lots"}) + "\n")
+    report = nightly.run(str(path), str(tmp_path / "out"), **dict(SETTINGS, shard_size=1))
+    assert (report["processed"], report["failed"]) == (1, 1)
+    assert nightly.load_manifest(str(tmp_path / "out"))["shards"]["1"]["error"].startswith("ValueError")
+    assert nightly.load_results(str(tmp_path / "out"))["household"].tolist() == ["a"]
@@ -0,0 +1,62 @@
+"""Vectorized number formatting against Python's ``format``, and paged tables."""
+import numpy as np
+import pandas as pd
+
+from finance_engine.paging import adjustment_pages, format_amounts, format_percentages
+
+VALUES = np.concatenate([
+    np.random.default_rng(3).normal(0, 50, 10_000),
+    np.arange(-2000, 2000) / 20,  # every tie at one decimal
+    np.arange(-1000, 1000) + 0.5,  # every tie at zero decimals
+    [-0.05, 0.05, -0.04, -0.0, 0.0, 0.45, 1.005, 2 ** 53 + 1.0, -3e18, 1e20],
+])
+
+
+def test_format_percentages_matches_format():
+    assert format_percentages(VALUES).tolist() == [f"{value:.1f}%" for value in VALUES]
+
+
+def test_format_amounts_matches_format():
+    assert format_amounts(VALUES).tolist() == [f"{value:,.0f} UGX" for value in VALUES]
+
+
+def test_non_finite_values_are_blank():
+    assert format_percentages([np.nan, np.inf, -np.inf, -0.05]).tolist() == ["", "", "", "-0.1%"]
+
+
+def _adjustments():
+    return pd.DataFrame({
+        "Description": ["Rice", "Beef", "Rent", "Airtime", "Soap"],
+        "Priority": pd.Categorical(["Essential", "Discretionary", "Critical", "Discretionary", "Essential"],
+                                   categories=["Critical", "Essential", "Discretionary"], ordered=True),
+        "Original Price": [50_000.0, 80_000.0, 500_000.0, 20_000.0, 4_000.0],
+        "Price": [40_000.0, 60_000.0, 500_000.0, 5_000.0, 4_000.0],
+        "Adjustment": [-10_000.0, -20_000.0, 0.0, -15_000.0, 0.0],
+        "% Change": [-20.0, -25.0, 0.0, -75.0, np.nan],
+    }, index=[7, 3, 9, 1, 5])
+
+
+def test_adjustment_pages_sort_by_priority_then_largest_reduction():
+    table = adjustment_pages(_adjustments())
+    first = table.page(page_size=2)
+    assert first["rows"]["Description"].tolist() == ["Rent", "Rice"]
+    assert first["highlight"].tolist() == [False, True]
+    assert (first["total"], first["page"], first["pages"]) == (5, 1, 3)
+    assert table.page(page=2, page_size=2)["rows"]["Description"].tolist() == ["Soap", "Beef"]
+    assert table.page(page=3, page_size=2)["rows"].iloc[0].to_dict() == {
+        "Description": "Airtime", "Priority": "Discretionary", "Original Amount": "20,000 UGX",
+        "Adjusted Amount": "5,000 UGX", "Amount Saved": "-15,000 UGX", "% Change": "-75.0%"}
+
+
+def test_page_filters_sorts_and_clamps():
+    table = adjustment_pages(_adjustments())
+    adjusted = _adjustments()["Adjustment"].to_numpy() != 0
+    page = table.page(adjusted, sort_by="Original Amount", descending=True, page=9, page_size=25)
+    assert page["rows"]["Description"].tolist() == ["Beef", "Rice", "Airtime"]
+    assert (page["total"], page["page"], page["pages"]) == (3, 1, 1)
+    assert table.page(adjusted, sort_by="Description", page=0, page_size=1)["rows"]["Description"].tolist() == [
+        "Airtime"]
+
+    empty = table.page(np.zeros(5, dtype=bool))
+    assert (len(empty["rows"]), empty["total"], empty["page"], empty["pages"]) == (0, 0, 1, 1)
+    assert table.page(sort_by="% Change")["rows"]["% Change"].tolist()[-1] == ""
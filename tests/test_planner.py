@@ -0,0 +1,30 @@
+"""Goal-first budget options."""
+import pytest
+
+from finance_engine.pipeline import run_pipeline
+from finance_engine.planner import goal_first_options
+
+
+def test_unknown_risk_gets_the_high_split():
+    assert goal_first_options(3_000_000, 1_500_000, 500_000, "Bogus") == goal_first_options(
+        3_000_000, 1_500_000, 500_000, "High")
+
+
+@pytest.mark.parametrize("planner", ["tiers", "optimize"])
+def test_planners_accept_the_same_risks(planner):
+    bogus = run_pipeline(3_000_000, 500_000, "Bogus", 0, 0, planner=planner)
+    high = run_pipeline(3_000_000, 500_000, "High", 0, 0, planner=planner)
+    assert bogus["budget_options"] == high["budget_options"]
+
+
+def test_optimize_meets_the_goal_exactly():
+    results = run_pipeline(2_000_000, 300_000, "Medium", 0, 0, planner="optimize")
+    assert results["totals"]["total_fixed_expenses"] == 1_700_000
+    assert results["budget_options"]["Option 1"]["Savings"] == 300_000
+
+
+def test_goal_first_options_add_up_to_the_surplus():
+    for option in goal_first_options(2_345_679, 1_000_000, 300_000, "Medium").values():
+        assert option["Savings"] == 300_000
+        assert option["Investments"] + option["Discretionary"] == 1_045_679
+        assert option["Investments"] == round(option["Investments"])
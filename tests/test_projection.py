@@ -0,0 +1,56 @@
+"""The Monte Carlo savings projection."""
+from datetime import date
+
+import numpy as np
+
+from finance_engine.projection import final_balance_percentiles, month_starts, projection_bands, simulate_savings
+
+
+def test_without_shocks_or_noise_savings_accumulate():
+    balances = simulate_savings(100_000, 50_000, 1_000_000, 800_000, months=6, paths=3,
+                                shock_probability=0, expense_volatility=0)
+    assert balances.shape == (3, 6)
+    assert balances[0].tolist() == [150_000, 200_000, 250_000, 300_000, 350_000, 400_000]
+    assert (balances == balances[0]).all()
+
+
+def test_as_needed_items_are_returned_in_months_they_are_not_needed():
+    never = simulate_savings(0, 0, 1_000_000, 0, months=12, paths=10, as_needed_amounts=[10_000],
+                             as_needed_probability=1.0, shock_probability=0)
+    always = simulate_savings(0, 0, 1_000_000, 0, months=12, paths=10, as_needed_amounts=[10_000],
+                              as_needed_probability=0.0, shock_probability=0)
+    assert (never == 0).all()
+    assert (always[:, -1] == 120_000).all()
+
+
+def test_shocks_only_lower_the_balance_and_the_seed_fixes_the_draws():
+    calm = simulate_savings(0, 50_000, 1_000_000, 0, months=12, paths=1_000, shock_probability=0)
+    shocked = simulate_savings(0, 50_000, 1_000_000, 0, months=12, paths=1_000, shock_probability=0.5)
+    assert (shocked <= calm).all() and (shocked < calm).any()
+    assert np.array_equal(shocked, simulate_savings(0, 50_000, 1_000_000, 0, months=12, paths=1_000,
+                                                    shock_probability=0.5))
+    assert not np.array_equal(shocked, simulate_savings(0, 50_000, 1_000_000, 0, months=12, paths=1_000,
+                                                        shock_probability=0.5, seed=1))
+
+
+def test_final_percentiles_match_simulating_each_household():
+    households = [(0, 50_000, 1_000_000, 900_000, [5_000, 20_000]), (250_000, -10_000, 600_000, 0, [0, 7_000]),
+                  (10_000, 120_000, 2_000_000, 1_500_000, [1_000, 0])]
+    columns = [np.array(values) for values in zip(*households)]
+    result = final_balance_percentiles(*columns, months=24, paths=2_000, chunk_size=2_000)
+    for number, (current, saving, income, expenses, as_needed) in enumerate(households):
+        balances = simulate_savings(current, saving, income, expenses, months=24, paths=2_000,
+                                    as_needed_amounts=as_needed)
+        np.testing.assert_allclose(result[:, number], np.percentile(balances[:, -1], (10, 50, 90)), rtol=1e-9)
+
+
+def test_bands_are_ordered_and_labelled_by_month():
+    balances = simulate_savings(0, 50_000, 1_000_000, 800_000, months=3, paths=500)
+    bands = projection_bands(balances, start=date(2024, 11, 20))
+    assert bands["Month"] == ["Nov 2024", "Dec 2024", "Jan 2025"]
+    assert all(low <= mid <= high for low, mid, high in zip(bands["P10"], bands["P50"], bands["P90"]))
+    assert len(bands["Mean"]) == 3
+
+
+def test_month_starts_cross_the_year():
+    assert month_starts(3, date(2023, 12, 31)) == [date(2023, 12, 1), date(2024, 1, 1), date(2024, 2, 1)]
@@ -0,0 +1,39 @@
+"""Recommendation rules, one-shot and incremental."""
+import pytest
+
+from finance_engine import stages
+from finance_engine.catalog import load_data
+from finance_engine.rules import RecommendationEngine, TopK, evaluate
+
+
+def _inputs(income, goal=300_000, risk="Medium"):
+    groceries_df, bills_df, _ = stages.auto_adjust_spending(*load_data(income), income)
+    totals = stages.compute_totals(groceries_df, bills_df, income)
+    options = stages.generate_budget_options(income, totals["total_fixed_expenses"], goal, risk)
+    return groceries_df, bills_df, options, income, goal
+
+
+@pytest.mark.parametrize("recommend", [evaluate, lambda *inputs: RecommendationEngine().run(*inputs)])
+@pytest.mark.parametrize("income, share", [(0, ""), (1_000_000, " (31% of income)")])
+def test_discretionary_share(recommend, income, share):
+    messages = [message for level, message in recommend(*_inputs(income)) if level == "High"]
+    assert f"High discretionary spending: 310,167 UGX{share}. Consider reducing non-essential expenses." in messages
+
+
+def test_engine_matches_evaluate_across_reruns():
+    engine = RecommendationEngine()
+    for income, goal, risk in [(5_000_000, 300_000, "Low"), (5_000_000, 300_000, "High"), (1_500_000, 900_000, "High"),
+                               (1_500_000, 900_000, "High")]:
+        inputs = _inputs(income, goal, risk)
+        assert engine.run(*inputs) == evaluate(*inputs)
+    assert engine.evaluated == []
+
+
+def test_top_k_follows_updates_and_removals():
+    top = TopK(k=2)
+    for key, amount in enumerate([5, 9, 7]):
+        top.update(key, f"item-{key}", amount, key)
+    assert top.top() == [("item-1", 9), ("item-2", 7)]
+    top.update(1, "item-1", 1, 1)
+    top.remove(2)
+    assert top.top() == [("item-0", 5), ("item-1", 1)]
@@ -0,0 +1,103 @@
+"""The budget HTTP API: parameter checks, handlers and the asyncio front end."""
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+
+from finance_engine.ledger import LedgerStore
+from finance_engine.service import MAX_PATHS, BudgetService, HTTPError, Server, budget_params
+
+
+@pytest.fixture
+def service(tmp_path):
+    store = LedgerStore(tmp_path / "ledger.db", pool_size=2)
+    store.seed_month("h", "2024-01")
+    yield BudgetService(store)
+    store.close()
+
+
+@pytest.mark.parametrize("query, message", [
+    ({}, "income is required"),
+    ({"income": ["-1"]}, "income must be a finite number at least 0"),
+    ({"income": ["nan"]}, "income must be a finite number at least 0"),
+    ({"income": ["lots"]}, "income must be a number"),
+    ({"income": ["1"], "essential_cut": ["101"]}, "essential_cut must be a finite number between 0 and 100"),
+    ({"income": ["1"], "risk": ["Reckless"]}, "risk must be Low, Medium or High"),
+])
+def test_bad_budget_parameters(query, message):
+    with pytest.raises(HTTPError, match=message) as error:
+        budget_params(query)
+    assert error.value.status == HTTPStatus.BAD_REQUEST
+
+
+def test_budget_params_defaults():
+    assert budget_params({"income": ["1400000"]}) == {
+        "monthly_income": 1_400_000.0, "savings_goal": 0.0, "risk_appetite": "Medium",
+        "essential_cut": 0, "discretionary_cut": 0}
+
+
+def test_handlers(service):
+    assert service.months("h", {}) == {"household": "h", "months": ["2024-01"]}
+    budget = service.budget("h", "2024-01", {"income": ["5000000"], "goal": ["300000"]})
+    assert budget["adjustment_plan"] is None
+    assert list(budget["budget_options"]) == ["Option 1", "Option 2"]
+
+    projection = service.projection("h", "2024-01", {"income": ["5000000"], "months": ["3"], "paths": ["50"]})
+    assert len(projection["bands"]["P50"]) == 3
+
+    with pytest.raises(HTTPError, match="paths must be") as error:
+        service.projection("h", "2024-01", {"income": ["1"], "paths": [str(MAX_PATHS + 1)]})
+    assert error.value.status == HTTPStatus.BAD_REQUEST
+    with pytest.raises(HTTPError, match="Unknown option"):
+        service.projection("h", "2024-01", {"income": ["1"], "option": ["Option 9"], "paths": ["1"]})
+    with pytest.raises(HTTPError, match="No line items") as error:
+        service.budget("h", "1999-01", {"income": ["1"]})
+    assert error.value.status == HTTPStatus.NOT_FOUND
+
+
+def test_routes(service):
+    assert service.route("GET", "/households/a%20b/2024-01/budget", {})[1][:2] == ("a b", "2024-01")
+    assert service.route("POST", "/households/h/2024-02/seed", {})[0] == service.seed
+    with pytest.raises(HTTPError) as error:
+        service.route("POST", "/households/h/2024-01/budget", {})
+    assert error.value.status == HTTPStatus.NOT_FOUND
+
+
+async def _exchange(service, requests):
+    server = Server(service, workers=2)
+    ready = asyncio.get_running_loop().create_future()
+    task = asyncio.create_task(server.serve(port=0, ready=ready.set_result))
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", await ready)
+        responses = []
+        for request in requests:
+            writer.write(request.encode("latin-1"))
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            headers = {}
+            while (line := await reader.readline()) != b"\r\n":
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.lower()] = value.strip()
+            body = json.loads(await reader.readexactly(int(headers["content-length"])))
+            responses.append((status, headers["connection"], body))
+        writer.close()
+        return responses
+    finally:
+        task.cancel()
+        server.executor.shutdown()
+
+
+def test_server_keeps_the_connection_alive(service):
+    responses = asyncio.run(_exchange(service, [
+        "GET /health HTTP/1.1\r\n\r\n",
+        "GET /households/h/2024-01/budget?income=-5 HTTP/1.1\r\n\r\n",
+        "POST /households/h/2024-02/seed HTTP/1.1\r\nContent-Length: 2\r\n\r\n{}",
+        "GET /households/h/months HTTP/1.1\r\nConnection: close\r\n\r\n",
+    ]))
+    assert responses == [
+        (200, "keep-alive", {"status": "ok"}),
+        (400, "keep-alive", {"error": "income must be a finite number at least 0"}),
+        (200, "keep-alive", {"household": "h", "month": "2024-02", "rows": 36}),
+        (200, "close", {"household": "h", "months": ["2024-01", "2024-02"]}),
+    ]
@@ -0,0 +1,94 @@
+"""Pinned results of the integer-money stages on the catalog, and exact sums on the planner path.
+
+Every amount here is within 2 UGX of the float implementation the stages
+replaced; pinning them catches any change to the rounding rules.
+"""
+import numpy as np
+import pytest
+
+from finance_engine import stages
+from finance_engine.catalog import load_data
+from finance_engine.planner import goal_first_options, optimize_spending
+
+ESSENTIAL_CUT, DISCRETIONARY_CUT, GOAL = 7.5, 12.5, 300_000
+
+# At 1,750,000 UGX the cuts leave an overspend the discretionary tier covers
+CUT_PRICES = [12488, 5550, 3062, 13125, 10500, 22200, 27750, 13875, 7400, 13125, 13125, 17500, 5550, 11562, 22200,
+              18500, 5550, 1750, 17500, 2625, 2625, 5550, 6475]
+CUT_AMOUNTS = [462500, 22200, 37000, 9250, 44400, 185000, 161875, 131250, 58334, 218750, 92500, 215833, 43750]
+ADJUSTED_PRICES = [12488, 5550, 1269, 5439, 4352, 22200, 27750, 13875, 7400, 5439, 5439, 7252, 5550, 11562, 22200,
+                   18500, 5550, 725, 7252, 1088, 1088, 5550, 6475]
+ADJUSTED_AMOUNTS = [462500, 22200, 37000, 9250, 44400, 185000, 161875, 54393, 24175, 218750, 92500, 215833, 18131]
+
+
+def _cut(income):
+    groceries_df, bills_df = load_data(income)
+    return stages.apply_spending_cuts(groceries_df, bills_df, ESSENTIAL_CUT, DISCRETIONARY_CUT)
+
+
+def test_apply_spending_cuts():
+    groceries_df, bills_df = _cut(1_750_000)
+    assert groceries_df["Price"].tolist() == CUT_PRICES
+    assert bills_df["Amount"].tolist() == CUT_AMOUNTS
+
+
+def test_auto_adjust_spending():
+    groceries_df, bills_df, plan = stages.auto_adjust_spending(*_cut(1_750_000), 1_750_000)
+    assert groceries_df["Price"].tolist() == ADJUSTED_PRICES
+    assert bills_df["Amount"].tolist() == ADJUSTED_AMOUNTS
+    assert plan == {"overspend": 192_229, "discretionary_reduction": pytest.approx(0.5855802065975977),
+                    "flexible_essential_reduction": 0, "residual_overspend": 0}
+
+
+def test_auto_adjust_spending_caps_essential_reductions():
+    groceries_df, bills_df, plan = stages.auto_adjust_spending(*_cut(1_000_000), 1_000_000)
+    assert (groceries_df["Price"].sum(), bills_df["Amount"].sum()) == (203_394, 1_406_067)
+    assert plan == {"overspend": 872_854, "discretionary_reduction": 0, "flexible_essential_reduction": 0.5,
+                    "residual_overspend": 609_461}
+
+
+@pytest.mark.parametrize("income, fixed_expenses, options", [
+    (2_500_000, 2_011_604, {
+        "Low": ((300_000, 97_679, 48_840), (293_038, 146_519, 48_839)),
+        "Medium": ((244_198, 195_358, 48_840), (195_358, 244_198, 48_840)),
+        "High": ((146_519, 293_038, 48_839), (97_679, 341_877, 48_840)),
+    }),
+    (5_000_000, 2_242_854, {
+        "Low": ((300_000, 551_429, 275_715), (300_000, 827_144, 275_714)),
+        "Medium": ((300_000, 1_102_858, 275_715), (300_000, 1_378_573, 275_715)),
+        "High": ((300_000, 1_654_288, 275_714), (300_000, 1_930_002, 275_715)),
+    }),
+])
+def test_generate_budget_options(income, fixed_expenses, options):
+    groceries_df, bills_df, plan = stages.auto_adjust_spending(*_cut(income), income)
+    assert plan is None
+    assert stages.compute_totals(groceries_df, bills_df, income)["total_fixed_expenses"] == fixed_expenses
+    for risk, expected in options.items():
+        result = stages.generate_budget_options(income, fixed_expenses, GOAL, risk)
+        assert [(o["Savings"], o["Investments"], o["Discretionary"]) for o in result.values()] == list(expected)
+        assert all(o["Feasible"] for o in result.values())
+
+
+def test_generate_budget_options_without_surplus():
+    options = stages.generate_budget_options(1_000_000, 1_609_461, GOAL, "Medium")
+    assert all((o["Savings"], o["Investments"], o["Discretionary"], o["Feasible"]) == (0, 0, 0, False)
+               for o in options.values())
+
+
+@pytest.mark.parametrize("income", [1_000_000, 1_750_000, 2_500_000, 5_000_000])
+@pytest.mark.parametrize("goal", [0, 123_457, 1_000_000])
+def test_optimize_spending_sums_exactly(income, goal):
+    groceries_df, bills_df = _cut(income)
+    groceries_df, bills_df, plan = optimize_spending(groceries_df, bills_df, income, goal)
+    amounts = np.concatenate([groceries_df["Price"].to_numpy(), bills_df["Amount"].to_numpy()])
+    assert np.array_equal(amounts, np.round(amounts))
+    if plan is not None:
+        assert plan["reduction"] + plan["shortfall"] == plan["required"]
+        if not plan["shortfall"]:
+            assert amounts.sum() + goal == income
+
+    fixed_expenses = stages.compute_totals(groceries_df, bills_df, income)["total_fixed_expenses"]
+    surplus = max(income - fixed_expenses, 0)
+    for risk in ("Low", "Medium", "High"):
+        for option in goal_first_options(income, fixed_expenses, goal, risk).values():
+            assert option["Savings"] + option["Investments"] + option["Discretionary"] == surplus
@@ -0,0 +1,38 @@
+"""The what-if sweep against the stages, scenario by scenario."""
+import numpy as np
+import pytest
+
+from finance_engine import stages, sweep
+from finance_engine.catalog import load_data
+
+ESSENTIAL_CUTS, DISCRETIONARY_CUTS = [0, 7.5, 20], [0, 12.5, 50]
+
+
+@pytest.mark.parametrize("income, goal", [(1_000_000, 100_000), (1_750_000, 300_000), (5_000_000, 2_000_000)])
+def test_every_scenario_matches_the_stages(income, goal):
+    grid = sweep.sweep(*load_data(income), income, goal, ESSENTIAL_CUTS, DISCRETIONARY_CUTS)
+    assert grid["feasible_savings"].shape == (3, 3, 3)
+    for r, risk in enumerate(grid["risks"]):
+        for e, essential_cut in enumerate(ESSENTIAL_CUTS):
+            for d, discretionary_cut in enumerate(DISCRETIONARY_CUTS):
+                groceries_df, bills_df = stages.apply_spending_cuts(*load_data(income), essential_cut,
+                                                                    discretionary_cut)
+                groceries_df, bills_df, plan = stages.auto_adjust_spending(groceries_df, bills_df, income)
+                totals = stages.compute_totals(groceries_df, bills_df, income)
+                options = stages.generate_budget_options(income, totals["total_fixed_expenses"], goal, risk)
+                expected = {
+                    "feasible_savings": min(option["Savings"] for option in options.values()),
+                    "disposable_income": totals["disposable_income"],
+                    "total_fixed_expenses": totals["total_fixed_expenses"],
+                    "residual_overspend": plan["residual_overspend"] if plan else 0,
+                }
+                assert {name: grid[name][r, e, d] for name in sweep.SWEEP_COLUMNS} == expected
+
+
+def test_a_process_pool_gives_the_same_grid(monkeypatch):
+    in_process = sweep.sweep(*load_data(2_500_000), 2_500_000, 300_000, workers=1)
+    monkeypatch.setattr(sweep, "PARALLEL_THRESHOLD", 0)
+    pooled = sweep.sweep(*load_data(2_500_000), 2_500_000, 300_000, workers=2)
+    for name in sweep.SWEEP_COLUMNS:
+        assert np.array_equal(in_process[name], pooled[name])
+    assert in_process["feasible_savings"].shape == (3, 21, 51)
@@ -0,0 +1,65 @@
+"""Tracer spans and the shared tracemalloc."""
+import gc
+import json
+import tracemalloc
+
+import pytest
+
+from finance_engine.trace import NULL_TRACER, Tracer
+
+
+@pytest.fixture(autouse=True)
+def no_tracemalloc():
+    assert not tracemalloc.is_tracing()
+    yield
+    assert not tracemalloc.is_tracing()
+
+
+def test_spans_are_recorded_and_flushed(tmp_path):
+    tracer = Tracer(enabled=True, path=tmp_path / "trace.jsonl")
+    tracer.start_rerun()
+    with tracer.span("stage", rows=3) as span:
+        span.cached = False
+        data = [0] * 10_000
+    tracer.flush()
+    tracer.close()
+    (line,) = (tmp_path / "trace.jsonl").read_text().splitlines()
+    record = json.loads(line)
+    assert (record["name"], record["rows"], record["cached"]) == ("stage", 3, False)
+    assert record["alloc_bytes"] > 70_000 and record["rerun"] == tracer.rerun_id
+    del data
+
+
+def test_disabled_tracer_is_a_no_op():
+    with NULL_TRACER.span("stage") as span:
+        span.rows = 1
+    assert NULL_TRACER.spans() == []
+
+
+def test_tracemalloc_stops_with_the_last_tracer():
+    first, second = Tracer(enabled=True), Tracer(enabled=True)
+    first.close()
+    assert tracemalloc.is_tracing()
+    with second.span("stage"):
+        pass
+    assert second.spans()[0]["alloc_bytes"] is not None
+    second.close()
+    second.close()
+    assert not tracemalloc.is_tracing()
+
+
+def test_garbage_collected_tracer_releases_tracemalloc():
+    tracer = Tracer(enabled=True)
+    assert tracemalloc.is_tracing()
+    del tracer
+    gc.collect()
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracemalloc_started_elsewhere_is_left_running():
+    tracemalloc.start()
+    try:
+        Tracer(enabled=True).close()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()